@@ -0,0 +1,49 @@
+"""days: denormalized tag_ids with a GIN index
+
+"Days with all of these tags" grouped the user's whole `days_tags` slice and
+counted per day. Keeping the tag ids on the day itself turns that into one `@>`
+(or `&&` for any-of) test the GIN index answers. Backfilled from `days_tags`.
+
+Revision ID: 3c7e91d2a4f8
+Revises: 988b1aea96b5
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "3c7e91d2a4f8"
+down_revision = "988b1aea96b5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "days",
+        sa.Column(
+            "tag_ids",
+            postgresql.ARRAY(postgresql.UUID(as_uuid=True)),
+            server_default="{}",
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE days d
+        SET tag_ids = dt.tag_ids
+        FROM (
+            SELECT day_timestamp, user_id, array_agg(tag_id ORDER BY tag_id) AS tag_ids
+            FROM days_tags
+            GROUP BY day_timestamp, user_id
+        ) dt
+        WHERE d.timestamp = dt.day_timestamp AND d.user_id = dt.user_id
+        """
+    )
+    op.create_index("ix_days_tag_ids", "days", ["tag_ids"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_days_tag_ids", table_name="days")
+    op.drop_column("days", "tag_ids")
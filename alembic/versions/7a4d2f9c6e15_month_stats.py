@@ -0,0 +1,118 @@
+"""month_stats: per-month rollups of days
+
+Kept current by the day writers with one additive upsert per change, so the
+months view reads aggregates instead of scanning `days` and `trackable_progress`.
+`jsonb_sum_merge` adds two {key: number} maps key-wise and drops zero sums; it is
+what makes the JSONB columns additive under upsert. Progress values are floats,
+so a value added and later taken away can leave a residue such as 4e-17: sums
+within 1e-9 of zero count as zero, the same bound as
+`app.core.rollups.SUM_EPSILON`. Backfilled here; afterwards
+`rebuild_month_stats_task` repairs any drift.
+
+Revision ID: 7a4d2f9c6e15
+Revises: 3c7e91d2a4f8
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "7a4d2f9c6e15"
+down_revision = "3c7e91d2a4f8"
+branch_labels = None
+depends_on = None
+
+# Same month assignment as `app.core.rollups.month_of`: the timestamp's noon in UTC.
+_YEAR = "extract(year FROM timezone('UTC', to_timestamp({0} + 43200)))::int"
+_MONTH = "extract(month FROM timezone('UTC', to_timestamp({0} + 43200)))::int"
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION jsonb_sum_merge(a jsonb, b jsonb) RETURNS jsonb
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT coalesce(jsonb_object_agg(key, total), '{}'::jsonb)
+            FROM (
+                SELECT key, sum(value::numeric) AS total
+                FROM (
+                    SELECT * FROM jsonb_each_text(a)
+                    UNION ALL
+                    SELECT * FROM jsonb_each_text(b)
+                ) AS entries
+                GROUP BY key
+            ) AS sums
+            WHERE abs(total) >= 1e-9
+        $$
+        """
+    )
+
+    op.create_table(
+        "month_stats",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("day_count", sa.Integer(), nullable=False),
+        sa.Column("steps_total", sa.BigInteger(), nullable=False),
+        sa.Column("steps_day_count", sa.Integer(), nullable=False),
+        sa.Column("starred_count", sa.Integer(), nullable=False),
+        sa.Column("progress_totals", postgresql.JSONB(), nullable=False),
+        sa.Column("tag_counts", postgresql.JSONB(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "year", "month"),
+    )
+
+    op.execute(
+        f"""
+        INSERT INTO month_stats
+        SELECT
+            user_id, {_YEAR.format("timestamp")}, {_MONTH.format("timestamp")},
+            count(*), coalesce(sum(steps), 0), count(steps), count(*) FILTER (WHERE starred),
+            '{{}}'::jsonb, '{{}}'::jsonb
+        FROM days
+        GROUP BY 1, 2, 3
+        """
+    )
+    op.execute(
+        f"""
+        UPDATE month_stats ms SET progress_totals = p.totals
+        FROM (
+            SELECT user_id, year, month, jsonb_object_agg(trackable_item_id::text, total) AS totals
+            FROM (
+                SELECT
+                    user_id, {_YEAR.format("timestamp")} AS year,
+                    {_MONTH.format("timestamp")} AS month,
+                    trackable_item_id, sum(value) AS total
+                FROM trackable_progress
+                GROUP BY 1, 2, 3, 4
+                HAVING abs(sum(value)) >= 1e-9
+            ) AS sums
+            GROUP BY 1, 2, 3
+        ) AS p
+        WHERE ms.user_id = p.user_id AND ms.year = p.year AND ms.month = p.month
+        """
+    )
+    op.execute(
+        f"""
+        UPDATE month_stats ms SET tag_counts = t.counts
+        FROM (
+            SELECT user_id, year, month, jsonb_object_agg(tag_id::text, total) AS counts
+            FROM (
+                SELECT
+                    user_id, {_YEAR.format("timestamp")} AS year,
+                    {_MONTH.format("timestamp")} AS month,
+                    tag_id, count(*) AS total
+                FROM days, unnest(tag_ids) AS tag_id
+                GROUP BY 1, 2, 3, 4
+            ) AS sums
+            GROUP BY 1, 2, 3
+        ) AS t
+        WHERE ms.user_id = t.user_id AND ms.year = t.year AND ms.month = t.month
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("month_stats")
+    op.execute("DROP FUNCTION jsonb_sum_merge(jsonb, jsonb)")
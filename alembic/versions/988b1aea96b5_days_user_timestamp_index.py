@@ -0,0 +1,25 @@
+"""days: (user_id, timestamp) index
+
+The primary key is (timestamp, user_id), which cannot answer "this user's days in
+timestamp order" without visiting every user's rows. The random-day sampler counts
+and walks exactly that range, and does so index-only with this index.
+
+Revision ID: 988b1aea96b5
+Revises: f6a2b8d4c1e3
+"""
+
+from alembic import op
+
+
+revision = "988b1aea96b5"
+down_revision = "f6a2b8d4c1e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_days_user_id_timestamp", "days", ["user_id", "timestamp"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_days_user_id_timestamp", table_name="days")
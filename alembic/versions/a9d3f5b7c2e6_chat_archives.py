@@ -0,0 +1,58 @@
+"""chat_archives: soft-deleted chats moved out of `chats`
+
+Chats now record when they were deleted. `archive_deleted_chats_task` moves the
+ones deleted longer ago than the retention window into `chat_archives`, with
+their messages zlib-compressed, and hard-deletes them from `chats`. Chats deleted
+before this revision count from their last update. Two partial indexes serve the
+chat list (live chats only) and the archiver (deleted chats by deletion time).
+
+Revision ID: a9d3f5b7c2e6
+Revises: e8a4c6f2d9b1
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a9d3f5b7c2e6"
+down_revision = "e8a4c6f2d9b1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("chats", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE chats SET deleted_at = updated_at WHERE is_deleted")
+    op.create_index(
+        "ix_chats_user_id_created_at_live",
+        "chats",
+        ["user_id", "created_at"],
+        postgresql_where=sa.text("NOT is_deleted"),
+    )
+    op.create_index(
+        "ix_chats_deleted_at", "chats", ["deleted_at"], postgresql_where=sa.text("is_deleted")
+    )
+
+    op.create_table(
+        "chat_archives",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("model_id", sa.Uuid(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("message_count", sa.Integer(), nullable=False),
+        sa.Column("messages", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_chat_archives_user_id", "chat_archives", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_archives_user_id", table_name="chat_archives")
+    op.drop_table("chat_archives")
+    op.drop_index("ix_chats_deleted_at", table_name="chats")
+    op.drop_index("ix_chats_user_id_created_at_live", table_name="chats")
+    op.drop_column("chats", "deleted_at")
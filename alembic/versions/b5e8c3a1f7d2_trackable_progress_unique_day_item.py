@@ -0,0 +1,67 @@
+"""trackable_progress: one row per (user, day, item)
+
+update_day now upserts changed progress instead of deleting and re-inserting the
+whole day, which needs a conflict target. Existing duplicates are collapsed to one
+row per item first, and the month rollups' progress totals are recomputed to match.
+The row kept is the one written last, as update_day now keeps a repeated item's
+last entry. The table has no write time, so "last" is the highest `ctid`: a day's
+rows were inserted together, in the order of its payload, so later entries sit
+further along the heap.
+
+Revision ID: b5e8c3a1f7d2
+Revises: 7a4d2f9c6e15
+"""
+
+from alembic import op
+
+
+revision = "b5e8c3a1f7d2"
+down_revision = "7a4d2f9c6e15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        DELETE FROM trackable_progress tp
+        USING trackable_progress keep
+        WHERE tp.user_id = keep.user_id
+          AND tp.timestamp = keep.timestamp
+          AND tp.trackable_item_id = keep.trackable_item_id
+          AND tp.ctid < keep.ctid
+        """
+    )
+    op.create_unique_constraint(
+        "uq_trackable_progress_day_item",
+        "trackable_progress",
+        ["user_id", "timestamp", "trackable_item_id"],
+    )
+
+    op.execute("UPDATE month_stats SET progress_totals = '{}'::jsonb")
+    op.execute(
+        """
+        UPDATE month_stats ms SET progress_totals = p.totals
+        FROM (
+            SELECT user_id, year, month, jsonb_object_agg(trackable_item_id::text, total) AS totals
+            FROM (
+                SELECT
+                    user_id,
+                    extract(year FROM timezone('UTC', to_timestamp(timestamp + 43200)))::int
+                        AS year,
+                    extract(month FROM timezone('UTC', to_timestamp(timestamp + 43200)))::int
+                        AS month,
+                    trackable_item_id, sum(value) AS total
+                FROM trackable_progress
+                GROUP BY 1, 2, 3, 4
+                HAVING sum(value) <> 0
+            ) AS sums
+            GROUP BY 1, 2, 3
+        ) AS p
+        WHERE ms.user_id = p.user_id AND ms.year = p.year AND ms.month = p.month
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_trackable_progress_day_item", "trackable_progress", type_="unique")
@@ -0,0 +1,84 @@
+"""days.country_id: the day's city's country, kept by trigger
+
+Country filters went through `cities` with a correlated EXISTS per day. The
+country now lives on the day itself, backed by `(user_id, country_id, timestamp)`.
+`days_set_country_id` fills it on insert and whenever `city_id` changes, so every
+writer (ORM, bulk and single-statement inserts alike) gets it without a lookup
+of its own; `cities_propagate_country_id` follows a city moving country.
+
+Revision ID: c6b2e9d4f1a8
+Revises: a9d3f5b7c2e6
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c6b2e9d4f1a8"
+down_revision = "a9d3f5b7c2e6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("days", sa.Column("country_id", sa.Uuid(), nullable=True))
+    op.execute(
+        """
+        UPDATE days SET country_id = cities.country_id
+        FROM cities
+        WHERE cities.id = days.city_id
+        """
+    )
+    op.alter_column("days", "country_id", nullable=False)
+    op.create_foreign_key("days_country_id_fkey", "days", "countries", ["country_id"], ["id"])
+    op.create_index(
+        "ix_days_user_id_country_id_timestamp", "days", ["user_id", "country_id", "timestamp"]
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION days_set_country_id() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.country_id := (SELECT country_id FROM cities WHERE id = NEW.city_id);
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER days_set_country_id
+        BEFORE INSERT OR UPDATE OF city_id ON days
+        FOR EACH ROW EXECUTE FUNCTION days_set_country_id()
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION cities_propagate_country_id() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE days SET country_id = NEW.country_id WHERE city_id = NEW.id;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER cities_propagate_country_id
+        AFTER UPDATE OF country_id ON cities
+        FOR EACH ROW WHEN (OLD.country_id IS DISTINCT FROM NEW.country_id)
+        EXECUTE FUNCTION cities_propagate_country_id()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER cities_propagate_country_id ON cities")
+    op.execute("DROP FUNCTION cities_propagate_country_id()")
+    op.execute("DROP TRIGGER days_set_country_id ON days")
+    op.execute("DROP FUNCTION days_set_country_id()")
+    op.drop_index("ix_days_user_id_country_id_timestamp", table_name="days")
+    op.drop_constraint("days_country_id_fkey", "days", type_="foreignkey")
+    op.drop_column("days", "country_id")
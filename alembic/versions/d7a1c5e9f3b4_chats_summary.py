@@ -0,0 +1,28 @@
+"""chats.summary: rolling summary of messages past the context budget
+
+A turn now sends only the latest messages that fit `CHAT_CONTEXT_TOKENS`. The
+ones before them are folded, in the background, into `summary`, which covers
+every message up to `summary_until` and goes into the system prompt instead.
+
+Revision ID: d7a1c5e9f3b4
+Revises: f1c7a3e5b9d2
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d7a1c5e9f3b4"
+down_revision = "f1c7a3e5b9d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("chats", sa.Column("summary", sa.String(), nullable=True))
+    op.add_column("chats", sa.Column("summary_until", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("chats", "summary_until")
+    op.drop_column("chats", "summary")
@@ -0,0 +1,161 @@
+"""Partition days, trackable_progress, insights and suggestions by year
+
+Each table becomes `PARTITION BY RANGE (timestamp)` with one partition per year,
+named `<table>_<year>`. A day's year is the year of its timestamp's noon in UTC,
+as for its month (`app.core.rollups.month_of`), so each year's partitions start
+12 hours before 1 January UTC. Partitioned tables cannot be converted in
+place, so the existing tables are renamed aside, recreated partitioned, copied
+over and dropped. Primary keys on a partitioned table must include the partition
+key, so `timestamp` joins `id` in the keys of the three child tables.
+
+`ensure_year_partitions(year)` creates a year's partitions for all four tables
+and is idempotent; the app calls it before writing a day in a year it has not
+seen, and a beat task calls it for next year ahead of time. This migration
+creates every year from 2015 (or the oldest day's, if earlier) through next year
+(or the newest day's, if later).
+
+Revision ID: e8a4c6f2d9b1
+Revises: b5e8c3a1f7d2
+"""
+
+from alembic import op
+
+
+revision = "e8a4c6f2d9b1"
+down_revision = "b5e8c3a1f7d2"
+branch_labels = None
+depends_on = None
+
+# Same as `app.core.partitions.NOON_OFFSET`.
+NOON_OFFSET = 12 * 60 * 60
+
+# Parents before children: the copies must satisfy the foreign keys to `days`.
+TABLES = ("days", "trackable_progress", "insights", "suggestions")
+
+ENSURE_YEAR_PARTITIONS = """
+CREATE FUNCTION ensure_year_partitions(year int) RETURNS void
+LANGUAGE plpgsql
+-- Creating a partition locks its parent; rather fail the caller's write than
+-- queue every reader of the table behind a long-running transaction.
+SET lock_timeout = '5s'
+AS $$
+DECLARE
+    lower_bound bigint :=
+        extract(epoch FROM make_timestamptz(year, 1, 1, 0, 0, 0, 'UTC')) - {offset};
+    upper_bound bigint :=
+        extract(epoch FROM make_timestamptz(year + 1, 1, 1, 0, 0, 0, 'UTC')) - {offset};
+    parent text;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['days', 'trackable_progress', 'insights', 'suggestions'] LOOP
+        -- Checked here rather than with IF NOT EXISTS, which locks the parent first.
+        IF to_regclass(format('%I', parent || '_' || year)) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%s) TO (%s)',
+                parent || '_' || year,
+                parent,
+                lower_bound,
+                -- `timestamp` is a 32-bit integer, which ends during 2038.
+                CASE WHEN upper_bound > 2147483647 THEN 'MAXVALUE' ELSE upper_bound::text END
+            );
+        END IF;
+    END LOOP;
+END
+$$
+"""
+
+
+def _create_constraints(partitioned: bool) -> None:
+    """Keys, indexes and foreign keys of the four tables, as the models declare them."""
+    op.create_primary_key("days_pkey", "days", ["timestamp", "user_id"])
+    op.create_index("ix_days_user_id_timestamp", "days", ["user_id", "timestamp"])
+    op.create_index("ix_days_tag_ids", "days", ["tag_ids"], postgresql_using="gin")
+    op.create_foreign_key("days_user_id_fkey", "days", "users", ["user_id"], ["id"])
+    op.create_foreign_key("days_city_id_fkey", "days", "cities", ["city_id"], ["id"])
+
+    child_key = ["timestamp", "id"] if partitioned else ["id"]
+    for table in ("trackable_progress", "insights", "suggestions"):
+        op.create_primary_key(f"{table}_pkey", table, child_key)
+        op.create_foreign_key(f"{table}_user_id_fkey", table, "users", ["user_id"], ["id"])
+        op.create_foreign_key(
+            f"{table}_timestamp_user_id_fkey",
+            table,
+            "days",
+            ["timestamp", "user_id"],
+            ["timestamp", "user_id"],
+        )
+    op.create_unique_constraint(
+        "uq_trackable_progress_day_item",
+        "trackable_progress",
+        ["user_id", "timestamp", "trackable_item_id"],
+    )
+    op.create_foreign_key(
+        "trackable_progress_trackable_item_id_fkey",
+        "trackable_progress",
+        "trackable_items",
+        ["trackable_item_id"],
+        ["id"],
+    )
+    for table in ("insights", "suggestions"):
+        op.create_foreign_key(f"{table}_model_id_fkey", table, "chat_models", ["model_id"], ["id"])
+    op.create_foreign_key(
+        "insights_insight_type_id_fkey", "insights", "insight_types", ["insight_type_id"], ["id"]
+    )
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Recreate the four tables (partitioned or plain) and move their rows across."""
+    for table in TABLES:
+        op.rename_table(table, f"{table}_old")
+        op.execute(f"ALTER INDEX {table}_pkey RENAME TO {table}_old_pkey")
+    op.execute("ALTER INDEX ix_days_user_id_timestamp RENAME TO ix_days_old_user_id_timestamp")
+    op.execute("ALTER INDEX ix_days_tag_ids RENAME TO ix_days_old_tag_ids")
+    op.execute(
+        "ALTER INDEX uq_trackable_progress_day_item RENAME TO uq_trackable_progress_old_day_item"
+    )
+
+    partition_by = " PARTITION BY RANGE (timestamp)" if partitioned else ""
+    for table in TABLES:
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS){partition_by}")
+    _create_constraints(partitioned)
+
+    if partitioned:
+        op.execute(
+            f"""
+            SELECT ensure_year_partitions(year)
+            FROM (
+                SELECT
+                    extract(year FROM to_timestamp(min(timestamp)::bigint + {NOON_OFFSET})
+                                      AT TIME ZONE 'UTC')::int AS first_year,
+                    extract(year FROM to_timestamp(max(timestamp)::bigint + {NOON_OFFSET})
+                                      AT TIME ZONE 'UTC')::int AS last_year
+                FROM days_old
+            ) AS span,
+            generate_series(
+                least(2015, first_year),
+                greatest(extract(year FROM now())::int + 1, last_year)
+            ) AS year
+            """
+        )
+
+    for table in TABLES:
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_old")
+
+    # CASCADE takes the `days_tags` foreign key with it; it is put back below.
+    op.execute("DROP TABLE suggestions_old, insights_old, trackable_progress_old, days_old CASCADE")
+    op.create_foreign_key(
+        "days_tags_day_timestamp_user_id_fkey",
+        "days_tags",
+        "days",
+        ["day_timestamp", "user_id"],
+        ["timestamp", "user_id"],
+    )
+
+
+def upgrade() -> None:
+    op.execute(ENSURE_YEAR_PARTITIONS.format(offset=NOON_OFFSET))
+    _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    _rebuild(partitioned=False)
+    op.execute("DROP FUNCTION ensure_year_partitions(int)")
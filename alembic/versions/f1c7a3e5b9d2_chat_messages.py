@@ -0,0 +1,87 @@
+"""chat_messages: one row per message instead of the chats.messages JSON list
+
+Every turn used to rewrite the whole `chats.messages` column, so a chat's writes
+grew with its length. Messages now live in `chat_messages`, appended two per
+turn and read in order through `(chat_id, created_at, id)`: `id` breaks ties, so
+the index also serves the `(created_at, id)` keyset that pages through a chat's
+history, with no sort. Existing lists are copied
+over; messages stored without a `created_at` get their chat's creation time plus
+their position in microseconds, which keeps them in order. The column is then
+dropped; the downgrade rebuilds it from the rows.
+
+Revision ID: f1c7a3e5b9d2
+Revises: c6b2e9d4f1a8
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "f1c7a3e5b9d2"
+down_revision = "c6b2e9d4f1a8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_messages",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("chat_id", sa.Uuid(), nullable=False),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("content", sa.String(), nullable=False),
+        sa.Column("tools", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["chat_id"], ["chats.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        """
+        INSERT INTO chat_messages (id, chat_id, role, content, tools, created_at)
+        SELECT
+            gen_random_uuid(),
+            chats.id,
+            m.value ->> 'role',
+            m.value ->> 'content',
+            coalesce(m.value -> 'tools', '[]'::json),
+            coalesce(
+                (m.value ->> 'created_at')::timestamptz,
+                chats.created_at + m.position * interval '1 microsecond'
+            )
+        FROM chats, json_array_elements(chats.messages) WITH ORDINALITY AS m(value, position)
+        """
+    )
+    # Built after the copy rather than maintained row by row during it.
+    op.create_index(
+        "ix_chat_messages_chat_id_created_at_id",
+        "chat_messages",
+        ["chat_id", "created_at", "id"],
+    )
+    op.drop_column("chats", "messages")
+
+
+def downgrade() -> None:
+    op.add_column("chats", sa.Column("messages", sa.JSON(), nullable=True))
+    op.execute(
+        """
+        UPDATE chats SET messages = coalesce(
+            (
+                SELECT json_agg(
+                    json_build_object(
+                        'role', role,
+                        'content', content,
+                        'tools', tools,
+                        'created_at', created_at
+                    )
+                    ORDER BY created_at
+                )
+                FROM chat_messages
+                WHERE chat_id = chats.id
+            ),
+            '[]'::json
+        )
+        """
+    )
+    op.alter_column("chats", "messages", nullable=False)
+    op.drop_index("ix_chat_messages_chat_id_created_at_id", table_name="chat_messages")
+    op.drop_table("chat_messages")
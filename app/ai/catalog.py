@@ -17,6 +17,7 @@ import logging
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.ai.utils import invalidate_chat_models
 from app.core.cache import clear_cache
 from app.enums import CacheNamespace
 from app.enums.provider import Provider
@@ -127,22 +128,29 @@ async def sync_chat_models(db: AsyncSession) -> None:
     rows = list((await db.scalars(select(ChatModel))).all())
 
     retired = 0
+    changed = []
     for row in rows:
         spec = pending.pop(row.name, None)
         if spec is None:
             if row.is_active:
                 row.is_active = False
                 retired += 1
+                changed.append(row.id)
             # Never leave a retired row holding the default flag.
             row.is_default = False
             continue
-        for field in _SYNCED_FIELDS:
-            setattr(row, field, spec.get(field, _OPTIONAL_DEFAULTS.get(field)))
+        synced = {field: spec.get(field, _OPTIONAL_DEFAULTS.get(field)) for field in _SYNCED_FIELDS}
+        if not row.is_active or any(getattr(row, f) != v for f, v in synced.items()):
+            changed.append(row.id)
+        for field, value in synced.items():
+            setattr(row, field, value)
         row.is_active = True
 
     added = [ChatModel(**spec) for spec in pending.values()]
     db.add_all(added)
     await db.commit()
+    # Clients built from the old rows would keep routing them the old way.
+    invalidate_chat_models(changed)
 
     if added or retired:
         # The selector endpoint is cached; drop it so the new list shows immediately.
@@ -78,13 +78,18 @@ class ChatContextBuilder:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def system_prompt(self, user_id: UUID) -> str:
+    async def system_prompt(self, user_id: UUID, *, summary: str | None = None) -> str:
+        """`summary` is the chat's rolling summary of messages no longer sent."""
         base = load_prompt("chat_system.md")
         # Blocks load concurrently; each returns "" when it has nothing to add.
-        blocks = await asyncio.gather(
-            self._user_profile(user_id),
-            # future: self._recent_days(user_id), self._active_focus(user_id), ...
-        )
+        blocks = [
+            *await asyncio.gather(
+                self._user_profile(user_id),
+                # future: self._recent_days(user_id), self._active_focus(user_id), ...
+            )
+        ]
+        if summary:
+            blocks.append(render_block("context/chat_summary.md.j2", summary=summary))
         return "\n\n".join([base, *(b for b in blocks if b)])
 
     async def _user_profile(self, user_id: UUID) -> str:
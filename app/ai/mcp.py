@@ -1,36 +1,87 @@
 """MCP tool loading for the in-app agent.
 
-Loads the Memoryful MCP tools for a request, forwarding the user's bearer so the
-MCP server executes each call as that user (per-user isolation).
-
-Note: this is a fresh load per request. We do NOT cache the tool objects, because
-`langchain-mcp-adapters` bakes the bearer into each tool at load time — a shared
-cache would call the MCP server as the wrong user. The proper optimization (cache
-the static tool *schemas* once and inject the bearer per request) needs a small
-custom tool wrapper; left as a deliberate follow-up.
+The tool *schemas* (names, descriptions, argument schemas) are the same for every
+user, so they are listed from the MCP server once per process and kept for
+`MCP_TOOLS_TTL_SECONDS`. Each request then gets its own tool objects, built from
+those schemas, whose calls go through the user's pooled MCP session
+(app.ai.mcp_pool) and so carry the user's bearer; the MCP server executes every
+call as that user (per-user isolation). Tool objects are never shared between
+requests, since each is bound to one bearer.
+
+A listing older than the TTL is fetched again on the next load. The completion
+service drops the listing whenever an agent run fails (`invalidate_mcp_tools`),
+so tools renamed or removed by a redeployed MCP server are picked up on the next
+turn rather than at the end of the TTL.
 """
 
+import asyncio
 import logging
+import time
+from typing import TYPE_CHECKING, Any, cast
 
+from app.ai.mcp_pool import get_mcp_pool
 from app.core.settings import get_settings
 
+if TYPE_CHECKING:
+    from mcp import ClientSession
+    from mcp.types import CallToolResult, Tool
+
 settings = get_settings()
 
 
 logger = logging.getLogger(__name__)
 
+SERVER_NAME = "memoryful"
+
+_listing: "tuple[float, list[Tool]] | None" = None
+_listing_lock = asyncio.Lock()
+
+
+class _UserSession:
+    """Stands in for the `ClientSession` an adapter tool calls: each call goes
+    through the pool's session for this bearer."""
+
+    def __init__(self, access_token: str) -> None:
+        self._access_token = access_token
+
+    async def call_tool(self, name: str, arguments: dict, **kwargs: Any) -> "CallToolResult":
+        return await get_mcp_pool().call_tool(self._access_token, name, arguments, **kwargs)
+
+
+async def _list_tools(access_token: str) -> "list[Tool]":
+    """The MCP server's tool schemas, listed again once the cached listing expires."""
+    global _listing
+
+    async with _listing_lock:
+        if _listing is not None and time.monotonic() - _listing[0] < settings.mcp_tools_ttl_seconds:
+            return _listing[1]
+
+        # Listing doesn't depend on who asks; the caller's bearer only gets us in.
+        tools, cursor = [], None
+        async with get_mcp_pool().session(access_token) as session:
+            while True:
+                page = await session.list_tools(cursor=cursor)
+                tools += page.tools
+                if not (cursor := page.nextCursor):
+                    break
+        logger.info("Listed %d MCP tools", len(tools))
+        _listing = (time.monotonic(), tools)
+        return tools
+
+
+def invalidate_mcp_tools() -> None:
+    """Forget the cached listing; the next load lists the tools again."""
+    global _listing
+    _listing = None
+
 
 async def load_mcp_tools(access_token: str) -> list:
-    """Load the Memoryful MCP tools for a request, bound to the user's bearer."""
-    from langchain_mcp_adapters.client import MultiServerMCPClient
-
-    client = MultiServerMCPClient(
-        {
-            "memoryful": {
-                "url": settings.mcp_server_url,
-                "transport": "streamable_http",
-                "headers": {"Authorization": f"Bearer {access_token}"},
-            }
-        }
-    )
-    return await client.get_tools()
+    """The Memoryful MCP tools for a request, bound to the user's bearer."""
+    from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+
+    # The adapter only calls `call_tool` on a session it is given.
+    session = cast("ClientSession", _UserSession(access_token))
+    return [
+        convert_mcp_tool_to_langchain_tool(session, tool, server_name=SERVER_NAME)
+        for tool in await _list_tools(access_token)
+    ]
@@ -0,0 +1,255 @@
+"""Long-lived MCP client sessions, one per user, shared by that user's tool calls.
+
+Opening a streamable-HTTP MCP session costs an `initialize` round trip and its
+`initialized` notification, and closing one a DELETE; opened per tool call, an
+agent turn with several calls paid that on each. `MCPSessionPool` keeps one
+session per bearer open across calls and turns, so a tool call is one POST. A
+session only ever sends its own user's bearer (its HTTP client's headers), which
+keeps per-user isolation as it was; all sessions share one keep-alive connection
+pool to the MCP server.
+
+At most `MCP_POOL_SIZE` sessions stay open: past that the least recently used is
+closed, as is any session idle for `MCP_POOL_IDLE_SECONDS`. Calls lease their
+session, and one that leaves the pool while leased is closed when its last call
+returns, never under a call in flight. A session idle for
+`MCP_POOL_PING_SECONDS` is pinged before reuse and reopened if the ping fails or
+its connection has dropped. A call that fails because the session went away is
+retried once on a fresh one; the Memoryful tools only read, so a retry cannot
+apply anything twice.
+"""
+
+import asyncio
+import datetime as dt
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from app.core.settings import get_settings
+
+if TYPE_CHECKING:
+    from mcp import ClientSession
+    from mcp.types import CallToolResult
+
+settings = get_settings()
+
+
+logger = logging.getLogger(__name__)
+
+# Per-request timeout on a pooled session, so a dead connection fails the call
+# instead of hanging the turn.
+CALL_TIMEOUT = dt.timedelta(seconds=60)
+PING_TIMEOUT_SECONDS = 5
+# Connections beyond two per session: every open session holds one for the
+# server's GET event stream on top of the ones its POSTs use.
+CONNECTION_HEADROOM = 16
+
+
+def _went_away(error: Exception) -> bool:
+    """Whether a call failed because its session or connection is gone."""
+    from mcp.shared.exceptions import McpError
+    from mcp.types import CONNECTION_CLOSED
+
+    if isinstance(error, ExceptionGroup):
+        return any(_went_away(e) for e in error.exceptions)
+    if isinstance(error, McpError):
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(error, httpx.TransportError | ConnectionError)
+
+
+class _Session:
+    """One open MCP session, held by a task of its own: the transport's task group
+    has to be entered and left by the same task."""
+
+    def __init__(self, url: str, client: httpx.AsyncClient) -> None:
+        self.last_used = time.monotonic()
+        self.busy = 0  # calls holding a lease on it
+        self.retired = False  # out of the pool; closed once `busy` drops to 0
+        self._opened: asyncio.Future[ClientSession] = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._hold(url, client))
+
+    async def _hold(self, url: str, client: httpx.AsyncClient) -> None:
+        from mcp import ClientSession
+        from mcp.client.streamable_http import streamable_http_client
+
+        try:
+            async with (
+                streamable_http_client(url, http_client=client) as (read, write, _),
+                ClientSession(read, write, read_timeout_seconds=CALL_TIMEOUT) as session,
+            ):
+                await session.initialize()
+                self._opened.set_result(session)
+                await self._closing.wait()
+        except Exception as e:
+            if not self._opened.done():
+                self._opened.set_exception(e)
+            else:
+                logger.warning("Pooled MCP session dropped: %s", e)
+
+    @property
+    def alive(self) -> bool:
+        return not self._task.done()
+
+    async def session(self) -> "ClientSession":
+        return await self._opened
+
+    async def close(self) -> None:
+        self._closing.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """Open MCP sessions keyed by bearer; see the module docstring."""
+
+    def __init__(self, url: str, *, size: int) -> None:
+        self.url = url
+        self.size = size
+        connections = 2 * size + CONNECTION_HEADROOM
+        self._transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+        )
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def _client(self, access_token: str) -> httpx.AsyncClient:
+        # Never closed itself: closing a client closes its transport, which is shared.
+        return httpx.AsyncClient(
+            transport=self._transport,
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=httpx.Timeout(30, read=300),
+        )
+
+    @staticmethod
+    def _retire(held: _Session) -> list[_Session]:
+        """Mark a session that left the pool; it is closable now only if idle."""
+        held.retired = True
+        return [] if held.busy else [held]
+
+    async def _checkout(self, access_token: str) -> _Session:
+        """The bearer's open session, opening one if it has none or it went away.
+
+        The session is leased to the caller, who hands it back with `_release`
+        (or `_drop`)."""
+        stale: list[_Session] = []
+        async with self._lock:
+            now = time.monotonic()
+            for key, other in list(self._sessions.items()):
+                if (
+                    key != access_token
+                    and not other.busy
+                    and now - other.last_used > settings.mcp_pool_idle_seconds
+                ):
+                    stale += self._retire(self._sessions.pop(key))
+
+            held = self._sessions.get(access_token)
+            if held is not None and not held.alive:
+                stale += self._retire(self._sessions.pop(access_token))
+                held = None
+            if held is None:
+                held = _Session(self.url, self._client(access_token))
+                self._sessions[access_token] = held
+                while len(self._sessions) > self.size:
+                    stale += self._retire(self._sessions.popitem(last=False)[1])
+            self._sessions.move_to_end(access_token)
+            idle = now - held.last_used
+            held.last_used = now
+            held.busy += 1
+
+        for session in stale:
+            await session.close()
+        if idle > settings.mcp_pool_ping_seconds and not await self._healthy(held):
+            await self._drop(access_token, held)
+            return await self._checkout(access_token)
+        return held
+
+    async def _healthy(self, held: _Session) -> bool:
+        try:
+            async with asyncio.timeout(PING_TIMEOUT_SECONDS):
+                await (await held.session()).send_ping()
+        except Exception:
+            logger.info("Pooled MCP session failed its health check; reopening")
+            return False
+        return True
+
+    async def _release(self, held: _Session) -> None:
+        """Hand back a lease; closes the session if it left the pool meanwhile."""
+        async with self._lock:
+            held.busy -= 1
+            close = held.retired and not held.busy
+        if close:
+            await held.close()
+
+    async def _drop(self, access_token: str, held: _Session) -> None:
+        """Hand back a lease on a session found broken, taking it out of the pool."""
+        async with self._lock:
+            if self._sessions.get(access_token) is held:
+                del self._sessions[access_token]
+            held.retired = True
+        await self._release(held)
+
+    @asynccontextmanager
+    async def session(self, access_token: str) -> AsyncIterator["ClientSession"]:
+        """An initialized session that calls the MCP server as this bearer's user,
+        leased for the block."""
+        held = await self._checkout(access_token)
+        try:
+            session = await held.session()
+        except Exception:
+            await self._drop(access_token, held)
+            raise
+        try:
+            yield session
+        finally:
+            await self._release(held)
+
+    async def call_tool(
+        self, access_token: str, name: str, arguments: dict[str, Any], **kwargs: Any
+    ) -> "CallToolResult":
+        retried = False
+        while True:
+            held = await self._checkout(access_token)
+            dropped = False
+            try:
+                return await (await held.session()).call_tool(name, arguments, **kwargs)
+            except Exception as e:
+                if retried or not _went_away(e):
+                    raise
+                logger.info("MCP call %s lost its pooled session (%s); retrying", name, e)
+                await self._drop(access_token, held)
+                dropped = retried = True
+            finally:
+                if not dropped:
+                    await self._release(held)
+
+    async def close(self) -> None:
+        async with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        await asyncio.gather(*(held.close() for held in sessions))
+        await self._transport.aclose()
+
+
+_pool: MCPSessionPool | None = None
+_pool_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_mcp_pool() -> MCPSessionPool:
+    """The process's pool, for the running event loop (Celery and tests run their own)."""
+    global _pool, _pool_loop
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool_loop is not loop:
+        _pool = MCPSessionPool(settings.mcp_server_url, size=settings.mcp_pool_size)
+        _pool_loop = loop
+    return _pool
+
+
+async def close_mcp_pool() -> None:
+    global _pool, _pool_loop
+    if _pool is not None:
+        pool, _pool, _pool_loop = _pool, None, None
+        await pool.close()
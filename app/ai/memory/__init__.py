@@ -0,0 +1,12 @@
+"""What of a long chat reaches the model.
+
+Each turn sends the latest messages that fit in `CHAT_CONTEXT_TOKENS`, counted
+with the chat model's tokenizer. Messages that no longer fit are folded, in the
+background, into a summary stored on the chat, which goes into the system prompt
+in their place.
+"""
+
+from .budget import Tokenizer, fit_history, message_tokens, tokenizer_for
+from .summary import summarize_chat
+
+__all__ = ["Tokenizer", "fit_history", "message_tokens", "summarize_chat", "tokenizer_for"]
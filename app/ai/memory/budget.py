@@ -0,0 +1,85 @@
+"""Token counting and the per-turn history budget."""
+
+import logging
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import TYPE_CHECKING, Protocol
+
+from app.enums.provider import Provider
+from app.models import ChatModel
+from app.schemas import MessageSchema
+
+if TYPE_CHECKING:
+    import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Role markers and separators each message costs on top of its text.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class Tokenizer(Protocol):
+    def count(self, text: str) -> int: ...
+
+
+class _Tiktoken:
+    def __init__(self, encoding: "tiktoken.Encoding"):
+        self._encoding = encoding
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+class _Approximate:
+    """About four characters a token, for when no encoding can be loaded."""
+
+    def count(self, text: str) -> int:
+        return len(text) // 4 + 1
+
+
+@lru_cache(maxsize=64)
+def _tokenizer(provider: str, name: str) -> Tokenizer:
+    import tiktoken
+
+    if provider == Provider.openai:
+        try:
+            return _Tiktoken(tiktoken.encoding_for_model(name))
+        except KeyError:
+            pass
+    # Other providers ship no local tokenizer (counting through their APIs is a
+    # network call); o200k_base is close enough to budget with. Its first load
+    # downloads the encoding, which an offline host cannot do.
+    try:
+        return _Tiktoken(tiktoken.get_encoding("o200k_base"))
+    except Exception:
+        logger.warning("tiktoken encoding unavailable; approximating token counts", exc_info=True)
+        return _Approximate()
+
+
+def tokenizer_for(model: ChatModel) -> Tokenizer:
+    """The tokenizer for a catalog model, built once per provider and model id."""
+    return _tokenizer(model.provider, model.name)
+
+
+def message_tokens(message: MessageSchema, tokenizer: Tokenizer) -> int:
+    return tokenizer.count(message.content) + MESSAGE_OVERHEAD_TOKENS
+
+
+def fit_history(
+    messages: Sequence[MessageSchema], tokenizer: Tokenizer, budget: int
+) -> tuple[list[MessageSchema], list[MessageSchema]]:
+    """Split `messages` (oldest first) into `(older, recent)`.
+
+    `recent` is the longest tail that fits in `budget` tokens and starts with a
+    user message, so the model never sees a reply without its question. The last
+    message is always kept, even alone over budget: it is the one being answered.
+    """
+    start, used = len(messages), 0
+    for index in range(len(messages) - 1, -1, -1):
+        used += message_tokens(messages[index], tokenizer)
+        if used > budget and index < len(messages) - 1:
+            break
+        start = index
+    while start < len(messages) - 1 and messages[start].role != "user":
+        start += 1
+    return list(messages[:start]), list(messages[start:])
@@ -0,0 +1,77 @@
+"""The rolling summary that stands in for messages past the context budget."""
+
+import logging
+from uuid import UUID
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+
+from app.ai.memory.budget import fit_history, tokenizer_for
+from app.ai.services.chats import ChatStore
+from app.ai.utils import build_chat_model, get_default_chat_model, load_prompt
+from app.core.config import redis
+from app.core.database import AsyncSessionLocal
+from app.core.settings import get_settings
+from app.enums import RedisPrefix
+from app.models import Chat
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+# What is left unsummarized after a run, as a share of the budget: the headroom
+# lets several turns pass before the next run is needed.
+KEEP_AFTER_SUMMARY = 0.5
+
+
+async def summarize_chat(chat_id: UUID) -> None:
+    """Fold the chat's messages that no longer fit the context budget into its summary.
+
+    Incremental: only the previous summary and the messages after it go to the
+    model. A run that finds another one got there first discards its result.
+    Releases the chat's summary lock, taken by whoever queued the run.
+    """
+    try:
+        await _summarize(chat_id)
+    finally:
+        await redis.delete(f"{RedisPrefix.chat_summary}{chat_id}")
+
+
+async def _summarize(chat_id: UUID) -> None:
+    async with AsyncSessionLocal() as db:
+        chat = await db.scalar(
+            select(Chat)
+            .options(selectinload(Chat.chat_model))
+            .where(Chat.id == chat_id, Chat.is_deleted == False)
+        )  # fmt: skip
+        if not chat:
+            return
+        messages = await ChatStore(db).messages(chat.id, after=chat.summary_until)
+        budget = int(settings.chat_context_tokens * KEEP_AFTER_SUMMARY)
+        older, _ = fit_history(messages, tokenizer_for(chat.chat_model), budget)
+        if not older:
+            return
+
+        transcript = "\n\n".join(f"{m.role}: {m.content}" for m in older)
+        llm = build_chat_model(await get_default_chat_model(db))
+        response = await llm.ainvoke(
+            [
+                SystemMessage(content=load_prompt("chat_summary.md")),
+                HumanMessage(
+                    content=f"Current summary:\n{chat.summary or '(none)'}\n\n"
+                    f"New messages:\n{transcript}"
+                ),
+            ]
+        )
+        summary = response.text.strip()
+        if not summary:
+            logger.warning("Empty summary for chat %s; keeping the previous one", chat.id)
+            return
+
+        await db.execute(
+            update(Chat)
+            .where(Chat.id == chat.id, Chat.summary_until.is_not_distinct_from(chat.summary_until))
+            .values(summary=summary, summary_until=older[-1].created_at)
+        )
+        await db.commit()
@@ -1,41 +1,141 @@
+import base64
+import binascii
 import datetime as dt
 import json
 import logging
+import uuid
+import zlib
+from collections import defaultdict
+from collections.abc import Sequence
 from typing import Any, cast
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import CursorResult, select, update
+from sqlalchemy import CursorResult, delete, func, insert, literal, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.constants import CACHE_TTL_CHAT_HOT, CACHE_TTL_USER_DATA
+from app.constants import CACHE_TTL_CHAT_HOT, CACHE_TTL_USER_DATA, CHAT_MESSAGE_WINDOW
 from app.core.config import redis
 from app.enums import RedisPrefix
-from app.models import Chat, ChatModel
-from app.schemas import ChatDetail, ChatListItem
+from app.models import Chat, ChatArchive, ChatMessage, ChatModel
+from app.schemas import ChatDetail, ChatListItem, MessagePage, MessageSchema
 
 logger = logging.getLogger(__name__)
 
 
 def _chat_key(chat_id: UUID) -> str:
-    return f"{RedisPrefix.chat}{chat_id}"
+    return f"{RedisPrefix.chat_header}{chat_id}"
+
+
+def _chat_messages_key(chat_id: UUID) -> str:
+    return f"{RedisPrefix.chat_messages}{chat_id}"
 
 
 def _chat_list_key(user_id: UUID) -> str:
     return f"{RedisPrefix.chat_list}{user_id}"
 
 
+def _cursor(message: MessageSchema) -> str:
+    """Opaque keyset position of a stored message: its `(created_at, id)`."""
+    if message.created_at is None or message.id is None:
+        raise ValueError("Only a stored message has a cursor")
+    return base64.urlsafe_b64encode(
+        f"{message.created_at.isoformat()}|{message.id}".encode()
+    ).decode()
+
+
+def _parse_cursor(cursor: str) -> tuple[dt.datetime, UUID]:
+    try:
+        created_at, message_id = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return dt.datetime.fromisoformat(created_at), UUID(message_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(400, "Invalid cursor") from e
+
+
+def _with_window(detail: ChatDetail, messages: list[MessageSchema]) -> ChatDetail:
+    """`detail` serving `messages`, the latest window. A full window may have older
+    messages before it, so it carries the cursor to them."""
+    older_cursor = _cursor(messages[0]) if len(messages) == CHAT_MESSAGE_WINDOW else None
+    return detail.model_copy(update={"messages": messages, "older_cursor": older_cursor})
+
+
+# Per-request parts of a `ChatDetail`, kept out of the cached header.
+_NOT_IN_HEADER = {"messages", "older_cursor"}
+
+
 class ChatStore:
     """Persistence + write-through Redis cache for chats. One instance per request
-    (holds the session); DB is the source of truth."""
+    (holds the session); DB is the source of truth.
+
+    A cached chat is a small header hash (`user_id`, the `ChatDetail` JSON without
+    messages, and `count`, the messages pushed so far) and a list of its latest
+    `CHAT_MESSAGE_WINDOW` messages as JSON. A turn pushes its own messages and
+    rewrites only the header, so its cache cost does not grow with the chat. A
+    read trusts the pair only when the header is whole and the list holds as many
+    messages as `count` says. A missing key, expired or evicted, is then a miss
+    rather than a chat with messages lost.
+    """
 
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def _cache(self, chat: Chat) -> None:
+    async def _cache(self, detail: ChatDetail) -> None:
+        """Write a chat's whole cache entry, replacing whatever was there."""
+        header, messages = _chat_key(detail.id), _chat_messages_key(detail.id)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(header, messages)
+            pipe.hset(
+                header,
+                mapping={
+                    "user_id": str(detail.user_id),
+                    "detail": detail.model_dump_json(exclude=_NOT_IN_HEADER),
+                    "count": len(detail.messages),
+                },
+            )
+            if detail.messages:
+                pipe.rpush(messages, *(m.model_dump_json() for m in detail.messages))
+            pipe.expire(header, CACHE_TTL_CHAT_HOT)
+            pipe.expire(messages, CACHE_TTL_CHAT_HOT)
+            await pipe.execute()
+
+    async def _cache_turn(self, chat: Chat, new: Sequence[MessageSchema]) -> None:
+        """Push a turn's messages onto a cached chat and refresh its header.
+
+        A chat that is not cached gets no whole entry from this: the header it
+        leaves lacks `user_id`, and the next read rebuilds the entry from the DB.
+        """
+        header, messages = _chat_key(chat.id), _chat_messages_key(chat.id)
         detail = ChatDetail.model_validate(chat)
-        await redis.set(_chat_key(chat.id), detail.model_dump_json(), ex=CACHE_TTL_CHAT_HOT)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(messages, *(m.model_dump_json() for m in new))
+            pipe.ltrim(messages, -CHAT_MESSAGE_WINDOW, -1)
+            pipe.hset(header, "detail", detail.model_dump_json(exclude=_NOT_IN_HEADER))
+            pipe.hincrby(header, "count", len(new))
+            pipe.expire(header, CACHE_TTL_CHAT_HOT)
+            pipe.expire(messages, CACHE_TTL_CHAT_HOT)
+            await pipe.execute()
+
+    async def _cached(self, chat_id: UUID, user_id: UUID) -> ChatDetail | None:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(_chat_key(chat_id))
+            pipe.lrange(_chat_messages_key(chat_id), -CHAT_MESSAGE_WINDOW, -1)
+            header, messages = await pipe.execute()
+        if (
+            header.get("user_id") != str(user_id)
+            or "detail" not in header
+            or len(messages) != min(int(header.get("count", -1)), CHAT_MESSAGE_WINDOW)
+        ):
+            return None
+        return _with_window(
+            ChatDetail.model_validate_json(header["detail"]),
+            [MessageSchema.model_validate_json(m) for m in messages],
+        )
+
+    async def _detail(self, chat: Chat) -> ChatDetail:
+        """`ChatDetail` of a loaded chat, with its latest window of messages."""
+        messages = await self.messages(chat.id, limit=CHAT_MESSAGE_WINDOW)
+        return _with_window(ChatDetail.model_validate(chat), messages)
 
     async def _invalidate_list(self, user_id: UUID) -> None:
         await redis.delete(_chat_list_key(user_id))
@@ -55,15 +155,62 @@ class ChatStore:
 
     async def get(self, chat_id: UUID, user_id: UUID) -> ChatDetail:
         """Read-through: try the hot cache first, fall back to DB on miss."""
-        cached = await redis.get(_chat_key(chat_id))
+        cached = await self._cached(chat_id, user_id)
         if cached:
-            detail = ChatDetail.model_validate_json(cached)
-            if detail.user_id == user_id:
-                return detail
+            return cached
 
         chat = await self.load(chat_id, user_id)
-        await self._cache(chat)
-        return ChatDetail.model_validate(chat)
+        detail = await self._detail(chat)
+        await self._cache(detail)
+        return detail
+
+    async def messages(
+        self,
+        chat_id: UUID,
+        *,
+        limit: int | None = None,
+        before: str | None = None,
+        after: dt.datetime | None = None,
+    ) -> list[MessageSchema]:
+        """The chat's messages oldest first; with `limit`, only the latest `limit`,
+        with `before` (a cursor), only those older than it, and with `after`, only
+        those created later."""
+        stmt = (
+            select(ChatMessage)
+            .where(ChatMessage.chat_id == chat_id)
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .limit(limit)
+        )  # fmt: skip
+        if after is not None:
+            stmt = stmt.where(ChatMessage.created_at > after)
+        if before is not None:
+            created_at, message_id = _parse_cursor(before)
+            stmt = stmt.where(
+                tuple_(ChatMessage.created_at, ChatMessage.id)
+                < tuple_(literal(created_at), literal(message_id))
+            )
+        rows = (await self.db.scalars(stmt)).all()
+        return [MessageSchema.model_validate(row) for row in reversed(rows)]
+
+    async def page(
+        self, chat_id: UUID, user_id: UUID, *, limit: int, before: str | None = None
+    ) -> MessagePage:
+        """Up to `limit` messages before the cursor (the latest without one), read
+        straight off `ix_chat_messages_chat_id_created_at_id`."""
+        owned = await self.db.scalar(
+            select(Chat.id).where(
+                Chat.id == chat_id, Chat.user_id == user_id, Chat.is_deleted == False
+            )
+        )  # fmt: skip
+        if not owned:
+            raise HTTPException(404, "Chat not found")
+
+        # One extra row tells whether anything is older than this page.
+        messages = await self.messages(chat_id, limit=limit + 1, before=before)
+        if len(messages) <= limit:
+            return MessagePage(messages=messages, older_cursor=None)
+        messages = messages[1:]
+        return MessagePage(messages=messages, older_cursor=_cursor(messages[0]))
 
     async def list(
         self,
@@ -106,13 +253,13 @@ class ChatStore:
         if not chat_model:
             raise HTTPException(404, "Chat Model not found")
 
-        chat = Chat(user_id=user_id, model_id=model_id, title=title, messages=[])
+        chat = Chat(user_id=user_id, model_id=model_id, title=title)
         self.db.add(chat)
         await self.db.commit()
         await self.db.refresh(chat)
         chat.chat_model = chat_model
 
-        await self._cache(chat)
+        await self._cache(ChatDetail.model_validate(chat))
         await self._invalidate_list(user_id)
         return chat
 
@@ -128,28 +275,130 @@ class ChatStore:
             raise HTTPException(404, "Chat not found")
         await self.db.commit()
 
+        # Only the header changes; the cached messages stay as they are.
         chat = await self.load(chat_id, user_id)
-        await self._cache(chat)
+        detail = ChatDetail.model_validate(chat)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(_chat_key(chat_id), "detail", detail.model_dump_json(exclude=_NOT_IN_HEADER))
+            pipe.expire(_chat_key(chat_id), CACHE_TTL_CHAT_HOT)
+            await pipe.execute()
         await self._invalidate_list(user_id)
 
     async def delete(self, chat_id: UUID, user_id: UUID) -> None:
+        # Deleting twice keeps the first deletion time, which the archiver's retention
+        # window counts from.
         stmt = (
-            update(Chat).where(Chat.id == chat_id, Chat.user_id == user_id).values(is_deleted=True)
-        )
+            update(Chat)
+            .where(Chat.id == chat_id, Chat.user_id == user_id, Chat.is_deleted == False)
+            .values(is_deleted=True, deleted_at=func.now())
+        )  # fmt: skip
         await self.db.execute(stmt)
         await self.db.commit()
 
-        await redis.delete(_chat_key(chat_id))
+        await redis.delete(_chat_key(chat_id), _chat_messages_key(chat_id))
         await self._invalidate_list(user_id)
 
-    async def persist(self, chat: Chat, user_id: UUID, *, invalidate_list: bool = False) -> Chat:
-        """Commit pending changes (e.g. appended messages), refresh cache from a
-        clean reload, return it."""
-        chat.updated_at = dt.datetime.now(dt.UTC)
+    async def append(
+        self,
+        chat: Chat,
+        user_id: UUID,
+        messages: Sequence[MessageSchema],
+        *,
+        invalidate_list: bool = False,
+    ) -> Chat:
+        """Insert a turn's messages and commit, then push them onto the cache.
+
+        The earlier messages are never rewritten, in the DB or in Redis, so a turn
+        writes the same few rows and cache entries however long the chat is.
+        """
+        now = dt.datetime.now(dt.UTC)
+        # Ids and times are fixed here so the cached copies carry them too.
+        messages = [
+            m.model_copy(update={"id": m.id or uuid.uuid4(), "created_at": m.created_at or now})
+            for m in messages
+        ]
+        await self.db.execute(
+            insert(ChatMessage),
+            [
+                {
+                    "id": message.id,
+                    "chat_id": chat.id,
+                    "role": message.role,
+                    "content": message.content,
+                    "tools": [tool.model_dump() for tool in message.tools],
+                    "created_at": message.created_at,
+                }
+                for message in messages
+            ],
+        )
+        chat.updated_at = now
         await self.db.commit()
 
-        fresh = await self.load(chat.id, user_id)
-        await self._cache(fresh)
+        await self._cache_turn(chat, messages)
         if invalidate_list:
             await self._invalidate_list(user_id)
-        return fresh
+        return chat
+
+
+async def archive_deleted_chats(
+    db: AsyncSession, *, deleted_before: dt.datetime, batch_size: int
+) -> int:
+    """Move one batch of chats deleted before `deleted_before` into `chat_archives`.
+
+    Copies and hard-deletes in one transaction, then commits; returns how many chats
+    moved, so fewer than `batch_size` means the backlog is drained. Rows are claimed
+    with SKIP LOCKED: concurrent runs split the work rather than queue on each other.
+    """
+    rows = (
+        await db.execute(
+            select(
+                Chat.id,
+                Chat.user_id,
+                Chat.model_id,
+                Chat.title,
+                Chat.created_at,
+                Chat.deleted_at,
+            )
+            .where(Chat.is_deleted == True, Chat.deleted_at < deleted_before)
+            .order_by(Chat.deleted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()  # fmt: skip
+    if not rows:
+        return 0
+
+    # The archived message list keeps the shape `chats.messages` had.
+    messages: dict[UUID, list[dict]] = defaultdict(list)
+    stored = await db.scalars(
+        select(ChatMessage)
+        .where(ChatMessage.chat_id.in_([row.id for row in rows]))
+        .order_by(ChatMessage.chat_id, ChatMessage.created_at)
+    )
+    for message in stored:
+        messages[message.chat_id].append(
+            MessageSchema.model_validate(message).model_dump(mode="json")
+        )
+
+    await db.execute(
+        insert(ChatArchive),
+        [
+            {
+                "id": row.id,
+                "user_id": row.user_id,
+                "model_id": row.model_id,
+                "title": row.title,
+                "message_count": len(messages[row.id]),
+                "messages": zlib.compress(
+                    json.dumps(messages[row.id], separators=(",", ":")).encode()
+                ),
+                "created_at": row.created_at,
+                "deleted_at": row.deleted_at,
+            }
+            for row in rows
+        ],
+    )
+    # `chat_messages` rows go with their chats (ON DELETE CASCADE).
+    await db.execute(delete(Chat).where(Chat.id.in_([row.id for row in rows])))
+    await db.commit()
+    return len(rows)
@@ -9,15 +9,25 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.context import ChatContextBuilder
-from app.ai.mcp import load_mcp_tools
+from app.ai.mcp import invalidate_mcp_tools
+from app.ai.memory import fit_history, tokenizer_for
 from app.ai.services.chats import ChatStore
+from app.ai.tools import load_agent_tools
 from app.ai.utils import build_chat_model
+from app.core.config import redis
+from app.core.settings import get_settings
+from app.enums import RedisPrefix
 from app.models import Chat
 from app.schemas import MessageSchema, ToolCallSchema
+from app.tasks.ai_tasks import summarize_chat_task
+
+settings = get_settings()
 
 logger = logging.getLogger(__name__)
 
 TITLE_MAX_LEN = 60
+# One summary run per chat at a time; a run that dies frees the chat after this.
+SUMMARY_LOCK_SECONDS = 10 * 60
 
 
 def _derive_title(content: str) -> str:
@@ -47,12 +57,6 @@ def _extract_text(content: object) -> str:
     return str(content)
 
 
-def _dump(message: MessageSchema) -> dict:
-    """JSON-mode dump for the `chats.messages` JSON column: `created_at` has to go
-    in as an ISO string, not a datetime."""
-    return message.model_dump(mode="json")
-
-
 def _tool_args(raw: object) -> dict:
     """Shrink tool input to something small and JSON-safe for the UI."""
     if not isinstance(raw, dict):
@@ -66,22 +70,22 @@ def _tool_args(raw: object) -> dict:
     return args
 
 
-def _to_lc_history(messages: list[dict[str, str]]) -> list:
-    """Flat {role, content} history -> LangChain messages. No system message: the
-    plain path prepends it, the agent path passes system_prompt to create_agent."""
+def _to_lc_history(messages: list[MessageSchema]) -> list:
+    """Stored history -> LangChain messages. No system message: the plain path
+    prepends it, the agent path passes system_prompt to create_agent."""
     lc_messages: list = []
     for m in messages:
-        if m["role"] == "user":
-            lc_messages.append(HumanMessage(content=m["content"]))
-        elif m["role"] == "assistant":
-            lc_messages.append(AIMessage(content=m["content"]))
-        elif m["role"] == "system":
-            lc_messages.append(SystemMessage(content=m["content"]))
+        if m.role == "user":
+            lc_messages.append(HumanMessage(content=m.content))
+        elif m.role == "assistant":
+            lc_messages.append(AIMessage(content=m.content))
+        elif m.role == "system":
+            lc_messages.append(SystemMessage(content=m.content))
     return lc_messages
 
 
 class ChatAgent:
-    """Runs a single chat turn: model routing + optional MCP tool loop, persisting
+    """Runs a single chat turn: model routing + optional tool loop, persisting
     via ChatStore. One instance per request."""
 
     def __init__(self, db: AsyncSession):
@@ -100,25 +104,20 @@ class ChatAgent:
     ) -> tuple[Chat, MessageSchema]:
         is_new_chat = chat_id is None
 
-        if chat_id is None:
-            if not model_id:
-                raise HTTPException(400, "model_id is required to start a new chat")
-            chat = await self.store.create(user_id, model_id, title=_derive_title(content))
-        else:
-            chat = await self.store.load(chat_id, user_id)
+        chat, history = await self._open(user_id, chat_id, model_id, content)
 
         user_message = MessageSchema(
             role="user", content=content, created_at=dt.datetime.now(dt.UTC)
         )
-        chat.messages = [*chat.messages, _dump(user_message)]
-
-        reply_text = await self._generate_reply(chat, access_token)
+        history = await self._within_budget(chat, [*history, user_message])
+        reply_text = await self._generate_reply(chat, history, access_token)
         assistant_message = MessageSchema(
             role="assistant", content=reply_text, created_at=dt.datetime.now(dt.UTC)
         )
 
-        chat.messages = [*chat.messages, _dump(assistant_message)]
-        chat = await self.store.persist(chat, user_id, invalidate_list=is_new_chat)
+        chat = await self.store.append(
+            chat, user_id, [user_message, assistant_message], invalidate_list=is_new_chat
+        )
 
         return chat, assistant_message
 
@@ -137,16 +136,11 @@ class ChatAgent:
         """
         is_new_chat = chat_id is None
 
-        if chat_id is None:
-            if not model_id:
-                raise HTTPException(400, "model_id is required to start a new chat")
-            chat = await self.store.create(user_id, model_id, title=_derive_title(content))
-        else:
-            chat = await self.store.load(chat_id, user_id)
+        chat, history = await self._open(user_id, chat_id, model_id, content)
 
         user_created_at = dt.datetime.now(dt.UTC)
         user_message = MessageSchema(role="user", content=content, created_at=user_created_at)
-        chat.messages = [*chat.messages, _dump(user_message)]
+        history = await self._within_budget(chat, [*history, user_message])
 
         yield {
             "type": "start",
@@ -161,7 +155,7 @@ class ChatAgent:
         segments: list[str] = []
         current: list[str] = []
         tools: list[ToolCallSchema] = []
-        async for event in self._stream_reply(chat, access_token):
+        async for event in self._stream_reply(chat, history, access_token):
             if event["type"] == "token":
                 current.append(event["text"])
             elif event["type"] == "toolCall":
@@ -182,8 +176,9 @@ class ChatAgent:
             tools=tools,
             created_at=assistant_created_at,
         )
-        chat.messages = [*chat.messages, _dump(assistant_message)]
-        chat = await self.store.persist(chat, user_id, invalidate_list=is_new_chat)
+        chat = await self.store.append(
+            chat, user_id, [user_message, assistant_message], invalidate_list=is_new_chat
+        )
 
         yield {
             "type": "done",
@@ -193,22 +188,54 @@ class ChatAgent:
             "createdAt": assistant_created_at.isoformat(),
         }
 
-    async def _stream_reply(self, chat: Chat, access_token: str | None) -> AsyncIterator[dict]:
+    async def _open(
+        self, user_id: UUID, chat_id: UUID | None, model_id: UUID | None, content: str
+    ) -> tuple[Chat, list[MessageSchema]]:
+        """The chat a turn goes to (created when `chat_id` is None) and its messages
+        since its summary."""
+        if chat_id is None:
+            if not model_id:
+                raise HTTPException(400, "model_id is required to start a new chat")
+            chat = await self.store.create(user_id, model_id, title=_derive_title(content))
+            return chat, []
+        chat = await self.store.load(chat_id, user_id)
+        return chat, await self.store.messages(chat.id, after=chat.summary_until)
+
+    async def _within_budget(
+        self, chat: Chat, messages: list[MessageSchema]
+    ) -> list[MessageSchema]:
+        """The latest messages that fit the context budget. Any left over are queued
+        to be folded into the chat's summary, which stands in for them next time."""
+        older, recent = fit_history(
+            messages, tokenizer_for(chat.chat_model), settings.chat_context_tokens
+        )
+        if older and await redis.set(
+            f"{RedisPrefix.chat_summary}{chat.id}", 1, nx=True, ex=SUMMARY_LOCK_SECONDS
+        ):
+            summarize_chat_task.delay(str(chat.id))
+        return recent
+
+    async def _stream_reply(
+        self, chat: Chat, messages: list[MessageSchema], access_token: str | None
+    ) -> AsyncIterator[dict]:
         """Stream the reply, preferring the tool loop. If the agent fails before
         emitting anything we fall back to a plain stream; if it fails mid-stream we
         surface an error instead, so the user never sees duplicated text."""
-        system_prompt = await self.context.system_prompt(chat.user_id)
+        system_prompt = await self.context.system_prompt(chat.user_id, summary=chat.summary)
         llm = build_chat_model(chat.chat_model)
-        history = _to_lc_history(chat.messages)
+        history = _to_lc_history(messages)
 
         if chat.chat_model.supports_tools and access_token:
             emitted = False
             try:
-                async for event in self._stream_agent(llm, system_prompt, history, access_token):
+                async for event in self._stream_agent(
+                    llm, system_prompt, history, chat.user_id, access_token
+                ):
                     emitted = True
                     yield event
             except Exception:
-                logger.exception("MCP agent stream failed (emitted=%s)", emitted)
+                logger.exception("Agent stream failed (emitted=%s)", emitted)
+                invalidate_mcp_tools()
                 if emitted:
                     yield {
                         "type": "error",
@@ -222,13 +249,21 @@ class ChatAgent:
             yield event
 
     async def _stream_agent(
-        self, llm: BaseChatModel, system_prompt: str, history: list, access_token: str
+        self,
+        llm: BaseChatModel,
+        system_prompt: str,
+        history: list,
+        user_id: UUID,
+        access_token: str,
     ) -> AsyncIterator[dict]:
         from langchain.agents import create_agent
 
-        tools = await load_mcp_tools(access_token)
+        tools = await load_agent_tools(user_id, access_token)
         agent = create_agent(llm, tools, system_prompt=system_prompt)
 
+        # Tool calls of a step run concurrently and finish in any order; results are
+        # held back so they come out in the order of their calls.
+        results: dict[str, dict | None] = {}
         async for event in agent.astream_events({"messages": history}):
             kind = event.get("event")
             if kind == "on_chat_model_stream":
@@ -237,13 +272,19 @@ class ChatAgent:
                 if text:
                     yield {"type": "token", "text": text}
             elif kind == "on_tool_start":
+                results[event["run_id"]] = None
                 yield {
                     "type": "toolCall",
                     "name": event.get("name", ""),
                     "args": _tool_args(event.get("data", {}).get("input")),
                 }
             elif kind == "on_tool_end":
-                yield {"type": "toolResult", "name": event.get("name", "")}
+                results[event["run_id"]] = {"type": "toolResult", "name": event.get("name", "")}
+                for run_id, result in list(results.items()):
+                    if result is None:
+                        break
+                    del results[run_id]
+                    yield result
 
     async def _stream_plain(
         self, llm: BaseChatModel, system_prompt: str, history: list
@@ -253,30 +294,41 @@ class ChatAgent:
             if text:
                 yield {"type": "token", "text": text}
 
-    async def _generate_reply(self, chat: Chat, access_token: str | None) -> str:
+    async def _generate_reply(
+        self, chat: Chat, messages: list[MessageSchema], access_token: str | None
+    ) -> str:
         """Reply to the chat's current history. Tool-capable models with a bearer run
-        the MCP loop; everything else (and any MCP failure) falls back to plain completion."""
-        system_prompt = await self.context.system_prompt(chat.user_id)
+        the tool loop; everything else (and any agent failure) falls back to plain completion."""
+        system_prompt = await self.context.system_prompt(chat.user_id, summary=chat.summary)
         llm = build_chat_model(chat.chat_model)
-        history = _to_lc_history(chat.messages)
+        history = _to_lc_history(messages)
 
         if chat.chat_model.supports_tools and access_token:
             try:
-                return await self._run_agent(llm, system_prompt, history, access_token)
+                return await self._run_agent(
+                    llm, system_prompt, history, chat.user_id, access_token
+                )
             except Exception:
-                logger.exception("MCP agent loop failed; falling back to plain completion")
+                logger.exception("Agent loop failed; falling back to plain completion")
+                invalidate_mcp_tools()
 
         response = await llm.ainvoke([SystemMessage(content=system_prompt), *history])
         return _extract_text(response.content)
 
     async def _run_agent(
-        self, llm: BaseChatModel, system_prompt: str, history: list, access_token: str
+        self,
+        llm: BaseChatModel,
+        system_prompt: str,
+        history: list,
+        user_id: UUID,
+        access_token: str,
     ) -> str:
-        """Run the MCP tool loop over the (cached) tools for this bearer, which the
-        MCP server executes as that user (per-user isolation)."""
+        """Run the tool loop over this user's tools (`AGENT_TOOLS`): in-process ones
+        act as `user_id`, MCP ones carry the bearer, which the MCP server executes
+        as that user (per-user isolation)."""
         from langchain.agents import create_agent
 
-        tools = await load_mcp_tools(access_token)
+        tools = await load_agent_tools(user_id, access_token)
         agent = create_agent(llm, tools, system_prompt=system_prompt)
         result = await agent.ainvoke({"messages": history})
 
@@ -0,0 +1,102 @@
+"""The agent's tools, run in this process.
+
+The same tools as the MCP server (`mcp_server/main.py`), with the same names,
+arguments and descriptions. Each calls the route its MCP twin requests over
+HTTP, here directly and as the chat's user (`ToolContext`). A tool call costs
+the route's own queries instead of two HTTP hops, a token check and two JSON
+round trips on top of them.
+
+`AGENT_TOOLS` picks these (`local`) or the MCP server's (`mcp`, the default) for
+the in-app agent per deployment; the MCP server stays up for external clients
+either way.
+"""
+
+import inspect
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from functools import cache
+from uuid import UUID
+
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+from langchain_core.tools.base import create_schema_from_function
+from langchain_core.utils.pydantic import TypeBaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.mcp import load_mcp_tools
+from app.core.database import AsyncSessionLocal
+from app.core.settings import get_settings
+
+from . import days, insights, months, suggestions, tags, trackables, workspaces
+from .context import ToolContext, ToolError
+from .turn import for_turn
+
+settings = get_settings()
+
+# In the order mcp_server/main.py registers them.
+TOOLS = (
+    days.get_days,
+    days.get_day_by_timestamp,
+    days.get_random_day,
+    months.get_months_by_year,
+    months.get_month_by_year_and_month_number,
+    insights.get_insights,
+    suggestions.get_suggestions,
+    tags.get_tags,
+    tags.get_tag_by_id,
+    trackables.get_trackables,
+    trackables.get_trackable_by_id,
+    trackables.get_trackable_types,
+    trackables.get_trackable_type_by_id,
+    workspaces.get_my_workspace,
+)
+
+
+@cache
+def _args_schema(function: Callable[..., Awaitable[str]]) -> TypeBaseModel:
+    return create_schema_from_function(function.__name__, function, filter_args=["ctx"])
+
+
+def _tool(function: Callable[..., Awaitable[str]], ctx: ToolContext) -> StructuredTool:
+    async def call(**arguments: object) -> str:
+        try:
+            return await function(ctx, **arguments)
+        except (ToolError, ValueError) as e:
+            raise ToolException(str(e)) from e
+
+    return StructuredTool(
+        name=function.__name__,
+        description=inspect.getdoc(function) or "",
+        args_schema=_args_schema(function),
+        coroutine=call,
+        handle_tool_error=True,
+    )
+
+
+def load_local_tools(
+    user_id: UUID,
+    *,
+    sessions: Callable[[], AbstractAsyncContextManager[AsyncSession]] = AsyncSessionLocal,
+) -> list[BaseTool]:
+    """The in-process tools, acting as `user_id`; each call opens its own session."""
+    ctx = ToolContext(user_id, sessions)
+    return [_tool(function, ctx) for function in TOOLS]
+
+
+async def load_agent_tools(user_id: UUID, access_token: str) -> list[BaseTool]:
+    """The in-app agent's tools for a turn, from wherever `AGENT_TOOLS` says, with
+    the turn's concurrency cap and result memo (`for_turn`)."""
+    if settings.agent_tools == "mcp":
+        tools = await load_mcp_tools(access_token)
+    else:
+        tools = load_local_tools(user_id)
+    return for_turn(tools, concurrency=settings.agent_tool_concurrency)
+
+
+__all__ = [
+    "TOOLS",
+    "ToolContext",
+    "ToolError",
+    "for_turn",
+    "load_agent_tools",
+    "load_local_tools",
+]
@@ -0,0 +1,110 @@
+"""How an in-process tool reaches the API's query logic.
+
+`ToolContext.get(endpoint, **params)` plays the part of `APIClient.get` in the
+MCP server: it calls a route function of this app directly, as the context's
+user, and returns the JSON of its `Msg`'s `data`, which is the tool's result.
+A route answering with a `ModelResponse` has rendered that JSON already, and
+it is sliced out of the body as is, so a tool call serializes its result once
+at most. Arguments are validated against the route's `Query` constraints, and
+missing ones take the route's defaults, so a route sees the same keyword
+arguments a request would give it. That includes their order, so `cached`
+routes share their cache entries with the API.
+"""
+
+import inspect
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Annotated, Any
+from uuid import UUID
+
+from fastapi import HTTPException, Request, Response
+from fastapi.params import Depends
+from pydantic import TypeAdapter
+from pydantic.fields import FieldInfo
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.core.deps import get_storage_service
+from app.core.responses import ModelResponse, msg_data
+from app.schemas import Msg
+
+
+class ToolError(Exception):
+    """A tool call the route turned down; the message goes back to the model."""
+
+
+@dataclass(frozen=True)
+class _Route:
+    dependencies: tuple[str, ...]
+    # Path parameters, then query parameters with their defaults.
+    params: dict[str, Any]
+    adapters: dict[str, TypeAdapter]
+
+
+def _is_dependency(param: inspect.Parameter) -> bool:
+    return any(isinstance(m, Depends) for m in getattr(param.annotation, "__metadata__", ()))
+
+
+@lru_cache
+def _route(endpoint: Callable) -> _Route:
+    dependencies: list[str] = []
+    path: dict[str, Any] = {}
+    query: dict[str, Any] = {}
+    adapters: dict[str, TypeAdapter] = {}
+    for name, param in inspect.signature(endpoint).parameters.items():
+        if param.annotation in (Request, Response):
+            continue  # injected by `cached`
+        if _is_dependency(param):
+            dependencies.append(name)
+            continue
+        annotation = param.annotation
+        if isinstance(param.default, FieldInfo):
+            query[name] = param.default.default
+            if param.default.metadata:
+                annotation = Annotated[annotation, *param.default.metadata]
+        elif param.default is inspect.Parameter.empty:
+            path[name] = None
+        else:
+            query[name] = param.default
+        adapters[name] = TypeAdapter(annotation)
+    return _Route(tuple(dependencies), path | query, adapters)
+
+
+def _data(result: ModelResponse | Msg) -> str:
+    if isinstance(result, ModelResponse):
+        return msg_data(bytes(result.body)).decode()
+    return to_json(result.data, by_alias=True).decode()
+
+
+@dataclass(frozen=True)
+class ToolContext:
+    """The user an agent turn runs its tools for."""
+
+    user_id: UUID
+    sessions: Callable[[], AbstractAsyncContextManager[AsyncSession]] = AsyncSessionLocal
+
+    async def get(self, endpoint: Callable, **params: Any) -> str:
+        """The JSON of `endpoint`'s `data` for this user, as a GET with `params` would
+        return it."""
+        route = _route(endpoint)
+        kwargs: dict[str, Any] = {}
+        async with self.sessions() as db:
+            provided = {
+                "db": db,
+                "user_id": self.user_id,
+                "storage_service": get_storage_service(),
+            }
+            for name in route.dependencies:
+                kwargs[name] = provided[name]
+            for name, default in route.params.items():
+                if name in params:
+                    kwargs[name] = route.adapters[name].validate_python(params[name])
+                else:
+                    kwargs[name] = default
+            try:
+                return _data(await endpoint(**kwargs))
+            except HTTPException as e:
+                raise ToolError(f"{e.status_code}: {e.detail}") from e
@@ -0,0 +1,58 @@
+from typing import Literal
+
+from app.routers import days
+from mcp_server.utils.validators import validate_non_empty_string, validate_non_negative_int
+
+from .context import ToolContext
+
+
+async def get_days(
+    ctx: ToolContext,
+    limit: int = 10,
+    offset: int = 0,
+    sort_field: str | None = None,
+    sort_order: str | None = None,
+    view: Literal["list", "detail"] = "list",
+    tag_names: str | None = None,
+    tag_match: Literal["all", "any"] = "all",
+) -> str:
+    """Get days from Memoryful API with pagination.
+
+    `tag_names` is comma-separated; `tag_match` picks days with all of them or any.
+    """
+    validate_non_negative_int(limit, "limit")
+    validate_non_negative_int(offset, "offset")
+    validate_non_empty_string(sort_field, "sort_field")
+    validate_non_empty_string(sort_order, "sort_order")
+    validate_non_empty_string(tag_names, "tag_names")
+
+    params: dict[str, object] = {"limit": limit, "offset": offset, "view": view}
+    if sort_field is not None:
+        params["sort_field"] = sort_field
+    if sort_order is not None:
+        params["sort_order"] = sort_order
+    if tag_names is not None:
+        params["tag_names"] = tag_names
+        params["tag_match"] = tag_match
+    return await ctx.get(days.get_days, **params)
+
+
+async def get_day_by_timestamp(ctx: ToolContext, timestamp: int) -> str:
+    """Get a specific day by UNIX timestamp"""
+    validate_non_negative_int(timestamp, "timestamp")
+
+    return await ctx.get(days.get_day, timestamp=timestamp)
+
+
+async def get_random_day(
+    ctx: ToolContext, timestampStart: int | None = None, timestampEnd: int | None = None
+) -> str:
+    """Get a random day with optional date range"""
+    if timestampStart is not None:
+        validate_non_negative_int(timestampStart, "timestampStart")
+    if timestampEnd is not None:
+        validate_non_negative_int(timestampEnd, "timestampEnd")
+
+    return await ctx.get(
+        days.get_random_day, timestamp_start=timestampStart, timestamp_end=timestampEnd
+    )
@@ -0,0 +1,19 @@
+from app.routers import insights
+from mcp_server.utils.validators import validate_non_negative_int
+
+from .context import ToolContext
+
+
+async def get_insights(
+    ctx: ToolContext,
+    limit: int = 10,
+    offset: int = 0,
+    timestamp: int | None = None,
+) -> str:
+    """Get insights from Memoryful API with pagination, optionally filtered by day timestamp"""
+    validate_non_negative_int(limit, "limit")
+    validate_non_negative_int(offset, "offset")
+    if timestamp is not None:
+        validate_non_negative_int(timestamp, "timestamp")
+
+    return await ctx.get(insights.get_insights, limit=limit, offset=offset, timestamp=timestamp)
@@ -0,0 +1,19 @@
+from app.routers import months
+from mcp_server.utils.validators import validate_month_number, validate_non_negative_int
+
+from .context import ToolContext
+
+
+async def get_months_by_year(ctx: ToolContext, year: int) -> str:
+    """Get all months for a specific year"""
+    validate_non_negative_int(year, "year")
+
+    return await ctx.get(months.get_months, year=year)
+
+
+async def get_month_by_year_and_month_number(ctx: ToolContext, year: int, month_number: int) -> str:
+    """Get a specific month by ID"""
+    validate_non_negative_int(year, "year")
+    validate_month_number(month_number)
+
+    return await ctx.get(months.get_month, year=year, month_number=month_number)
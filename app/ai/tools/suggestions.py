@@ -0,0 +1,21 @@
+from app.routers import suggestions
+from mcp_server.utils.validators import validate_non_negative_int
+
+from .context import ToolContext
+
+
+async def get_suggestions(
+    ctx: ToolContext,
+    limit: int = 10,
+    offset: int = 0,
+    timestamp: int | None = None,
+) -> str:
+    """Get suggestions from Memoryful API with pagination, optionally filtered by day timestamp"""
+    validate_non_negative_int(limit, "limit")
+    validate_non_negative_int(offset, "offset")
+    if timestamp is not None:
+        validate_non_negative_int(timestamp, "timestamp")
+
+    return await ctx.get(
+        suggestions.get_suggestions, limit=limit, offset=offset, timestamp=timestamp
+    )
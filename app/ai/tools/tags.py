@@ -0,0 +1,16 @@
+from app.routers import tags
+from mcp_server.utils.validators import validate_non_empty_string
+
+from .context import ToolContext
+
+
+async def get_tags(ctx: ToolContext) -> str:
+    """Get tags from Memoryful API"""
+    return await ctx.get(tags.get_tags)
+
+
+async def get_tag_by_id(ctx: ToolContext, tag_id: str) -> str:
+    """Get a specific tag by ID"""
+    validate_non_empty_string(tag_id, "tag_id")
+
+    return await ctx.get(tags.get_tag, id=tag_id)
@@ -0,0 +1,33 @@
+from app.routers import trackable_types, trackables
+from mcp_server.utils.validators import validate_non_empty_string
+
+from .context import ToolContext
+
+
+async def get_trackables(
+    ctx: ToolContext, type_id: str | None = None, search: str | None = None
+) -> str:
+    """Get trackable items from Memoryful API, optionally filtered by type or search query"""
+    validate_non_empty_string(type_id, "type_id")
+    validate_non_empty_string(search, "search")
+
+    return await ctx.get(trackables.get_trackables, type_id=type_id, search=search)
+
+
+async def get_trackable_by_id(ctx: ToolContext, trackable_id: str) -> str:
+    """Get a specific trackable item by ID"""
+    validate_non_empty_string(trackable_id, "trackable_id")
+
+    return await ctx.get(trackables.get_trackable, id=trackable_id)
+
+
+async def get_trackable_types(ctx: ToolContext) -> str:
+    """Get trackable types from Memoryful API"""
+    return await ctx.get(trackable_types.get_trackable_types)
+
+
+async def get_trackable_type_by_id(ctx: ToolContext, type_id: str) -> str:
+    """Get a specific trackable type by ID"""
+    validate_non_empty_string(type_id, "type_id")
+
+    return await ctx.get(trackable_types.get_trackable_type, id=type_id)
@@ -0,0 +1,54 @@
+"""One agent turn's view of its tools.
+
+The agent's tool node runs the tool calls of a model step concurrently.
+`for_turn` wraps a turn's tools so that at most `concurrency` of them run at
+once, and so that each distinct call runs once per turn. A call repeating an
+earlier `(tool, arguments)` pair, in the same step or a later one, gets the
+first call's result, waiting on it if it is still running. A call that raises
+is not remembered, so it can be retried; that includes a tool error (a "not
+found", say). The wrapped tools are copies that only swap the coroutine, so
+their schema, response format and error handling are the tool's own: errors
+and artifacts reach the model as they would unwrapped.
+"""
+
+import asyncio
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+
+def _key(tool: BaseTool, arguments: dict[str, Any]) -> tuple[str, str]:
+    return tool.name, json.dumps(arguments, sort_keys=True, default=str)
+
+
+def for_turn(tools: Sequence[BaseTool], *, concurrency: int) -> list[BaseTool]:
+    """`tools` behind one turn's concurrency cap and result memo."""
+    limit = asyncio.Semaphore(concurrency)
+    calls: dict[tuple[str, str], asyncio.Task] = {}
+
+    def wrap(tool: BaseTool) -> StructuredTool:
+        if not isinstance(tool, StructuredTool) or tool.coroutine is None:
+            raise TypeError(f"Tool {tool.name} is not an async StructuredTool")
+        coroutine = tool.coroutine
+
+        async def run(arguments: dict[str, Any]) -> Any:
+            async with limit:
+                return await coroutine(**arguments)
+
+        async def call(**arguments: Any) -> Any:
+            key = _key(tool, arguments)
+            task = calls.get(key)
+            if task is None:
+                task = calls[key] = asyncio.create_task(run(arguments))
+            try:
+                return await asyncio.shield(task)
+            except Exception:
+                if calls.get(key) is task:
+                    del calls[key]
+                raise
+
+        return tool.model_copy(update={"coroutine": call, "func": None})
+
+    return [wrap(tool) for tool in tools]
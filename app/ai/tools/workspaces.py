@@ -0,0 +1,8 @@
+from app.routers import workspaces
+
+from .context import ToolContext
+
+
+async def get_my_workspace(ctx: ToolContext) -> str:
+    """Get the current user's workspace settings (backgrounds, etc.)"""
+    return await ctx.get(workspaces.get_my_workspace)
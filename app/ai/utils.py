@@ -1,7 +1,9 @@
 import logging
-from collections.abc import AsyncIterator, Iterator
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable, Iterator
 from pathlib import Path
 from typing import Any
+from uuid import UUID
 
 from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
 from langchain_core.language_models import BaseChatModel
@@ -12,6 +14,7 @@ from pydantic import SecretStr
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.ai.vertex_auth import vertex_tokens
 from app.core.settings import get_settings
 from app.enums.provider import Provider
 from app.models import ChatModel
@@ -46,27 +49,6 @@ _ANTHROPIC_NO_SAMPLING = (
     "claude-mythos-5",
 )
 
-# Cached ADC credentials; the access token is valid ~1h and refreshed on demand.
-_gcp_credentials = None
-
-
-def _vertex_access_token() -> str:
-    """Mint/refresh an OAuth access token from Application Default Credentials."""
-    global _gcp_credentials
-    import google.auth
-    from google.auth.transport.requests import Request
-
-    if _gcp_credentials is None:
-        _gcp_credentials, _ = google.auth.default(
-            scopes=["https://www.googleapis.com/auth/cloud-platform"]
-        )
-    if not _gcp_credentials.valid:
-        _gcp_credentials.refresh(Request())
-    token = _gcp_credentials.token
-    if token is None:
-        raise RuntimeError("GCP credentials carry no access token after refresh")
-    return str(token)
-
 
 def _resolve_provider(model: ChatModel) -> Provider:
     """Providers are set explicitly by the catalog sync, so this is a plain lookup."""
@@ -154,14 +136,57 @@ class _VertexMaaSChatOpenAI(ChatOpenAI):
             yield chunk
 
 
+# Built chat models, least recently used first (see build_chat_model).
+_ChatModelKey = tuple[UUID | None, Provider | None, str | None, float]
+_chat_models: OrderedDict[_ChatModelKey, BaseChatModel] = OrderedDict()
+
+
 def build_chat_model(model: ChatModel) -> BaseChatModel:
-    """Build a LangChain chat model for a specific DB `ChatModel` record.
+    """The LangChain chat model for a specific DB `ChatModel` record.
 
     The gateway is chosen by `LLM_MODE`; the model id and provider come from the
     selected catalog record, so the in-app model selector actually switches models.
+
+    Clients are built once and reused, keyed by `(model.id, provider, region,
+    temperature)`, with the `LLM_CLIENT_CACHE_SIZE` most recently used kept. Each
+    client carries its provider SDK client and its connection pool (the Gemini
+    one also loads its own credentials), so reusing them keeps connections to the
+    provider open across turns. `sync_chat_models` drops the clients of rows it
+    changes (`invalidate_chat_models`).
     """
     temperature = settings.default_temperature
+    key: _ChatModelKey
+    if settings.llm_mode == "local":
+        key = (None, None, None, temperature)
+    else:
+        key = (
+            model.id,
+            _resolve_provider(model),
+            model.region or settings.vertex_location,
+            temperature,
+        )
+
+    llm = _chat_models.get(key)
+    if llm is not None:
+        _chat_models.move_to_end(key)
+        return llm
+    llm = _chat_models[key] = _new_chat_model(model, temperature)
+    while len(_chat_models) > settings.llm_client_cache_size:
+        _chat_models.popitem(last=False)
+    return llm
+
+
+def invalidate_chat_models(model_ids: Iterable[UUID] | None = None) -> None:
+    """Forget the built clients of `model_ids`, or all of them."""
+    if model_ids is None:
+        _chat_models.clear()
+        return
+    stale = set(model_ids)
+    for key in [key for key in _chat_models if key[0] in stale]:
+        del _chat_models[key]
+
 
+def _new_chat_model(model: ChatModel, temperature: float) -> BaseChatModel:
     # Dev: everything is served by local Ollama regardless of the catalog pick.
     if settings.llm_mode == "local":
         return ChatOpenAI(
@@ -226,11 +251,15 @@ def build_chat_model(model: ChatModel) -> BaseChatModel:
         if not settings.gcp_project_id:
             raise RuntimeError("GCP_PROJECT_ID is required to use Vertex Model Garden models")
         # _VertexMaaSChatOpenAI (not plain ChatOpenAI): pads empty tool-call messages.
+        # The key is an async callable the OpenAI SDK awaits before each request,
+        # so a reused client sends the current token rather than the one it was
+        # built with. Being async, it serves the async calls only, the only kind
+        # the app makes.
         return _VertexMaaSChatOpenAI(
             model=model.name,
             temperature=temperature,
             base_url=_vertex_openapi_base_url(location),
-            api_key=SecretStr(_vertex_access_token()),
+            api_key=vertex_tokens.token,
         )
 
     if provider is Provider.openai:
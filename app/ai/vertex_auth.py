@@ -0,0 +1,119 @@
+"""OAuth access tokens for Vertex AI, kept fresh off the event loop.
+
+Application Default Credentials refresh over a blocking HTTPS call, and their
+first load reads files and may query the metadata server. `VertexTokenManager`
+does both in a worker thread. `token()` answers from the token it holds while
+that has more than `VERTEX_TOKEN_REFRESH_SECONDS` to live. Inside that window
+it still answers at once, and starts a refresh in the background. Every refresh
+also schedules the next one for that point, so a token in use rarely expires.
+Callers only wait when there is no usable token, and then all of them wait on
+the same refresh. After a refresh fails, the token held is handed out without
+another background attempt for `REFRESH_BACKOFF_SECONDS`.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any, Protocol
+
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+# A token this close to its expiry is treated as expired; it could lapse in flight.
+EXPIRY_SKEW_SECONDS = 30
+# Wait between background refreshes after one fails, so every call doesn't retry.
+REFRESH_BACKOFF_SECONDS = 10
+
+
+class Credentials(Protocol):
+    """The part of `google.auth.credentials.Credentials` used here."""
+
+    token: str | None
+    expiry: datetime | None  # naive UTC, as google-auth keeps it
+
+    def refresh(self, request: Any) -> None: ...
+
+
+def _default_credentials() -> Credentials:
+    import google.auth
+
+    credentials, _ = google.auth.default(scopes=SCOPES)
+    return credentials
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Vertex token refresh failed", exc_info=task.exception())
+
+
+class VertexTokenManager:
+    """An access token for Vertex AI from credentials loaded by `load`."""
+
+    def __init__(self, load: Callable[[], Credentials] = _default_credentials) -> None:
+        self._load = load
+        self._credentials: Credentials | None = None
+        self._token: str | None = None
+        self._expires = 0.0  # time.monotonic() at which the token expires
+        self._refreshing: asyncio.Task[str] | None = None
+        self._next_refresh: asyncio.TimerHandle | None = None
+        self._failed_at = -math.inf  # time.monotonic() of the last failed refresh
+
+    async def token(self) -> str:
+        """A valid access token, refreshed first only if there is none."""
+        left = self._expires - time.monotonic()
+        if self._token is not None and left > EXPIRY_SKEW_SECONDS:
+            backing_off = time.monotonic() - self._failed_at < REFRESH_BACKOFF_SECONDS
+            if left <= settings.vertex_token_refresh_seconds and not backing_off:
+                self._refresh()
+            return self._token
+        # Shielded: a caller that gives up doesn't cancel the others' refresh.
+        return await asyncio.shield(self._refresh())
+
+    def _refresh(self) -> asyncio.Task[str]:
+        """The refresh in flight on this loop, or a new one."""
+        task = self._refreshing
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._refreshing = asyncio.create_task(self._fetch())
+            task.add_done_callback(_log_failure)
+        return task
+
+    async def _fetch(self) -> str:
+        try:
+            token, expiry = await asyncio.to_thread(self._fetch_blocking)
+        except Exception:
+            self._failed_at = time.monotonic()
+            raise
+        left = math.inf
+        if expiry is not None:
+            left = (expiry - datetime.now(UTC).replace(tzinfo=None)).total_seconds()
+        self._token, self._expires = token, time.monotonic() + left
+
+        if self._next_refresh is not None:
+            self._next_refresh.cancel()
+        # Tokens too short-lived for the window are refreshed when next asked for.
+        ahead = left - settings.vertex_token_refresh_seconds
+        if 0 < ahead < math.inf:
+            self._next_refresh = asyncio.get_running_loop().call_later(ahead, self._refresh)
+        return token
+
+    def _fetch_blocking(self) -> tuple[str, datetime | None]:
+        from google.auth.transport.requests import Request
+
+        if self._credentials is None:
+            self._credentials = self._load()
+        self._credentials.refresh(Request())
+        token = self._credentials.token
+        if token is None:
+            raise RuntimeError("GCP credentials carry no access token after refresh")
+        return str(token), self._credentials.expiry
+
+
+# The process's Vertex token, shared by every client that needs one.
+vertex_tokens = VertexTokenManager()
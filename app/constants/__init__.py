@@ -9,6 +9,8 @@ from .cache import (
     EXCLUDED_CACHE_KWARGS,
     GLOBAL_SCOPE,
 )
+from .chats import CHAT_MESSAGE_WINDOW
+from .days import DAYS_BULK_MAX_ITEMS
 from .google import GOOGLE_ISSUERS
 from .media import VIDEO_EXTENSIONS
 
@@ -20,6 +22,8 @@ __all__ = [
     "CACHE_TTL_DAYS",
     "CACHE_TTL_STATIC",
     "CACHE_TTL_USER_DATA",
+    "CHAT_MESSAGE_WINDOW",
+    "DAYS_BULK_MAX_ITEMS",
     "EXCLUDED_CACHE_KWARGS",
     "GLOBAL_SCOPE",
     "GOOGLE_ISSUERS",
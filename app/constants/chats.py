@@ -0,0 +1,2 @@
+# Messages a chat is served with: the latest ones, oldest first.
+CHAT_MESSAGE_WINDOW = 100
@@ -0,0 +1,2 @@
+# Upper bound for one POST /days/bulk request; larger imports are split client-side.
+DAYS_BULK_MAX_ITEMS = 10_000
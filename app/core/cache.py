@@ -7,6 +7,7 @@ from fastapi_cache.decorator import cache
 
 from app.constants import CACHE_PREFIX, EXCLUDED_CACHE_KWARGS, GLOBAL_SCOPE
 from app.core.config import redis
+from app.core.responses import ModelResponseCoder
 from app.core.settings import get_settings
 from app.enums import CacheNamespace
 
@@ -38,12 +39,18 @@ def cached(*, expire: int, namespace: CacheNamespace) -> Callable:
     Thin wrapper around `fastapi_cache.decorator.cache` that always uses
     `cache_key_builder` and can be globally disabled via the `CACHE_ENABLED`
     setting (env var `CACHE_ENABLED=false`) to A/B compare with/without caching.
+    Endpoints returning a `ModelResponse` are cached as their rendered bytes.
     """
 
     def decorator(func: Callable) -> Callable:
         if not settings.cache_enabled:
             return func
-        return cache(expire=expire, namespace=namespace, key_builder=cache_key_builder)(func)
+        return cache(
+            expire=expire,
+            namespace=namespace,
+            key_builder=cache_key_builder,
+            coder=ModelResponseCoder,
+        )(func)
 
     return decorator
 
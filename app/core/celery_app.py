@@ -36,5 +36,16 @@ celery.conf.beat_schedule = {
         "task": "app.tasks.ai_tasks.generate_yesterday_ai_fallback",
         "schedule": crontab(hour=2, minute=0),
         "options": {"queue": "ai_queue"},
-    }
+    },
+    "ensure_next_year_partitions": {
+        "task": "app.tasks.system_tasks.ensure_next_year_partitions_task",
+        # Monthly, so a missed run still leaves weeks before the year turns.
+        "schedule": crontab(day_of_month=1, hour=3, minute=0),
+        "options": {"queue": "system_queue"},
+    },
+    "archive_deleted_chats": {
+        "task": "app.tasks.system_tasks.archive_deleted_chats_task",
+        "schedule": crontab(hour=4, minute=0),
+        "options": {"queue": "system_queue"},
+    },
 }
@@ -0,0 +1,158 @@
+"""`DayDetail` rendered by Postgres.
+
+`day_detail_json()` is a column expression, correlated to `days`, that builds a
+day's detail as camelCase JSON text with `json_build_object`/`json_agg`: city and
+country, tags, progress grouped by trackable type, insights and suggestions, all
+as subqueries of the one statement. Selecting it instead of `Day` makes a detail
+read one round trip with no ORM or pydantic objects in between.
+
+Object keys come from the pydantic schemas' aliases, in field order, so a field
+added to a schema and to its table appears here without a change. Values are
+Postgres' own JSON (timestamps with an explicit offset rather than `Z`, for one),
+which parses back to equal models; `test_days` checks that against the ORM path.
+Used by the day routes when `DAYS_SQL_RENDERING` is on.
+"""
+
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, Text, cast, func, literal_column, select
+from sqlalchemy.sql.base import ReadOnlyColumnCollection
+
+from app.models import (
+    City,
+    Country,
+    Day,
+    Insight,
+    Suggestion,
+    Tag,
+    TrackableItem,
+    TrackableProgress,
+    TrackableType,
+)
+from app.models.day import days_tags
+from app.schemas import (
+    CityDetail,
+    CountryInDB,
+    DayDetail,
+    DayTrackableProgress,
+    InsightInDB,
+    SuggestionInDB,
+    TagInDB,
+    TrackableDetail,
+    TrackableTypeInDB,
+)
+
+_EMPTY_ARRAY: ColumnElement[Any] = literal_column("'[]'::json")
+
+
+def _key(name: str) -> ColumnElement[str]:
+    # Inlined: json_build_object's arguments are untyped, so a bound key would
+    # leave Postgres unable to infer its parameter type.
+    return literal_column("'" + name.replace("'", "''") + "'")
+
+
+def _object(
+    schema: type[BaseModel],
+    columns: ReadOnlyColumnCollection[str, Any],
+    **values: ColumnElement,
+) -> ColumnElement:
+    """`json_build_object` of the schema's fields: from `values` if given, else `columns`."""
+    args: list[ColumnElement] = []
+    for name, field in schema.model_fields.items():
+        args += [_key(field.alias or name), values[name] if name in values else columns[name]]
+    return func.json_build_object(*args)
+
+
+def _array(element: ColumnElement, *where: ColumnElement, select_from: Any) -> ColumnElement:
+    return (
+        select(func.coalesce(func.json_agg(element), _EMPTY_ARRAY))
+        .select_from(select_from)
+        .where(*where)
+        .scalar_subquery()
+    )
+
+
+def day_detail_json() -> ColumnElement[str]:
+    """The current `days` row as `DayDetail` JSON text."""
+    of_day = (
+        TrackableProgress.timestamp == Day.timestamp,
+        TrackableProgress.user_id == Day.user_id,
+    )
+
+    city = (
+        select(
+            _object(
+                CityDetail,
+                City.__table__.c,
+                country=_object(CountryInDB, Country.__table__.c),
+            )
+        )
+        .select_from(City)
+        .join(Country, Country.id == City.country_id)
+        .where(City.id == Day.city_id)
+        .scalar_subquery()
+    )
+
+    tags = _array(
+        _object(TagInDB, Tag.__table__.c),
+        days_tags.c.day_timestamp == Day.timestamp,
+        days_tags.c.user_id == Day.user_id,
+        select_from=days_tags.join(Tag.__table__, Tag.id == days_tags.c.tag_id),
+    )
+
+    # One entry per trackable type the day has progress for, each with its progress.
+    progresses = _array(
+        _object(
+            DayTrackableProgress,
+            TrackableProgress.__table__.c,
+            trackable_item=_object(TrackableDetail, TrackableItem.__table__.c),
+        ),
+        *of_day,
+        TrackableItem.type_id == TrackableType.id,
+        select_from=TrackableProgress.__table__.join(
+            TrackableItem.__table__, TrackableItem.id == TrackableProgress.trackable_item_id
+        ),
+    )
+    types_used = (
+        select(TrackableItem.type_id)
+        .select_from(TrackableProgress)
+        .join(TrackableItem, TrackableItem.id == TrackableProgress.trackable_item_id)
+        .where(*of_day)
+    )
+    trackable_progresses = _array(
+        func.json_build_object(
+            _key("type"),
+            _object(TrackableTypeInDB, TrackableType.__table__.c),
+            _key("progresses"),
+            progresses,
+        ),
+        TrackableType.id.in_(types_used),
+        select_from=TrackableType,
+    )
+
+    insights = _array(
+        _object(InsightInDB, Insight.__table__.c),
+        Insight.timestamp == Day.timestamp,
+        Insight.user_id == Day.user_id,
+        select_from=Insight,
+    )
+    suggestions = _array(
+        _object(SuggestionInDB, Suggestion.__table__.c),
+        Suggestion.timestamp == Day.timestamp,
+        Suggestion.user_id == Day.user_id,
+        select_from=Suggestion,
+    )
+
+    return cast(
+        _object(
+            DayDetail,
+            Day.__table__.c,
+            city=city,
+            tags=tags,
+            trackable_progresses=trackable_progresses,
+            insights=insights,
+            suggestions=suggestions,
+        ),
+        Text,
+    )
@@ -0,0 +1,65 @@
+"""Yearly range partitions of the per-day tables.
+
+`days`, `trackable_progress`, `insights` and `suggestions` are partitioned by
+`timestamp`, one partition per year, all four created together by the
+`ensure_year_partitions(year)` SQL function. A day's year is the year of its
+timestamp's noon in UTC, as for its month (app.core.rollups), so a partition
+starts 12 hours before 1 January UTC. A row whose year has no partition cannot
+be inserted, so day writers call `ensure_partitions` with the timestamps they
+are about to write before they write them. Years already seen by this process
+are remembered, which keeps the common case free of round trips.
+
+Day timestamps are checked first (`check_day_timestamp`): they must fit the
+32-bit column and fall in a year from `MIN_YEAR` to next year, so a request
+can't have partitions created for any year it names.
+
+Partition DDL runs on its own autocommit connection: it must not join (and hold
+locks for the rest of) the caller's transaction. The function gives up after a
+short lock timeout rather than queue every reader of `days` behind a long-running
+transaction.
+"""
+
+import datetime as dt
+from collections.abc import Iterable
+
+from sqlalchemy import func, select
+
+from app.core.database import engine
+
+# Day timestamps are the client's local midnight; noon in UTC keeps every offset
+# within ±12h on the same calendar date.
+NOON_OFFSET = 12 * 60 * 60
+MIN_YEAR = 1970
+# `timestamp` is a 32-bit integer column.
+TIMESTAMP_MIN, TIMESTAMP_MAX = -(2**31), 2**31 - 1
+
+_ensured_years: set[int] = set()
+
+
+def partition_year(timestamp: int) -> int:
+    return dt.datetime.fromtimestamp(timestamp + NOON_OFFSET, dt.UTC).year
+
+
+def check_day_timestamp(timestamp: int) -> None:
+    """Raise `ValueError` for a timestamp no day may have."""
+    if not TIMESTAMP_MIN <= timestamp <= TIMESTAMP_MAX:
+        raise ValueError("Timestamp is out of range")
+    last_year = dt.datetime.now(dt.UTC).year + 1
+    if not MIN_YEAR <= partition_year(timestamp) <= last_year:
+        raise ValueError(f"Days must fall between {MIN_YEAR} and {last_year}")
+
+
+async def ensure_partitions(timestamps: Iterable[int]) -> None:
+    await ensure_year_partitions(partition_year(ts) for ts in timestamps)
+
+
+async def ensure_year_partitions(years: Iterable[int]) -> None:
+    missing = set(years) - _ensured_years
+    if not missing:
+        return
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for year in sorted(missing):
+            await conn.execute(select(func.ensure_year_partitions(year)))
+    _ensured_years.update(missing)
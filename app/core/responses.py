@@ -0,0 +1,65 @@
+"""Single-pass JSON responses for hot read endpoints.
+
+Returning a `Msg` lets FastAPI dump it to a dict, validate that dict against the
+route's `response_model`, convert the result to JSON-safe Python and only then
+`json.dumps` it — several passes over a payload the endpoint has just validated.
+`ModelResponse` writes the model straight to JSON bytes with pydantic-core
+instead; FastAPI returns a `Response` untouched, so nothing runs twice. Keep
+`response_model=` on the route: it still documents the endpoint.
+
+`rendered_msg` wraps JSON that is already rendered (by Postgres, say) in the
+`Msg` envelope without parsing it, and `msg_data` takes it back out.
+
+Cached endpoints returning a `ModelResponse` store its body as-is
+(`ModelResponseCoder`, used by `app.core.cache.cached`), so a cache hit is the
+stored bytes sent back, with no decode or validation at all.
+"""
+
+from typing import Any
+
+from fastapi import Response
+from fastapi_cache.coder import JsonCoder
+from pydantic_core import to_json
+
+
+class ModelResponse(Response):
+    """`content` is a pydantic model (or anything pydantic-core can serialize), or
+    bytes that already hold its JSON."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content, by_alias=True)
+
+
+def rendered_msg(data: str, *, msg: str, code: int = 200) -> bytes:
+    """The JSON of `Msg(code=code, msg=msg, data=...)` with `data` spliced in as-is."""
+    return b'{"code":%d,"msg":%b,"data":%b}' % (code, to_json(msg), data.encode())
+
+
+def msg_data(body: bytes) -> bytes:
+    """The JSON of a rendered `Msg`'s `data`, sliced out without parsing.
+
+    `data` is the envelope's last field, and `,"data":` can't occur earlier: `code`
+    is a number, and a quote inside the `msg` string is escaped.
+    """
+    return body[body.index(b',"data":') + len(b',"data":') : -1]
+
+
+class ModelResponseCoder(JsonCoder):
+    """`JsonCoder` that keeps a `ModelResponse`'s rendered body as the cache entry."""
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        if isinstance(value, ModelResponse):
+            return bytes(value.body)
+        return super().encode(value)
+
+    @classmethod
+    def decode_as_type(cls, value: bytes, *, type_: Any) -> Any:
+        # `type_` is the endpoint's return annotation.
+        if isinstance(type_, type) and issubclass(type_, ModelResponse):
+            return ModelResponse(value)
+        return super().decode_as_type(value, type_=type_)
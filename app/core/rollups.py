@@ -0,0 +1,306 @@
+"""Incremental maintenance of `month_stats`.
+
+Writers describe a day before and after their change as a `DayFootprint`; the
+difference is folded into the month's row with one additive upsert, in the
+caller's transaction. `rebuild_month_stats` recomputes rows from scratch for
+drift repair and for data written before the table existed.
+
+A day belongs to the month of its timestamp's noon in UTC. Day timestamps are
+the client's local midnight, and noon keeps that on the same calendar date for
+every offset within ±12h.
+
+Progress totals are float sums, and adding a value and later taking it away
+can leave a residue such as 1e-17 rather than 0. A total within `SUM_EPSILON`
+of zero counts as zero and its key is dropped, here and in `jsonb_sum_merge`.
+"""
+
+import datetime as dt
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import (
+    Integer,
+    String,
+    Text,
+    cast,
+    delete,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, Insert, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import ColumnElement, Subquery
+
+from app.core.partitions import NOON_OFFSET
+from app.models import Day, MonthStats, TrackableProgress
+
+# Same bound as `jsonb_sum_merge` (migration 7a4d2f9c6e15).
+SUM_EPSILON = 1e-9
+
+
+class DayFootprint(NamedTuple):
+    """What a day contributes to its month's stats."""
+
+    timestamp: int
+    steps: int | None = None
+    starred: bool = False
+    tag_ids: Iterable[UUID] = ()
+    progress: Iterable[tuple[UUID, float]] = ()  #: (trackable_item_id, value)
+
+
+def month_of(timestamp: int) -> tuple[int, int]:
+    noon = dt.datetime.fromtimestamp(timestamp + NOON_OFFSET, dt.UTC)
+    return noon.year, noon.month
+
+
+def _sql_month_part(part: str, timestamp: InstrumentedAttribute[int]) -> ColumnElement[int]:
+    # Same anchor as `month_of`; `timezone('UTC', ...)` keeps the session zone out of it.
+    # Inlined rather than bound: the expression is repeated in GROUP BY, and Postgres
+    # only matches it there if both copies are textually the same.
+    noon = func.timezone(
+        literal_column("'UTC'"), func.to_timestamp(timestamp + literal_column(str(NOON_OFFSET)))
+    )
+    return cast(func.extract(part, noon), Integer)
+
+
+class _MonthDelta:
+    def __init__(self) -> None:
+        self.day_count = 0
+        self.steps_total = 0
+        self.steps_day_count = 0
+        self.starred_count = 0
+        self.progress_totals: dict[str, float] = defaultdict(float)
+        self.tag_counts: dict[str, int] = defaultdict(int)
+
+    def add(self, day: DayFootprint, sign: int) -> None:
+        self.day_count += sign
+        if day.steps is not None:
+            self.steps_total += sign * day.steps
+            self.steps_day_count += sign
+        if day.starred:
+            self.starred_count += sign
+        for item_id, value in day.progress:
+            self.progress_totals[str(item_id)] += sign * value
+        for tag_id in set(day.tag_ids):
+            self.tag_counts[str(tag_id)] += sign
+
+    def values(self) -> dict[str, object]:
+        return {
+            "day_count": self.day_count,
+            "steps_total": self.steps_total,
+            "steps_day_count": self.steps_day_count,
+            "starred_count": self.starred_count,
+            "progress_totals": {
+                k: v for k, v in self.progress_totals.items() if abs(v) >= SUM_EPSILON
+            },
+            "tag_counts": {k: v for k, v in self.tag_counts.items() if v},
+        }
+
+    def is_empty(self) -> bool:
+        values = self.values()
+        return not any(values.values())
+
+
+def day_change_upserts(
+    user_id: UUID,
+    changes: Iterable[tuple[DayFootprint | None, DayFootprint | None]],
+    when: ColumnElement[bool] | None = None,
+) -> list[Insert]:
+    """One upsert per month touched by the (before, after) pairs; None means absent.
+
+    With `when`, each upsert only writes if it holds, which lets a caller embed them
+    in a statement whose other parts may not go through.
+    """
+    deltas: dict[tuple[int, int], _MonthDelta] = defaultdict(_MonthDelta)
+    for before, after in changes:
+        if before is not None:
+            deltas[month_of(before.timestamp)].add(before, -1)
+        if after is not None:
+            deltas[month_of(after.timestamp)].add(after, 1)
+
+    upserts = []
+    for (year, month), delta in deltas.items():
+        if delta.is_empty():
+            continue
+        values = {"user_id": user_id, "year": year, "month": month, **delta.values()}
+        if when is None:
+            stmt = insert(MonthStats).values(values)
+        else:
+            stmt = insert(MonthStats).from_select(
+                list(values),
+                select(
+                    *(
+                        literal(value, MonthStats.__table__.c[name].type)
+                        for name, value in values.items()
+                    )
+                ).where(when),
+            )
+        upserts.append(
+            stmt.on_conflict_do_update(
+                index_elements=[MonthStats.user_id, MonthStats.year, MonthStats.month],
+                set_={
+                    "day_count": MonthStats.day_count + stmt.excluded.day_count,
+                    "steps_total": MonthStats.steps_total + stmt.excluded.steps_total,
+                    "steps_day_count": MonthStats.steps_day_count + stmt.excluded.steps_day_count,
+                    "starred_count": MonthStats.starred_count + stmt.excluded.starred_count,
+                    "progress_totals": func.jsonb_sum_merge(
+                        MonthStats.progress_totals, stmt.excluded.progress_totals
+                    ),
+                    "tag_counts": func.jsonb_sum_merge(
+                        MonthStats.tag_counts, stmt.excluded.tag_counts
+                    ),
+                },
+            )
+        )
+    return upserts
+
+
+async def apply_day_changes(
+    db: AsyncSession,
+    user_id: UUID,
+    changes: Iterable[tuple[DayFootprint | None, DayFootprint | None]],
+) -> None:
+    """Fold (before, after) pairs into `month_stats`; None means absent."""
+    for stmt in day_change_upserts(user_id, changes):
+        await db.execute(stmt)
+
+
+async def apply_day_change(
+    db: AsyncSession,
+    user_id: UUID,
+    before: DayFootprint | None,
+    after: DayFootprint | None,
+) -> None:
+    await apply_day_changes(db, user_id, [(before, after)])
+
+
+async def _forget_key(
+    db: AsyncSession, user_id: UUID, column: InstrumentedAttribute[dict], key: UUID
+) -> None:
+    await db.execute(
+        update(MonthStats)
+        .where(MonthStats.user_id == user_id, column.has_key(str(key)))
+        .values({column: column.op("-")(literal(str(key), Text))})
+    )  # fmt: skip
+
+
+async def forget_tag(db: AsyncSession, user_id: UUID, tag_id: UUID) -> None:
+    await _forget_key(db, user_id, MonthStats.tag_counts, tag_id)
+
+
+async def forget_trackable_item(db: AsyncSession, user_id: UUID, item_id: UUID) -> None:
+    await _forget_key(db, user_id, MonthStats.progress_totals, item_id)
+
+
+async def rebuild_month_stats(db: AsyncSession, user_id: UUID | None = None) -> None:
+    """Recompute `month_stats` from `days` and `trackable_progress`.
+
+    Scoped to one user when given, otherwise every user. Runs in the caller's
+    transaction; commit afterwards.
+    """
+    day_year = _sql_month_part("year", Day.timestamp)
+    day_month = _sql_month_part("month", Day.timestamp)
+    progress_year = _sql_month_part("year", TrackableProgress.timestamp)
+    progress_month = _sql_month_part("month", TrackableProgress.timestamp)
+
+    scope_days = [Day.user_id == user_id] if user_id else []
+    scope_progress = [TrackableProgress.user_id == user_id] if user_id else []
+    scope_stats = [MonthStats.user_id == user_id] if user_id else []
+
+    await db.execute(delete(MonthStats).where(*scope_stats))
+
+    await db.execute(
+        insert(MonthStats).from_select(
+            [
+                "user_id",
+                "year",
+                "month",
+                "day_count",
+                "steps_total",
+                "steps_day_count",
+                "starred_count",
+                "progress_totals",
+                "tag_counts",
+            ],
+            select(
+                Day.user_id,
+                day_year,
+                day_month,
+                func.count(),
+                func.coalesce(func.sum(Day.steps), 0),
+                func.count(Day.steps),
+                func.count().filter(Day.starred),
+                cast(literal("{}"), JSONB),
+                cast(literal("{}"), JSONB),
+            )
+            .where(*scope_days)
+            .group_by(Day.user_id, day_year, day_month),
+        )
+    )
+
+    progress_sums = (
+        select(
+            TrackableProgress.user_id,
+            progress_year.label("year"),
+            progress_month.label("month"),
+            cast(TrackableProgress.trackable_item_id, String).label("key"),
+            func.sum(TrackableProgress.value).label("total"),
+        )
+        .where(*scope_progress)
+        .group_by(
+            TrackableProgress.user_id,
+            progress_year,
+            progress_month,
+            TrackableProgress.trackable_item_id,
+        )
+        .having(func.abs(func.sum(TrackableProgress.value)) >= SUM_EPSILON)
+        .subquery()
+    )  # fmt: skip
+    await _fill_map(db, MonthStats.progress_totals, progress_sums)
+
+    tag_id = func.unnest(Day.tag_ids).table_valued("tag_id").render_derived()
+    tag_sums = (
+        select(
+            Day.user_id,
+            day_year.label("year"),
+            day_month.label("month"),
+            cast(tag_id.c.tag_id, String).label("key"),
+            func.count().label("total"),
+        )
+        .select_from(Day)
+        .join(tag_id, true())
+        .where(*scope_days)
+        .group_by(Day.user_id, day_year, day_month, tag_id.c.tag_id)
+        .subquery()
+    )  # fmt: skip
+    await _fill_map(db, MonthStats.tag_counts, tag_sums)
+
+
+async def _fill_map(db: AsyncSession, column: InstrumentedAttribute[dict], sums: Subquery) -> None:
+    """Set `column` from (user_id, year, month, key, total) rows, one map per month."""
+    maps = (
+        select(
+            sums.c.user_id,
+            sums.c.year,
+            sums.c.month,
+            func.jsonb_object_agg(sums.c.key, sums.c.total).label("map"),
+        )
+        .group_by(sums.c.user_id, sums.c.year, sums.c.month)
+        .subquery()
+    )
+    await db.execute(
+        update(MonthStats)
+        .where(
+            MonthStats.user_id == maps.c.user_id,
+            MonthStats.year == maps.c.year,
+            MonthStats.month == maps.c.month,
+        )
+        .values({column: maps.c.map})
+    )
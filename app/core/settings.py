@@ -139,6 +139,19 @@ class Settings(BaseSettings):
     # Cache
     cache_enabled: bool = True
 
+    # Render day details as JSON in Postgres (app.core.day_json) instead of loading
+    # ORM rows and validating them.
+    days_sql_rendering: bool = False
+
+    # Chats: soft-deleted chats move to `chat_archives` once they have been deleted
+    # this long, at most this many per transaction.
+    chat_archive_after_days: int = 30
+    chat_archive_batch_size: int = 200
+
+    # History sent with each chat turn, in tokens of the chat's model. Older
+    # messages reach the model through the chat's rolling summary (app.ai.memory).
+    chat_context_tokens: int = 12_000
+
     # LLM
     #
     # llm_mode decides the *gateway*, not the model. The model itself is chosen
@@ -152,13 +165,32 @@ class Settings(BaseSettings):
     # Vertex AI region. "global" routes across regions and is the widest-availability
     # option — partner models (Claude, Grok) are often only offered there.
     vertex_location: str = "global"
-
-    # MCP server (streamable-HTTP) the in-app agent loads its tools from. FastMCP's
-    # canonical path is /mcp with NO trailing slash — /mcp/ 307-redirects to it,
-    # doubling every round-trip.
+    # How long before its expiry the Vertex access token is refreshed, in the
+    # background (app/ai/vertex_auth.py). Tokens live about an hour.
+    vertex_token_refresh_seconds: int = 300
+
+    # Where the in-app agent's tools run: "mcp" goes through the MCP server below, as
+    # external clients do; "local" calls the routes in this process (app.ai.tools).
+    agent_tools: Literal["local", "mcp"] = "mcp"
+    # Tool calls of one agent turn that may run at once (app.ai.tools.turn).
+    agent_tool_concurrency: int = 4
+
+    # MCP server (streamable-HTTP) the in-app agent loads its tools from when
+    # agent_tools is "mcp". FastMCP's canonical path is /mcp with NO trailing slash
+    # — /mcp/ 307-redirects to it, doubling every round-trip.
     mcp_server_url: str = "http://mcp:3001/mcp"
+    # How long the MCP tool listing is reused before it is fetched again (app.ai.mcp).
+    mcp_tools_ttl_seconds: int = 300
+    # Open MCP sessions kept by the agent, one per user (app.ai.mcp_pool). Idle ones
+    # are pinged before reuse and closed once idle for mcp_pool_idle_seconds.
+    mcp_pool_size: int = 32
+    mcp_pool_ping_seconds: int = 60
+    mcp_pool_idle_seconds: int = 600
 
     default_temperature: float = Field(0.4, validation_alias="LLM_TEMPERATURE")
+    # Built chat model clients kept for reuse, most recently used first
+    # (app/ai/utils.build_chat_model).
+    llm_client_cache_size: int = 16
 
     # Local dev (Ollama, OpenAI-compatible endpoint).
     local_llm_base_url: str = "http://ollama:11434/v1"
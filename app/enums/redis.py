@@ -7,5 +7,9 @@ class RedisPrefix(StrEnum):
     login_code = "login_code:"
     blacklisted_token = "blacklist:"  # noqa: S105  # a key prefix, not a credential
     ai_context = "ai_context:"
-    chat = "chat:"
+    # A hot chat: a hash (`user_id`, `detail`, `count`) plus a list of its latest
+    # messages' JSON. Not `chat:`, which held the whole detail as one string.
+    chat_header = "chat_header:"
+    chat_messages = "chat_messages:"
     chat_list = "chat_list:"
+    chat_summary = "chat_summary:"  # held while a chat's summary is being updated
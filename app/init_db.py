@@ -5,6 +5,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.partitions import ensure_year_partitions
+from app.core.rollups import rebuild_month_stats
 from app.core.settings import get_settings
 from app.enums.font_awesome import IconStyle
 from app.models import (
@@ -213,7 +215,8 @@ async def init_db(db: AsyncSession) -> None:
         )
         await db.commit()
 
-    # days
+    # days: the seeded ones span the last two months, the demo day is in 2024
+    await ensure_year_partitions(range(2024, dt.date.today().year + 1))
     if not (await db.scalar(select(Day.timestamp).limit(1))):
         user_id = (await db.scalars(select(User.id).limit(1))).one()
         cities = (await db.scalars(select(City))).all()
@@ -441,3 +444,9 @@ As the sun began to set, I stopped for a few minutes just to take in the view 
 
     except Exception as e:
         print(f"Error initializing demo data: {e}")
+        await db.rollback()
+
+    # month stats: the days above were written through the ORM, not the day routes
+    # that keep `month_stats` current, so build them from scratch.
+    await rebuild_month_stats(db)
+    await db.commit()
@@ -24,6 +24,7 @@ ai_logger = logging.getLogger("app.ai")
 ai_logger.setLevel(logging.DEBUG)
 
 from app.ai.catalog import sync_chat_models
+from app.ai.mcp_pool import close_mcp_pool
 from app.constants import CACHE_PREFIX
 from app.core.config import cache_redis
 from app.core.database import AsyncSessionLocal
@@ -38,6 +39,7 @@ from app.routers import (
     countries,
     days,
     email,
+    export,
     insights,
     months,
     storage,
@@ -90,6 +92,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             if not has_any_user:
                 await init_db(session)
     yield
+    await close_mcp_pool()
 
 
 app = FastAPI(
@@ -130,6 +133,7 @@ app.include_router(cities.router)
 app.include_router(countries.router)
 app.include_router(days.router)
 app.include_router(email.router)
+app.include_router(export.router)
 app.include_router(insights.router)
 app.include_router(months.router)
 app.include_router(storage.router)
@@ -1,4 +1,6 @@
 from .chat import Chat
+from .chat_archive import ChatArchive
+from .chat_message import ChatMessage
 from .chat_model import ChatModel
 from .city import City
 from .country import Country
@@ -6,6 +8,7 @@ from .day import Day
 from .insight import Insight
 from .insight_type import InsightType
 from .month import Month
+from .month_stats import MonthStats
 from .search_history import SearchHistory
 from .suggestion import Suggestion
 from .tag import Tag
@@ -18,6 +21,8 @@ from .workspace import WorkspaceBackground
 
 __all__ = [
     "Chat",
+    "ChatArchive",
+    "ChatMessage",
     "ChatModel",
     "City",
     "Country",
@@ -25,6 +30,7 @@ __all__ = [
     "Insight",
     "InsightType",
     "Month",
+    "MonthStats",
     "SearchHistory",
     "Suggestion",
     "Tag",
@@ -1,6 +1,7 @@
+import datetime as dt
 from uuid import UUID
 
-from sqlalchemy import JSON, ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -13,11 +14,27 @@ class Chat(Base, IDMixin, TimestampWithUpdateMixin, SoftDeleteMixin):
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"))
     model_id: Mapped[UUID] = mapped_column(ForeignKey("chat_models.id"))
     title: Mapped[str]
-    messages: Mapped[list[dict[str, str]]] = mapped_column(JSON)
+    deleted_at: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+    # Rolling summary of the messages up to and including `summary_until`, which
+    # stands in for them once they no longer fit the context budget.
+    summary: Mapped[str | None] = mapped_column(default=None)
+    summary_until: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True), default=None)
 
     user: Mapped["User"] = relationship(back_populates="chats")
     chat_model: Mapped["ChatModel"] = relationship(back_populates="chats")
 
+    __table_args__ = (
+        # The chat list's shape; deleted chats are never listed.
+        Index(
+            "ix_chats_user_id_created_at_live",
+            "user_id",
+            "created_at",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        # What the archiver scans for: deleted chats, oldest deletion first.
+        Index("ix_chats_deleted_at", "deleted_at", postgresql_where=text("is_deleted")),
+    )
+
 
 from .chat_model import ChatModel
 from .user import User
@@ -0,0 +1,27 @@
+import datetime as dt
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, LargeBinary, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ChatArchive(Base):
+    """A soft-deleted chat past its retention window, moved out of `chats`.
+
+    `messages` is the chat's message list as zlib-compressed JSON; nothing reads
+    it on a request path. Written only by `archive_deleted_chats`.
+    """
+
+    __tablename__ = "chat_archives"
+
+    id: Mapped[UUID] = mapped_column(primary_key=True)  #: the chat's id
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), index=True)
+    model_id: Mapped[UUID]
+    title: Mapped[str]
+    message_count: Mapped[int]
+    messages: Mapped[bytes] = mapped_column(LargeBinary)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True))
+    deleted_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=func.now())
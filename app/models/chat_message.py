@@ -0,0 +1,27 @@
+import datetime as dt
+from uuid import UUID
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models._mixins import IDMixin
+
+
+class ChatMessage(Base, IDMixin):
+    """One message of a chat. Rows are only ever appended: a turn inserts its two
+    messages and never rewrites the ones before it."""
+
+    __tablename__ = "chat_messages"
+
+    chat_id: Mapped[UUID] = mapped_column(ForeignKey("chats.id", ondelete="CASCADE"))
+    role: Mapped[str]
+    content: Mapped[str]
+    tools: Mapped[list[dict]] = mapped_column(JSON, default=list)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+
+    __table_args__ = (
+        # A chat's messages in order; `id` breaks ties, so it also serves the
+        # `(created_at, id)` keyset that pages through them.
+        Index("ix_chat_messages_chat_id_created_at_id", "chat_id", "created_at", "id"),
+    )
@@ -5,14 +5,16 @@ from sqlalchemy import (
     ARRAY,
     Column,
     DateTime,
+    FetchedValue,
     ForeignKey,
     ForeignKeyConstraint,
+    Index,
     Integer,
     String,
     Table,
 )
-from sqlalchemy.dialects.postgresql import UUID as SQLAlchemyUUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import ARRAY as PgArray, UUID as SQLAlchemyUUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.core.database import Base
 from app.models._mixins import TimestampWithUpdateMixin
@@ -34,6 +36,11 @@ class Day(Base, TimestampWithUpdateMixin):
     timestamp: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
     city_id: Mapped[UUID] = mapped_column(ForeignKey("cities.id"))
+    # The city's country, copied by a trigger whenever `city_id` is written, so
+    # country filters and per-country counts read `days` alone. Never set it directly.
+    country_id: Mapped[UUID] = mapped_column(
+        ForeignKey("countries.id"), server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
     description: Mapped[str | None]
     content: Mapped[str]
     steps: Mapped[int | None]
@@ -44,6 +51,11 @@ class Day(Base, TimestampWithUpdateMixin):
     ai_generated_at: Mapped[dt.datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # Mirrors `days_tags` so tag filters are one GIN-indexed containment test. ORM
+    # writes to `tags` keep it in step (below); bulk SQL on `days_tags` must too.
+    tag_ids: Mapped[list[UUID]] = mapped_column(
+        PgArray(SQLAlchemyUUID(as_uuid=True)), default=list, server_default="{}"
+    )
 
     user: Mapped["User"] = relationship(back_populates="days")
     city: Mapped["City"] = relationship(back_populates="days")
@@ -61,6 +73,27 @@ class Day(Base, TimestampWithUpdateMixin):
         back_populates="day", overlaps="user,suggestions"
     )
 
+    # The primary key leads with `timestamp`, so it cannot serve "this user's days
+    # in order" — the shape of nearly every read.
+    # Partitioned by year on `timestamp`, like the tables hanging off a day; see
+    # app.core.partitions.
+    __table_args__ = (
+        Index("ix_days_user_id_timestamp", "user_id", "timestamp"),
+        Index("ix_days_user_id_country_id_timestamp", "user_id", "country_id", "timestamp"),
+        Index("ix_days_tag_ids", "tag_ids", postgresql_using="gin"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
+    @validates("tags", include_removes=True)
+    def _mirror_tag_ids(self, _key: str, tag: "Tag", is_remove: bool) -> "Tag":
+        # Reassigned rather than mutated: a plain ARRAY column does not track
+        # in-place changes.
+        tag_ids = [tag_id for tag_id in self.tag_ids or [] if tag_id != tag.id]
+        if not is_remove:
+            tag_ids.append(tag.id)
+        self.tag_ids = tag_ids
+        return tag
+
 
 from .city import City
 from .insight import Insight
@@ -16,7 +16,8 @@ class Insight(Base, IDMixin, TimestampMixin):
     user_id: Mapped[UUID] = mapped_column()
     model_id: Mapped[UUID] = mapped_column(ForeignKey("chat_models.id"))
     insight_type_id: Mapped[UUID] = mapped_column(ForeignKey("insight_types.id"))
-    timestamp: Mapped[int] = mapped_column()
+    # Part of the key because the table is partitioned on it.
+    timestamp: Mapped[int] = mapped_column(primary_key=True)
 
     date_begin: Mapped[dt.date]  # Insight duration begins at this date
     description: Mapped[str]
@@ -26,6 +27,7 @@ class Insight(Base, IDMixin, TimestampMixin):
     __table_args__ = (
         ForeignKeyConstraint(["user_id"], ["users.id"]),
         ForeignKeyConstraint(["timestamp", "user_id"], ["days.timestamp", "days.user_id"]),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
     )
 
     user: Mapped["User"] = relationship(back_populates="insights")
@@ -20,6 +20,13 @@ class Month(Base):
     top_day_timestamp: Mapped[int | None]
 
     user: Mapped["User"] = relationship(back_populates="months")
+    stats: Mapped["MonthStats | None"] = relationship(
+        primaryjoin="and_(Month.user_id == foreign(MonthStats.user_id), "
+        "Month.year == foreign(MonthStats.year), Month.month == foreign(MonthStats.month))",
+        lazy="joined",
+        viewonly=True,
+    )
 
 
+from .month_stats import MonthStats
 from .user import User
@@ -0,0 +1,27 @@
+from uuid import UUID
+
+from sqlalchemy import BigInteger, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class MonthStats(Base):
+    """Per-month aggregates of a user's days, kept current by `app.core.rollups`.
+
+    Rows exist for any month with days, whether or not a `Month` was saved for it.
+    Both JSONB maps are keyed by id (trackable item, tag) and never hold zeros.
+    """
+
+    __tablename__ = "month_stats"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    year: Mapped[int] = mapped_column(primary_key=True)
+    month: Mapped[int] = mapped_column(primary_key=True)
+    day_count: Mapped[int] = mapped_column(default=0)
+    steps_total: Mapped[int] = mapped_column(BigInteger, default=0)
+    steps_day_count: Mapped[int] = mapped_column(default=0)  #: days with steps recorded
+    starred_count: Mapped[int] = mapped_column(default=0)
+    progress_totals: Mapped[dict[str, float]] = mapped_column(JSONB, default=dict)
+    tag_counts: Mapped[dict[str, int]] = mapped_column(JSONB, default=dict)
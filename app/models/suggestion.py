@@ -15,7 +15,8 @@ class Suggestion(Base, IDMixin):
 
     user_id: Mapped[UUID] = mapped_column()
     model_id: Mapped[UUID] = mapped_column(ForeignKey("chat_models.id"))
-    timestamp: Mapped[int] = mapped_column()
+    # Part of the key because the table is partitioned on it.
+    timestamp: Mapped[int] = mapped_column(primary_key=True)
 
     description: Mapped[str]
     icon: Mapped[FAIcon | None] = mapped_column(PydanticType(FAIcon), default=None)
@@ -25,6 +26,7 @@ class Suggestion(Base, IDMixin):
     __table_args__ = (
         ForeignKeyConstraint(["user_id"], ["users.id"]),
         ForeignKeyConstraint(["timestamp", "user_id"], ["days.timestamp", "days.user_id"]),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
     )
 
     user: Mapped["User"] = relationship(back_populates="suggestions")
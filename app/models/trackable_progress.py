@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, ForeignKeyConstraint
+from sqlalchemy import ForeignKey, ForeignKeyConstraint, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -12,7 +12,8 @@ class TrackableProgress(Base, IDMixin):
 
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"))
     trackable_item_id: Mapped[UUID] = mapped_column(ForeignKey("trackable_items.id"))
-    timestamp: Mapped[int] = mapped_column()
+    # Part of the key because the table is partitioned on it.
+    timestamp: Mapped[int] = mapped_column(primary_key=True)
     value: Mapped[float]
     description: Mapped[str | None]
 
@@ -32,6 +33,12 @@ class TrackableProgress(Base, IDMixin):
             ["timestamp", "user_id"],
             ["days.timestamp", "days.user_id"],
         ),
+        # One row per item per day: the target of update_day's upsert, and the index
+        # behind its per-day reads.
+        UniqueConstraint(
+            "user_id", "timestamp", "trackable_item_id", name="uq_trackable_progress_day_item"
+        ),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
     )
 
 
@@ -5,9 +5,10 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.services.chats import ChatStore
+from app.constants import CHAT_MESSAGE_WINDOW
 from app.core.database import get_db
 from app.core.deps import get_current_user
-from app.schemas import ChatCreate, ChatDetail, ChatListItem, ChatUpdate, Msg
+from app.schemas import ChatCreate, ChatDetail, ChatListItem, ChatUpdate, MessagePage, Msg
 
 router = APIRouter(
     prefix="/chats",
@@ -37,6 +38,21 @@ async def get_chat(
     return Msg(code=200, msg="Chat retrieved", data=detail)
 
 
+@router.get("/{id}/messages", response_model=Msg[MessagePage])
+async def get_chat_messages(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    user_id: Annotated[UUID, Depends(get_current_user())],
+    id: UUID,
+    before: str | None = Query(
+        None, description="Cursor from `olderCursor`; omit for the latest messages"
+    ),
+    limit: int = Query(CHAT_MESSAGE_WINDOW, ge=1, le=CHAT_MESSAGE_WINDOW),
+) -> Msg[MessagePage]:
+    """Older messages than a chat detail shows, one page at a time, newest page first."""
+    page = await ChatStore(db).page(id, user_id, limit=limit, before=before)
+    return Msg(code=200, msg="Messages retrieved", data=page)
+
+
 @router.post("/", response_model=Msg[ChatDetail])
 async def create_chat(
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -1,6 +1,8 @@
 import datetime as dt
 from collections import defaultdict
-from typing import Annotated, Literal
+from functools import lru_cache
+from types import GenericAlias
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
 from fastapi import (
@@ -9,66 +11,182 @@ from fastapi import (
     Depends,
     HTTPException,
     Query,
+    Request,
 )
-from pydantic import ValidationError
-from sqlalchemy import and_, delete, exists, func, select, update
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import from_json
+from sqlalchemy import (
+    Integer,
+    ScalarSelect,
+    and_,
+    cast,
+    delete,
+    exists,
+    false,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import load_only, selectinload
 from sqlalchemy.sql import Select
 
-from app.constants import CACHE_TTL_DAYS
+from app.constants import CACHE_TTL_DAYS, DAYS_BULK_MAX_ITEMS
 from app.core.cache import cached, clear_cache
 from app.core.database import get_db
+from app.core.day_json import day_detail_json
 from app.core.deps import StorageServiceDep, get_current_user
+from app.core.partitions import check_day_timestamp, ensure_partitions
+from app.core.responses import ModelResponse, rendered_msg
+from app.core.rollups import (
+    DayFootprint,
+    apply_day_change,
+    apply_day_changes,
+    day_change_upserts,
+)
+from app.core.settings import get_settings
 from app.core.storage.utils import as_key_set
 from app.enums import CacheNamespace
 from app.enums.sorting import DaySortField, SortOrder
-from app.models import City, Day, Tag, TrackableItem, TrackableProgress
+from app.models import City, Day, Tag, TrackableItem, TrackableProgress, TrackableType
+from app.models.day import days_tags
 from app.schemas import (
+    DayBulkItem,
+    DayBulkResult,
     DayCreate,
     DayDetail,
     DayFilters,
     DayListItem,
-    DayTrackableProgress,
+    DayTrackableProgressUpdate,
     DayUpdate,
-    InsightInDB,
     Msg,
-    SuggestionInDB,
-    TrackableTypeInDB,
-    TrackableTypeWithProgress,
+    NormalizedDay,
+    NormalizedDayDetail,
+    NormalizedDays,
 )
+from app.schemas.day import day_fields_model
 from app.tasks.ai_tasks import generate_day_ai
 
+settings = get_settings()
+
 router = APIRouter(
     prefix="/days",
     tags=["Days"],
 )
 
+# Everything `DayDetail` reads off a `Day`, so it validates straight from the row.
+_DETAIL_OPTIONS = (
+    selectinload(Day.tags),
+    selectinload(Day.city)
+        .selectinload(City.country),
+    selectinload(Day.trackable_progresses)
+        .selectinload(TrackableProgress.trackable_item)
+        .selectinload(TrackableItem.type),
+    selectinload(Day.insights),
+    selectinload(Day.suggestions),
+)  # fmt: skip
+
+# Built once: validating a page is then a single call into pydantic-core.
+_DAY_DETAILS = TypeAdapter(list[DayDetail])
+_DAY_LIST_ITEMS = TypeAdapter(list[DayListItem])
+
+# `normalized=true` needs the same rows as the views, the city's country included.
+_NORMALIZED_LIST_OPTIONS = (
+    selectinload(Day.city)
+        .selectinload(City.country),
+    selectinload(Day.trackable_progresses)
+        .selectinload(TrackableProgress.trackable_item)
+        .selectinload(TrackableItem.type),
+)  # fmt: skip
+_NORMALIZED_DAYS = TypeAdapter(NormalizedDays[NormalizedDay])
+_NORMALIZED_DAY_DETAILS = TypeAdapter(NormalizedDays[NormalizedDayDetail])
+
+# `fields=` names (the API's camelCase) to `DayDetail` attributes.
+_FIELD_NAMES = {field.alias or name: name for name, field in DayDetail.model_fields.items()}
+# What each relationship field needs loaded; every other field is a `Day` column.
+_FIELD_OPTIONS = {
+    "city": (
+        selectinload(Day.city)
+            .selectinload(City.country),
+    ),
+    "tags": (selectinload(Day.tags),),
+    "trackable_progresses": (
+        selectinload(Day.trackable_progresses)
+            .selectinload(TrackableProgress.trackable_item)
+            .selectinload(TrackableItem.type),
+    ),
+    "insights": (selectinload(Day.insights),),
+    "suggestions": (selectinload(Day.suggestions),),
+}  # fmt: skip
+
+
+def _normalize(
+    days: list[Day], adapter: TypeAdapter[NormalizedDays[Any]], *, with_tags: bool
+) -> NormalizedDays[Any]:
+    """Days with their related rows pulled out into `DayEntities`, once per id."""
+    cities: dict[UUID, City] = {}
+    items: dict[UUID, TrackableItem] = {}
+    types: dict[UUID, TrackableType] = {}
+    tags: dict[UUID, Tag] = {}
+    for day in days:
+        cities[day.city_id] = day.city
+        for progress in day.trackable_progresses:
+            items[progress.trackable_item_id] = progress.trackable_item
+            types[progress.trackable_item.type_id] = progress.trackable_item.type
+        if with_tags:
+            tags.update((tag.id, tag) for tag in day.tags)
+    entities = {"cities": cities, "trackable_items": items, "trackable_types": types, "tags": tags}
+    return adapter.validate_python({"days": days, "entities": entities}, from_attributes=True)
+
+
+def _parse_fields(fields: str) -> frozenset[str]:
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - _FIELD_NAMES.keys())
+    if unknown:
+        raise HTTPException(400, f"Unknown fields: {', '.join(unknown)}")
+    return frozenset(_FIELD_NAMES[name] for name in requested)
+
+
+@lru_cache(maxsize=128)
+def _sparse_days(fields: frozenset[str]) -> TypeAdapter:
+    model: type[BaseModel] = day_fields_model(fields)
+    # `list[model]`, which mypy can't check: the model is built at runtime.
+    days: Any = GenericAlias(list, model)
+    return TypeAdapter(days)
+
+
+def _load_fields(stmt: Select, fields: frozenset[str]) -> Select:
+    """Load the requested columns and only the relationships they need."""
+    columns = [getattr(Day, name) for name in fields if name not in _FIELD_OPTIONS]
+    if "city" in fields:
+        columns.append(Day.city_id)  # the key `Day.city` is loaded by
+    options = [opt for name in fields & _FIELD_OPTIONS.keys() for opt in _FIELD_OPTIONS[name]]
+    return stmt.options(load_only(Day.timestamp, *columns), *options)
+
 
 def _apply_filters(
     stmt: Select,
     filters: DayFilters | None,
-    tag_names: list[str] | None = None,
-    user_id: UUID | None = None,
+    tag_id_groups: list[list[UUID]] | None = None,
+    tag_match: Literal["all", "any"] = "all",
 ) -> Select:
-    if tag_names:
-        # Subquery: find days that have ALL the specified tags
-        tag_select = (
-            select(Day.timestamp, Day.user_id)
-            .join(Day.tags)
-            .where(Tag.name.in_(tag_names))
-        )  # fmt: skip
-        if user_id:
-            tag_select = tag_select.where(Tag.user_id == user_id)
-        tag_subquery = (
-            tag_select
-            .group_by(Day.timestamp, Day.user_id)
-            .having(func.count(Tag.id) == len(tag_names))
-            .subquery()
-        )  # fmt: skip
-        stmt = stmt.where(
-            and_(Day.timestamp == tag_subquery.c.timestamp, Day.user_id == tag_subquery.c.user_id)
-        )
+    if tag_id_groups is not None:
+        # One group per requested name; a name can be shared by several tags.
+        if tag_match == "any":
+            stmt = stmt.where(Day.tag_ids.overlap([i for group in tag_id_groups for i in group]))
+        elif not all(tag_id_groups):
+            # A name with no tag can never be matched.
+            stmt = stmt.where(false())
+        else:
+            single = [group[0] for group in tag_id_groups if len(group) == 1]
+            if single:
+                stmt = stmt.where(Day.tag_ids.contains(single))
+            for group in tag_id_groups:
+                if len(group) > 1:
+                    stmt = stmt.where(Day.tag_ids.overlap(group))
 
     if not filters:
         return stmt
@@ -80,7 +198,7 @@ def _apply_filters(
     if filters.city_id is not None:
         conditions.append(Day.city_id == filters.city_id)
     if filters.country_id is not None:
-        conditions.append(Day.city.has(City.country_id == filters.country_id))
+        conditions.append(Day.country_id == filters.country_id)
     if filters.created_after is not None:
         conditions.append(Day.timestamp >= filters.created_after)
     if filters.created_before is not None:
@@ -131,7 +249,25 @@ def _apply_sorting(
     return stmt.order_by(field.desc())
 
 
-@router.get("/", response_model=Msg[list[DayListItem | DayDetail]])
+async def _resolve_tag_names(db: AsyncSession, user_id: UUID, names: list[str]) -> list[list[UUID]]:
+    # Names are resolved up front, so renaming a tag needs no change to `tag_ids`.
+    rows = await db.execute(
+        select(Tag.name, Tag.id).where(Tag.user_id == user_id, Tag.name.in_(names))
+    )
+    ids_by_name: dict[str, list[UUID]] = defaultdict(list)
+    for name, tag_id in rows:
+        ids_by_name[name].append(tag_id)
+    return [ids_by_name[name] for name in dict.fromkeys(names)]
+
+
+@router.get(
+    "/",
+    response_model=Msg[
+        list[DayListItem | DayDetail]
+        | NormalizedDays[NormalizedDay]
+        | NormalizedDays[NormalizedDayDetail]
+    ],
+)
 @cached(expire=CACHE_TTL_DAYS, namespace=CacheNamespace.days_list)
 async def get_days(
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -158,19 +294,39 @@ async def get_days(
         description="Comma-separated list of tag names to filter by",
         alias="tagNames",
     ),
+    tag_match: Literal["all", "any"] = Query(
+        "all",
+        description="Whether days must carry 'all' of the tags or 'any' of them",
+        alias="tagMatch",
+    ),
     filters: str | None = Query(
         None,
         description=DayFilters.__doc__,
         alias="filters",
     ),
-) -> Msg[list[DayListItem | DayDetail]]:
+    fields: str | None = Query(
+        None,
+        description="Comma-separated fields to return instead of a fixed view, e.g. "
+        "'timestamp,starred,steps'. Relationships not asked for are not queried.",
+        alias="fields",
+    ),
+    normalized: bool = Query(
+        False,
+        description="Return {days, entities}: days refer to cities, trackable items and types, "
+        "and tags by id, and each of those appears once in `entities`",
+        alias="normalized",
+    ),
+) -> ModelResponse:
     """
     Get a list of days with optional filtering and sorting.
 
     Examples:
     - Basic usage: /days/
+    - Calendar cells only: /days/?fields=starred,steps
+    - Entities once per page: /days/?view=detail&normalized=true
     - With filters: /days/?filters={"starred":true,"steps":{"gt":5000}}
-    - With tags: /days/?tag_names=work,travel
+    - With tags: /days/?tagNames=work,travel
+    - With any of the tags: /days/?tagNames=work,travel&tagMatch=any
     - With sorting: /days/?sort_field=timestamp&sort_order=desc
     """
 
@@ -178,6 +334,9 @@ async def get_days(
         filter_params = DayFilters.model_validate_json(filters) if filters else None
     except ValidationError as e:
         raise HTTPException(400, f"Invalid filters: {e!s}") from e
+    field_set = _parse_fields(fields) if fields else None
+    if field_set is not None and normalized:
+        raise HTTPException(400, "fields and normalized cannot be combined")
 
     tag_name_list = [
         name.strip() 
@@ -187,7 +346,8 @@ async def get_days(
 
     stmt = select(Day).where(Day.user_id == user_id)
 
-    stmt = _apply_filters(stmt, filter_params, tag_name_list if tag_name_list else None, user_id)
+    tag_id_groups = await _resolve_tag_names(db, user_id, tag_name_list) if tag_name_list else None
+    stmt = _apply_filters(stmt, filter_params, tag_id_groups, tag_match)
     stmt = _apply_sorting(stmt, sort_field, sort_order)
 
     if limit is not None:
@@ -196,6 +356,23 @@ async def get_days(
     if offset is not None:
         stmt = stmt.offset(offset)
 
+    if field_set is not None:
+        rows = (await db.scalars(_load_fields(stmt, field_set))).unique()
+        data = _sparse_days(field_set).validate_python(list(rows))
+        return ModelResponse(Msg(code=200, msg="Days retrieved", data=data))
+
+    if normalized:
+        detail = view == "detail"
+        stmt = stmt.options(*(_DETAIL_OPTIONS if detail else _NORMALIZED_LIST_OPTIONS))
+        days = list((await db.scalars(stmt)).unique())
+        normalizer = _NORMALIZED_DAY_DETAILS if detail else _NORMALIZED_DAYS
+        data = _normalize(days, normalizer, with_tags=detail)
+        return ModelResponse(Msg(code=200, msg="Days retrieved", data=data))
+
+    if view == "detail" and settings.days_sql_rendering:
+        rendered = await db.scalars(stmt.with_only_columns(day_detail_json()))
+        return ModelResponse(rendered_msg(f"[{','.join(rendered)}]", msg="Days retrieved"))
+
     if view == "list":
         stmt = stmt.options(
             load_only(
@@ -211,21 +388,38 @@ async def get_days(
                 .selectinload(TrackableItem.type),
         )  # fmt: skip
     else:
-        stmt = stmt.options(
-            selectinload(Day.tags),
-            selectinload(Day.city)
-                .selectinload(City.country),
-            selectinload(Day.trackable_progresses)
-                .selectinload(TrackableProgress.trackable_item)
-                .selectinload(TrackableItem.type),
-        )  # fmt: skip
+        stmt = stmt.options(*_DETAIL_OPTIONS)
 
     result = await db.execute(stmt)
     days = list(result.scalars().unique())
 
-    response_model = DayDetail if view == "detail" else DayListItem
-    return Msg(
-        code=200, msg="Days retrieved", data=[response_model.model_validate(day) for day in days]
+    adapter = _DAY_DETAILS if view == "detail" else _DAY_LIST_ITEMS
+    return ModelResponse(Msg(code=200, msg="Days retrieved", data=adapter.validate_python(days)))
+
+
+def _random_timestamp(
+    user_id: UUID, timestamp_start: int | None, timestamp_end: int | None
+) -> ScalarSelect:
+    """A uniformly random day timestamp of the user's within the range.
+
+    `ORDER BY random()` sorts the whole range to keep one row. Instead this counts
+    the range and steps a random offset into it, both index-only over
+    `ix_days_user_id_timestamp`: no sort, no heap reads, one round trip.
+    """
+    bounds = [Day.user_id == user_id]
+    if timestamp_start:
+        bounds.append(Day.timestamp >= timestamp_start)
+    if timestamp_end:
+        bounds.append(Day.timestamp <= timestamp_end)
+
+    total = select(func.count()).select_from(Day).where(*bounds).scalar_subquery()
+    return (
+        select(Day.timestamp)
+        .where(*bounds)
+        .order_by(Day.timestamp)
+        .offset(cast(func.floor(func.random() * total), Integer))
+        .limit(1)
+        .scalar_subquery()
     )
 
 
@@ -235,64 +429,25 @@ async def get_random_day(
     user_id: Annotated[UUID, Depends(get_current_user())],
     timestamp_start: int | None = Query(None, alias="timestampStart"),
     timestamp_end: int | None = Query(None, alias="timestampEnd"),
-) -> Msg[DayDetail]:
-    stmt = (
-        select(Day)
-        .where(Day.user_id == user_id)
-        .options(
-            selectinload(Day.tags),
-            selectinload(Day.city)
-                .selectinload(City.country),
-            selectinload(Day.trackable_progresses)
-                .selectinload(TrackableProgress.trackable_item)
-                .selectinload(TrackableItem.type),
-            selectinload(Day.insights),
-            selectinload(Day.suggestions),
-        )
-        .order_by(func.random())
-        .limit(1)
-    )  # fmt: skip
-
-    if timestamp_start:
-        stmt = stmt.where(Day.timestamp >= timestamp_start)
-    if timestamp_end:
-        stmt = stmt.where(Day.timestamp <= timestamp_end)
-
-    result = await db.execute(stmt)
-    day = result.scalar_one_or_none()
+) -> ModelResponse:
+    # Relationships are loaded for the sampled day only.
+    sampled = (
+        Day.user_id == user_id,
+        Day.timestamp == _random_timestamp(user_id, timestamp_start, timestamp_end),
+    )
+    if settings.days_sql_rendering:
+        rendered = await db.scalar(select(day_detail_json()).where(*sampled))
+        if rendered is None:
+            raise HTTPException(404, "No days found in the given time range")
+        return ModelResponse(rendered_msg(rendered, msg="Random day retrieved"))
 
+    day = await db.scalar(select(Day).where(*sampled).options(*_DETAIL_OPTIONS))
     if not day:
         raise HTTPException(404, "No days found in the given time range")
 
-    progresses_by_type = defaultdict(list)
-    type_objects = {}
-
-    for progress in day.trackable_progresses:
-        trackable_type = progress.trackable_item.type
-        type_objects[trackable_type.id] = TrackableTypeInDB.model_validate(trackable_type)
-        progresses_by_type[trackable_type.id].append(DayTrackableProgress.model_validate(progress))
-
-    trackable_progresses = [
-        TrackableTypeWithProgress(
-            type=type_objects[type_id],
-            progresses=progresses
-        )
-        for type_id, progresses in progresses_by_type.items()
-    ]  # fmt: skip
-
-    insights = [InsightInDB.model_validate(i) for i in day.insights]
-    suggestions = [SuggestionInDB.model_validate(s) for s in day.suggestions]
-
-    day_data = {
-        **{k: v for k, v in day.__dict__.items() if not k.startswith("_")},
-        "trackable_progresses": trackable_progresses,
-        "insights": insights,
-        "suggestions": suggestions,
-    }
-
-    day_schema = DayDetail.model_validate(day_data)
-
-    return Msg(code=200, msg="Random day retrieved", data=day_schema)
+    return ModelResponse(
+        Msg(code=200, msg="Random day retrieved", data=DayDetail.model_validate(day))
+    )
 
 
 @router.get("/{timestamp}", response_model=Msg[DayDetail])
@@ -301,55 +456,25 @@ async def get_day(
     db: Annotated[AsyncSession, Depends(get_db)],
     user_id: Annotated[UUID, Depends(get_current_user())],
     timestamp: int,
-) -> Msg[DayDetail]:
+) -> ModelResponse:
+    if settings.days_sql_rendering:
+        rendered = await db.scalar(
+            select(day_detail_json()).where(Day.timestamp == timestamp, Day.user_id == user_id)
+        )
+        if rendered is None:
+            raise HTTPException(404, "Day not found")
+        return ModelResponse(rendered_msg(rendered, msg="Day retrieved"))
+
     stmt = (
         select(Day)
-        .options(
-            selectinload(Day.tags),
-            selectinload(Day.city)
-                .selectinload(City.country),
-            selectinload(Day.trackable_progresses)
-                .selectinload(TrackableProgress.trackable_item)
-                .selectinload(TrackableItem.type),
-            selectinload(Day.insights),
-            selectinload(Day.suggestions),
-        )
+        .options(*_DETAIL_OPTIONS)
         .where(Day.timestamp == timestamp, Day.user_id == user_id)
-    )  # fmt: skip
+    )
     day = await db.scalar(stmt)
     if not day:
         raise HTTPException(404, "Day not found")
 
-    progresses_by_type = defaultdict(list)
-    type_objects = {}
-
-    for progress in day.trackable_progresses:
-        trackable_type = progress.trackable_item.type
-        type_objects[trackable_type.id] = TrackableTypeInDB.model_validate(trackable_type)
-        progresses_by_type[trackable_type.id].append(DayTrackableProgress.model_validate(progress))
-
-    trackable_progresses = [
-        TrackableTypeWithProgress(
-            type=type_objects[type_id],
-            progresses=progresses
-        )
-        for type_id, progresses in progresses_by_type.items()
-    ]  # fmt: skip
-
-    insights = [InsightInDB.model_validate(i) for i in day.insights]
-    suggestions = [SuggestionInDB.model_validate(s) for s in day.suggestions]
-
-    day_data = {
-        **{k: v for k, v in day.__dict__.items() if not k.startswith("_")},
-        "trackable_progresses": trackable_progresses,
-        "insights": insights,
-        "suggestions": suggestions,
-    }
-    print(f"DAYS {day_data=}")
-
-    day_schema = DayDetail.model_validate(day_data)
-
-    return Msg(code=200, msg="Day retrieved", data=day_schema)
+    return ModelResponse(Msg(code=200, msg="Day retrieved", data=DayDetail.model_validate(day)))
 
 
 async def _resolve_tags(db: AsyncSession, user_id: UUID, tag_ids: list[UUID]) -> list[Tag]:
@@ -364,64 +489,331 @@ async def _resolve_tags(db: AsyncSession, user_id: UUID, tag_ids: list[UUID]) ->
     return tags
 
 
-@router.post("/{timestamp}", response_model=Msg[None])
-async def create_day(
+async def _check_trackable_items(db: AsyncSession, user_id: UUID, item_ids: set[UUID]) -> None:
+    if not item_ids:
+        return
+
+    found_count = await db.scalar(
+        select(func.count()).where(
+            TrackableItem.id.in_(item_ids),
+            TrackableItem.user_id == user_id,
+        )
+    )
+    if found_count != len(item_ids):
+        raise HTTPException(404, "One or more trackable items not found")
+
+
+def _progress_by_item(
+    progresses: list[DayTrackableProgressUpdate],
+) -> dict[UUID, DayTrackableProgressUpdate]:
+    # A day holds one row per trackable item; a repeated item keeps its last entry.
+    return {progress.trackable_item_id: progress for progress in progresses}
+
+
+def _parse_bulk_body(body: bytes, content_type: str) -> list[object]:
+    try:
+        if content_type.startswith("application/x-ndjson"):
+            return [from_json(line) for line in body.splitlines() if line.strip()]
+        items = from_json(body)
+    except ValueError as e:
+        raise HTTPException(400, f"Invalid body: {e!s}") from e
+
+    if not isinstance(items, list):
+        raise HTTPException(400, "Invalid body: expected a JSON array of days")
+    return items
+
+
+@router.post("/bulk", response_model=Msg[list[DayBulkResult]])
+async def create_days_bulk(
     db: Annotated[AsyncSession, Depends(get_db)],
     user_id: Annotated[UUID, Depends(get_current_user())],
-    timestamp: int,
-    data: DayCreate,
-) -> Msg[None]:
-    exists_stmt = select(exists().where(Day.timestamp == timestamp, Day.user_id == user_id))
-    exists_result = await db.execute(exists_stmt)
-    exists_day = exists_result.scalar_one_or_none()
-    if exists_day:
-        raise HTTPException(404, "Day already exists")
+    request: Request,
+) -> Msg[list[DayBulkResult]]:
+    """
+    Create many days in one transaction.
 
-    city_exists = await db.scalar(select(exists().where(City.id == data.city_id)))
-    if not city_exists:
-        raise HTTPException(404, "City not found")
+    The body is NDJSON (`Content-Type: application/x-ndjson`, one day per line) or
+    a JSON array; each day is a `DayCreate` plus its `timestamp`. Days are checked
+    independently with the same rules as `POST /days/{timestamp}`: the valid ones
+    are created, and every day gets a result at its position in the body.
+    """
+    raw_items = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    if len(raw_items) > DAYS_BULK_MAX_ITEMS:
+        raise HTTPException(413, f"At most {DAYS_BULK_MAX_ITEMS} days per request")
+
+    results = [DayBulkResult(index=index, created=False) for index in range(len(raw_items))]
+    items: dict[int, DayBulkItem] = {}
+    for index, raw in enumerate(raw_items):
+        try:
+            item = DayBulkItem.model_validate(raw)
+        except ValidationError as e:
+            results[index].error = f"Invalid day: {e!s}"
+            continue
+        results[index].timestamp = item.timestamp
+        items[index] = item
+
+    # Before anything reads `days`: the partition DDL waits on this transaction's locks.
+    # Only for the items that validated, whose timestamps fall in the allowed years.
+    timestamps = {item.timestamp for item in items.values()}
+    await ensure_partitions(timestamps)
+
+    # One query per kind of reference, however many days.
+    existing = set(
+        await db.scalars(
+            select(Day.timestamp).where(Day.user_id == user_id, Day.timestamp.in_(timestamps))
+        )
+    )
+    known_cities = set(
+        await db.scalars(select(City.id).where(City.id.in_({i.city_id for i in items.values()})))
+    )
+    requested_trackables = {
+        progress.trackable_item_id
+        for item in items.values()
+        for progress in item.trackable_progresses
+    }
+    known_trackables = set(
+        await db.scalars(
+            select(TrackableItem.id).where(
+                TrackableItem.user_id == user_id, TrackableItem.id.in_(requested_trackables)
+            )
+        )
+    )
+    requested_tags = {tag_id for item in items.values() for tag_id in item.tags}
+    known_tags = set(
+        await db.scalars(select(Tag.id).where(Tag.user_id == user_id, Tag.id.in_(requested_tags)))
+    )
 
-    if data.trackable_progresses:
-        trackable_item_ids = {progress.trackable_item_id for progress in data.trackable_progresses}
-        stmt = select(func.count()).where(
-            TrackableItem.id.in_(trackable_item_ids),
-            TrackableItem.user_id == user_id,
+    day_rows: list[dict] = []
+    tag_rows: list[dict] = []
+    progress_rows: list[dict] = []
+    footprints: list[tuple[DayFootprint | None, DayFootprint | None]] = []
+    for index, item in items.items():
+        if item.timestamp in existing:
+            results[index].error = "Day already exists"
+            continue
+        if item.city_id not in known_cities:
+            results[index].error = "City not found"
+            continue
+        if any(p.trackable_item_id not in known_trackables for p in item.trackable_progresses):
+            results[index].error = "One or more trackable items not found"
+            continue
+        if not known_tags.issuperset(item.tags):
+            results[index].error = "One or more tags not found"
+            continue
+
+        # Later duplicates of a timestamp in the same body are refused like an
+        # existing day.
+        existing.add(item.timestamp)
+        tag_ids = list(dict.fromkeys(item.tags))
+        day_rows.append(
+            {
+                "timestamp": item.timestamp,
+                "user_id": user_id,
+                "city_id": item.city_id,
+                "description": item.description,
+                "content": item.content,
+                "steps": item.steps,
+                "main_image": item.main_image,
+                "images": item.images,
+                "tag_ids": tag_ids,
+            }
         )
-        result = await db.execute(stmt)
-        found_count = result.scalar()
+        tag_rows.extend(
+            {"day_timestamp": item.timestamp, "user_id": user_id, "tag_id": tag_id}
+            for tag_id in tag_ids
+        )
+        progresses = _progress_by_item(item.trackable_progresses)
+        progress_rows.extend(
+            {
+                "user_id": user_id,
+                "timestamp": item.timestamp,
+                "trackable_item_id": item_id,
+                "value": progress.value,
+                "description": progress.description,
+            }
+            for item_id, progress in progresses.items()
+        )
+        footprints.append(
+            (
+                None,
+                DayFootprint(
+                    timestamp=item.timestamp,
+                    steps=item.steps,
+                    tag_ids=tag_ids,
+                    progress=[(item_id, p.value) for item_id, p in progresses.items()],
+                ),
+            )
+        )
+        results[index].created = True
+
+    if day_rows:
+        # executemany: batched into multi-row INSERTs, a handful of round trips in all.
+        await db.execute(insert(Day), day_rows)
+        if tag_rows:
+            await db.execute(insert(days_tags), tag_rows)
+        if progress_rows:
+            await db.execute(insert(TrackableProgress), progress_rows)
+        await apply_day_changes(db, user_id, footprints)
+        await db.commit()
 
-        if found_count != len(trackable_item_ids):
-            raise HTTPException(404, "One or more trackable items not found")
+        await clear_cache(CacheNamespace.days_list, user_id)
+        await clear_cache(CacheNamespace.days_detail, user_id)
+        await clear_cache(CacheNamespace.months, user_id)
 
-    tags = await _resolve_tags(db, user_id, data.tags)
+    return Msg(code=200, msg=f"{len(day_rows)} days created", data=results)
 
-    db.add(
-        Day(
-            timestamp=timestamp,
-            user_id=user_id,
-            city_id=data.city_id,
-            description=data.description,
-            content=data.content,
-            steps=data.steps,
-            main_image=data.main_image,
-            images=data.images,
-            tags=tags,
-            trackable_progresses=[
-                TrackableProgress(
-                    user_id=user_id,
-                    timestamp=timestamp,
-                    trackable_item_id=progress.trackable_item_id,
-                    value=progress.value,
-                    description=progress.description,
-                )
-                for progress in data.trackable_progresses
-            ],
+
+def _create_day_statement(
+    user_id: UUID,
+    timestamp: int,
+    data: DayCreate,
+    progresses: dict[UUID, DayTrackableProgressUpdate],
+    tag_ids: list[UUID],
+) -> Select:
+    """Check references, insert the day with its tags and progress, and roll it up.
+
+    All of it is one statement, so one round trip: the checks are a CTE and every
+    write is a data-modifying CTE gated on them. The result row reports each check,
+    so a refusal can still name what was missing.
+    """
+    day_columns = Day.__table__.c
+    uuid_array = day_columns.tag_ids.type
+
+    checks = select(
+        exists().where(Day.timestamp == timestamp, Day.user_id == user_id).label("day_exists"),
+        exists().where(City.id == data.city_id).label("city_found"),
+        select(func.count())
+            .where(TrackableItem.id.in_(progresses), TrackableItem.user_id == user_id)
+            .scalar_subquery()
+            .label("trackables_found"),
+        select(func.count())
+            .where(Tag.id.in_(tag_ids), Tag.user_id == user_id)
+            .scalar_subquery()
+            .label("tags_found"),
+    ).cte("checks")  # fmt: skip
+    valid = (
+        select(checks)
+        .where(
+            ~checks.c.day_exists,
+            checks.c.city_found,
+            checks.c.trackables_found == len(progresses),
+            checks.c.tags_found == len(tag_ids),
+        )
+        .exists()
+    )  # fmt: skip
+
+    day_values = {
+        "timestamp": timestamp,
+        "user_id": user_id,
+        "city_id": data.city_id,
+        "description": data.description,
+        "content": data.content,
+        "steps": data.steps,
+        "main_image": data.main_image,
+        "images": data.images,
+        "tag_ids": tag_ids,
+    }
+    new_day = (
+        pg_insert(Day)
+        .from_select(
+            list(day_values),
+            select(*(literal(v, day_columns[k].type) for k, v in day_values.items())).where(valid),
         )
+        .on_conflict_do_nothing()
+        .returning(Day.timestamp)
+        .cte("new_day")
+    )  # fmt: skip
+    created = select(new_day.c.timestamp).exists()
+
+    new_tags = (
+        insert(days_tags)
+        .from_select(
+            ["day_timestamp", "user_id", "tag_id"],
+            select(
+                new_day.c.timestamp,
+                literal(user_id, day_columns.user_id.type),
+                func.unnest(literal(tag_ids, uuid_array)),
+            ),
+        )
+        .cte("new_tags")
+    )  # fmt: skip
+
+    progress_columns = TrackableProgress.__table__.c
+    progress_rows = func.unnest(
+        literal(list(progresses), uuid_array),
+        literal([p.value for p in progresses.values()], ARRAY(progress_columns.value.type)),
+        literal(
+            [p.description for p in progresses.values()],
+            ARRAY(progress_columns.description.type),
+        ),
+    ).table_valued("trackable_item_id", "value", "description")
+    new_progress = (
+        insert(TrackableProgress)
+        .from_select(
+            ["id", "user_id", "timestamp", "trackable_item_id", "value", "description"],
+            select(
+                func.gen_random_uuid(),
+                literal(user_id, progress_columns.user_id.type),
+                new_day.c.timestamp,
+                progress_rows.c.trackable_item_id,
+                progress_rows.c.value,
+                progress_rows.c.description,
+            ).select_from(new_day, progress_rows),
+        )
+        .cte("new_progress")
+    )  # fmt: skip
+
+    footprint = DayFootprint(
+        timestamp=timestamp,
+        steps=data.steps,
+        tag_ids=tag_ids,
+        progress=[(item_id, p.value) for item_id, p in progresses.items()],
     )
+    month_stats = [
+        upsert.cte(f"month_stats_{i}")
+        for i, upsert in enumerate(day_change_upserts(user_id, [(None, footprint)], when=created))
+    ]
+
+    return select(
+        checks.c.day_exists,
+        checks.c.city_found,
+        checks.c.trackables_found,
+        checks.c.tags_found,
+        created.label("created"),
+    ).add_cte(new_tags, new_progress, *month_stats)
+
+
+@router.post("/{timestamp}", response_model=Msg[None])
+async def create_day(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    user_id: Annotated[UUID, Depends(get_current_user())],
+    timestamp: int,
+    data: DayCreate,
+) -> Msg[None]:
+    try:
+        check_day_timestamp(timestamp)
+    except ValueError as e:
+        raise HTTPException(400, str(e)) from e
+    progresses = _progress_by_item(data.trackable_progresses)
+    tag_ids = list(dict.fromkeys(data.tags))
+
+    await ensure_partitions([timestamp])
+    result = await db.execute(_create_day_statement(user_id, timestamp, data, progresses, tag_ids))
+    outcome = result.one()
+    if not outcome.created:
+        if not outcome.day_exists and not outcome.city_found:
+            raise HTTPException(404, "City not found")
+        if not outcome.day_exists and outcome.trackables_found != len(progresses):
+            raise HTTPException(404, "One or more trackable items not found")
+        if not outcome.day_exists and outcome.tags_found != len(tag_ids):
+            raise HTTPException(404, "One or more tags not found")
+        # Also the answer when a concurrent request created the day after the checks.
+        raise HTTPException(404, "Day already exists")
     await db.commit()
 
     await clear_cache(CacheNamespace.days_list, user_id)
     await clear_cache(CacheNamespace.days_detail, user_id)
+    await clear_cache(CacheNamespace.months, user_id)
     return Msg(code=201, msg="Day created")
 
 
@@ -456,9 +848,16 @@ async def toggle_starred(
         raise HTTPException(404, "Day not found")
 
     day.starred = not day.starred
+    await apply_day_change(
+        db,
+        user_id,
+        DayFootprint(timestamp=timestamp, starred=not day.starred),
+        DayFootprint(timestamp=timestamp, starred=day.starred),
+    )
     await db.commit()
     await clear_cache(CacheNamespace.days_list, user_id)
     await clear_cache(CacheNamespace.days_detail, user_id)
+    await clear_cache(CacheNamespace.months, user_id)
     return Msg(code=200, msg="Day starred")
 
 
@@ -482,7 +881,7 @@ async def update_day(
         raise HTTPException(404, "Day not found")
 
     update_data = data.model_dump(exclude_unset=True)
-    trackable_progresses: list[dict] = update_data.pop("trackable_progresses", None)
+    update_data.pop("trackable_progresses", None)
     tag_uuids = update_data.pop("tags", None)
 
     # Both fields can hold the same key, so diff them together — differencing
@@ -494,6 +893,28 @@ async def update_day(
     )
     orphaned = before - after
 
+    # Progress is only diffed when it is being replaced; otherwise it cancels out.
+    current: dict[UUID, tuple[float, str | None]] = {}
+    wanted: dict[UUID, DayTrackableProgressUpdate] = {}
+    if data.trackable_progresses is not None:
+        wanted = _progress_by_item(data.trackable_progresses)
+        await _check_trackable_items(db, user_id, set(wanted))
+        rows = await db.execute(
+            select(
+                TrackableProgress.trackable_item_id,
+                TrackableProgress.value,
+                TrackableProgress.description,
+            ).where(TrackableProgress.user_id == user_id, TrackableProgress.timestamp == timestamp)
+        )
+        current = {item_id: (value, description) for item_id, value, description in rows}
+    footprint_before = DayFootprint(
+        timestamp=timestamp,
+        steps=day.steps,
+        starred=day.starred,
+        tag_ids=list(day.tag_ids),
+        progress=[(item_id, value) for item_id, (value, _) in current.items()],
+    )
+
     if update_data:
         stmt = (
             update(Day)
@@ -507,26 +928,61 @@ async def update_day(
         day.tags.clear()
         day.tags.extend(tags)
 
-    if trackable_progresses is not None:
-        await db.execute(
-            delete(TrackableProgress).where(
-                TrackableProgress.user_id == user_id,
-                TrackableProgress.timestamp == timestamp,
+    if data.trackable_progresses is not None:
+        # Autosave resends every progress; only rows whose item disappeared or whose
+        # value changed are written, so unchanged rows keep their ids and index entries.
+        removed = current.keys() - wanted.keys()
+        if removed:
+            await db.execute(
+                delete(TrackableProgress).where(
+                    TrackableProgress.user_id == user_id,
+                    TrackableProgress.timestamp == timestamp,
+                    TrackableProgress.trackable_item_id.in_(removed),
+                )
             )
-        )
 
-        for progress in trackable_progresses:
-            new_progress = TrackableProgress(
-                user_id=user_id,
-                timestamp=timestamp,
-                trackable_item_id=progress["trackable_item_id"],
-                value=progress["value"],
-                description=progress.get("description"),
+        changed = [
+            {
+                "user_id": user_id,
+                "timestamp": timestamp,
+                "trackable_item_id": item_id,
+                "value": progress.value,
+                "description": progress.description,
+            }
+            for item_id, progress in wanted.items()
+            if current.get(item_id) != (progress.value, progress.description)
+        ]
+        if changed:
+            upsert = pg_insert(TrackableProgress).values(changed)
+            await db.execute(
+                upsert.on_conflict_do_update(
+                    constraint="uq_trackable_progress_day_item",
+                    set_={
+                        "value": upsert.excluded.value,
+                        "description": upsert.excluded.description,
+                    },
+                )
             )
-            db.add(new_progress)
 
+    await apply_day_change(
+        db,
+        user_id,
+        footprint_before,
+        DayFootprint(
+            timestamp=timestamp,
+            steps=update_data.get("steps", footprint_before.steps),
+            starred=update_data.get("starred", footprint_before.starred),
+            tag_ids=list(day.tag_ids),
+            progress=(
+                [(item_id, p.value) for item_id, p in wanted.items()]
+                if data.trackable_progresses is not None
+                else []
+            ),
+        ),
+    )
     await db.commit()
     await clear_cache(CacheNamespace.days_list, user_id)
     await clear_cache(CacheNamespace.days_detail, user_id)
+    await clear_cache(CacheNamespace.months, user_id)
     background_tasks.add_task(storage_service.delete_objects, user_id, orphaned)
     return Msg(code=200, msg="Day updated")
@@ -0,0 +1,105 @@
+import datetime as dt
+from collections.abc import AsyncIterator
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.database import get_db
+from app.core.deps import get_current_user
+from app.models import (
+    Chat,
+    ChatMessage,
+    Day,
+    Insight,
+    Month,
+    Suggestion,
+    Tag,
+    TrackableItem,
+    TrackableProgress,
+    TrackableType,
+)
+from app.models.day import days_tags
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"],
+)
+
+# 2: chat messages are their own `chat_message` records instead of a list on `chat`.
+EXPORT_FORMAT_VERSION = 2
+# Rows fetched per round trip from the server-side cursor; also the unit written out.
+EXPORT_BATCH_SIZE = 500
+
+
+def _sections(user_id: UUID) -> list[tuple[str, Select]]:
+    """(record type, query) pairs, referenced rows before the rows that reference them."""
+    return [
+        ("tag", select(Tag.__table__).where(Tag.user_id == user_id)),
+        ("trackable_type", select(TrackableType.__table__).where(TrackableType.user_id == user_id)),
+        ("trackable_item", select(TrackableItem.__table__).where(TrackableItem.user_id == user_id)),
+        ("month", select(Month.__table__).where(Month.user_id == user_id)),
+        ("day", select(Day.__table__).where(Day.user_id == user_id).order_by(Day.timestamp)),
+        ("day_tag", select(days_tags).where(days_tags.c.user_id == user_id)),
+        (
+            "trackable_progress",
+            select(TrackableProgress.__table__).where(TrackableProgress.user_id == user_id),
+        ),
+        ("insight", select(Insight.__table__).where(Insight.user_id == user_id)),
+        ("suggestion", select(Suggestion.__table__).where(Suggestion.user_id == user_id)),
+        ("chat", select(Chat.__table__).where(Chat.user_id == user_id, Chat.is_deleted.is_(False))),
+        (
+            "chat_message",
+            select(ChatMessage.__table__)
+            .join(Chat.__table__, Chat.id == ChatMessage.chat_id)
+            .where(Chat.user_id == user_id, Chat.is_deleted.is_(False))
+            .order_by(ChatMessage.chat_id, ChatMessage.created_at),
+        ),
+    ]
+
+
+async def _export_lines(db: AsyncSession, user_id: UUID) -> AsyncIterator[bytes]:
+    yield (
+        to_json(
+            {
+                "type": "export",
+                "version": EXPORT_FORMAT_VERSION,
+                "user_id": user_id,
+                "exported_at": dt.datetime.now(dt.UTC),
+            }
+        )
+        + b"\n"
+    )
+
+    for record_type, stmt in _sections(user_id):
+        # Core rows off a server-side cursor: no ORM identity map, and only one
+        # batch is ever held in memory.
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for batch in result.mappings().partitions():
+            yield b"".join(
+                to_json({"type": record_type, "data": dict(row)}) + b"\n" for row in batch
+            )
+
+
+@router.get("/")
+async def export_account(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    user_id: Annotated[UUID, Depends(get_current_user())],
+) -> StreamingResponse:
+    """
+    Stream everything the user has written as NDJSON.
+
+    The first line is a header (`type: "export"`); every other line is
+    `{"type": ..., "data": row}` with the row's columns as stored. Media is
+    exported as the storage keys on days and months, not the objects themselves.
+    """
+    return StreamingResponse(
+        _export_lines(db, user_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="memoryful-export.ndjson"'},
+    )
@@ -14,6 +14,7 @@ from app.constants import CACHE_TTL_DAYS
 from app.core.cache import cached, clear_cache
 from app.core.database import get_db
 from app.core.deps import StorageServiceDep, get_current_user
+from app.core.responses import ModelResponse
 from app.core.storage.service import StorageService
 from app.core.storage.utils import is_video_key, orphaned_keys
 from app.enums import CacheNamespace
@@ -56,13 +57,13 @@ async def get_months(
     user_id: Annotated[UUID, Depends(get_current_user())],
     year: int,
     storage_service: StorageServiceDep,
-) -> Msg[list[M]]:
+) -> ModelResponse:
     stmt = select(Month).where(Month.user_id == user_id, Month.year == year)
     months_result = await db.execute(stmt)
     months = months_result.scalars()
 
     data = [await _with_resolved(storage_service, user_id, month) for month in months]
-    return Msg(code=200, msg="Months retrieved", data=data)
+    return ModelResponse(Msg(code=200, msg="Months retrieved", data=data))
 
 
 @router.get("/{year}/{month_number}", response_model=Msg[M])
@@ -73,7 +74,7 @@ async def get_month(
     year: int,
     month_number: int,
     storage_service: StorageServiceDep,
-) -> Msg[M]:
+) -> ModelResponse:
     stmt = select(Month).where(
         Month.user_id == user_id,
         Month.year == year,
@@ -84,10 +85,12 @@ async def get_month(
     if not month:
         raise HTTPException(404, "Month not found")
 
-    return Msg(
-        code=200,
-        msg="Month retrieved",
-        data=await _with_resolved(storage_service, user_id, month),
+    return ModelResponse(
+        Msg(
+            code=200,
+            msg="Month retrieved",
+            data=await _with_resolved(storage_service, user_id, month),
+        )
     )
 
 
@@ -6,15 +6,16 @@ from fastapi import (
     Depends,
     HTTPException,
 )
-from sqlalchemy import CursorResult, delete, select, update
+from sqlalchemy import CursorResult, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants import CACHE_TTL_USER_DATA
 from app.core.cache import cached, clear_cache
 from app.core.database import get_db
 from app.core.deps import get_current_user
+from app.core.rollups import forget_tag
 from app.enums import CacheNamespace
-from app.models import Tag
+from app.models import Day, Tag
 from app.models.day import days_tags
 from app.schemas import (
     Msg,
@@ -106,6 +107,12 @@ async def delete_tag(
     # would otherwise clear the association rows.
     owned = select(Tag.id).where(Tag.id == id, Tag.user_id == user_id)
     await db.execute(delete(days_tags).where(days_tags.c.tag_id.in_(owned)))
+    await db.execute(
+        update(Day)
+        .where(Day.user_id == user_id, Day.tag_ids.contains([id]))
+        .values(tag_ids=func.array_remove(Day.tag_ids, id))
+    )  # fmt: skip
+    await forget_tag(db, user_id, id)
 
     stmt = delete(Tag).where(Tag.id == id, Tag.user_id == user_id)
     result = cast("CursorResult[Any]", await db.execute(stmt))
@@ -117,4 +124,5 @@ async def delete_tag(
     await clear_cache(CacheNamespace.tags, user_id)
     await clear_cache(CacheNamespace.days_list, user_id)
     await clear_cache(CacheNamespace.days_detail, user_id)
+    await clear_cache(CacheNamespace.months, user_id)
     return Msg(code=200, msg="Tag deleted")
@@ -10,6 +10,7 @@ from app.constants import CACHE_TTL_USER_DATA
 from app.core.cache import cached, clear_cache
 from app.core.database import get_db
 from app.core.deps import get_current_user
+from app.core.rollups import forget_trackable_item
 from app.enums import CacheNamespace
 from app.models import TrackableItem, TrackableType
 from app.schemas import Msg
@@ -168,6 +169,7 @@ async def delete_trackable(
     user_id: Annotated[UUID, Depends(get_current_user())],
     id: UUID,
 ) -> Msg[None]:
+    await forget_trackable_item(db, user_id, id)
     stmt = delete(TrackableItem).where(
         TrackableItem.id == id,
         TrackableItem.user_id == user_id,
@@ -181,4 +183,5 @@ async def delete_trackable(
     await clear_cache(CacheNamespace.trackables, user_id)
     await clear_cache(CacheNamespace.days_list, user_id)
     await clear_cache(CacheNamespace.days_detail, user_id)
+    await clear_cache(CacheNamespace.months, user_id)
     return Msg(code=200, msg="Trackable item deleted")
@@ -7,15 +7,29 @@ from .chat import (
     ChatUpdate,
     CompletionCreate,
     CompletionResponse,
+    MessagePage,
     MessageSchema,
     ToolCallSchema,
 )
 from .chat_model import ChatModelInDB
 from .city import CityDetail, CityInDB
 from .country import CountryInDB
-from .day import DayCreate, DayDetail, DayFilters, DayListItem, DayUpdate
+from .day import (
+    DayBulkItem,
+    DayBulkResult,
+    DayCreate,
+    DayDetail,
+    DayEntities,
+    DayFilters,
+    DayListItem,
+    DayUpdate,
+    NormalizedDay,
+    NormalizedDayDetail,
+    NormalizedDays,
+)
 from .day_trackable_progress import (
     DayTrackableProgress,
+    DayTrackableProgressRef,
     DayTrackableProgressUpdate,
     TrackableTypeWithProgress,
 )
@@ -23,7 +37,7 @@ from .email import Email, EmailSchema, VerifyCodeForm
 from .font_awesome import FAIcon
 from .insight import InsightInDB
 from .media import ResolvedBackground
-from .month import MonthBase, MonthInDB
+from .month import MonthBase, MonthInDB, MonthStatsInDB
 from .security import AuthResponse, GoogleCredential, Session, Token
 from .storage import PresignGetRequest, PresignGetResponse, PresignPutRequest, PresignPutResponse
 from .suggestion import SuggestionInDB
@@ -31,6 +45,7 @@ from .tag import TagBase, TagInDB
 from .trackable import (
     TrackableBase,
     TrackableCreate,
+    TrackableDetail,
     TrackableInDB,
     TrackableUpdate,
 )
@@ -54,11 +69,15 @@ __all__ = [
     "CompletionCreate",
     "CompletionResponse",
     "CountryInDB",
+    "DayBulkItem",
+    "DayBulkResult",
     "DayCreate",
     "DayDetail",
+    "DayEntities",
     "DayFilters",
     "DayListItem",
     "DayTrackableProgress",
+    "DayTrackableProgressRef",
     "DayTrackableProgressUpdate",
     "DayUpdate",
     "Email",
@@ -66,10 +85,15 @@ __all__ = [
     "FAIcon",
     "GoogleCredential",
     "InsightInDB",
+    "MessagePage",
     "MessageSchema",
     "MonthBase",
     "MonthInDB",
+    "MonthStatsInDB",
     "Msg",
+    "NormalizedDay",
+    "NormalizedDayDetail",
+    "NormalizedDays",
     "PageBackgroundIn",
     "PresignGetRequest",
     "PresignGetResponse",
@@ -84,6 +108,7 @@ __all__ = [
     "ToolCallSchema",
     "TrackableBase",
     "TrackableCreate",
+    "TrackableDetail",
     "TrackableInDB",
     "TrackableTypeInDB",
     "TrackableTypeWithProgress",
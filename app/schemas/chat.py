@@ -3,7 +3,7 @@ from typing import Literal
 from uuid import UUID
 
 from fastapi_camelcase import CamelModel
-from pydantic import ConfigDict
+from pydantic import ConfigDict, Field
 
 
 class ToolCallSchema(CamelModel):
@@ -14,14 +14,22 @@ class ToolCallSchema(CamelModel):
 
 
 class MessageSchema(CamelModel):
+    model_config = ConfigDict(from_attributes=True)
+    # Both always set on stored messages (`chat_messages`).
+    id: UUID | None = None
     role: Literal["system", "user", "assistant"]
     content: str
-    # Both optional: messages stored before these existed simply don't have them
-    # (the column is JSON, so there's nothing to migrate).
     tools: list[ToolCallSchema] = []  # noqa: RUF012
     created_at: dt.datetime | None = None
 
 
+class MessagePage(CamelModel):
+    messages: list[MessageSchema] = Field(..., description="Oldest first")
+    older_cursor: str | None = Field(
+        None, description="`before` for the page of older messages; null at the chat's start"
+    )
+
+
 class ChatUpdate(CamelModel):
     title: str | None = None
     messages: list[MessageSchema] | None = None
@@ -46,7 +54,14 @@ class ChatListItem(ChatBase):
 class ChatDetail(ChatBase):
     user_id: UUID
     model_id: UUID
-    messages: list[MessageSchema]
+    # Filled from `chat_messages` by `ChatStore`, not read off the `Chat` row.
+    messages: list[MessageSchema] = Field(
+        default_factory=list, description="The latest messages, oldest first"
+    )
+    older_cursor: str | None = Field(
+        None,
+        description="`before` for GET /ai/chats/{id}/messages, set when older messages may exist",
+    )
     created_at: dt.datetime
     updated_at: dt.datetime
     chat_model: "ChatModelInDB"
@@ -1,8 +1,29 @@
 import datetime as dt
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
 from uuid import UUID
 
 from fastapi_camelcase import CamelModel
-from pydantic import ConfigDict, Field
+from pydantic import ConfigDict, Field, create_model, field_validator
+
+from app.core.partitions import check_day_timestamp
+
+
+def _group_by_type(cls: type, value: Any) -> Any:
+    """Group a day's flat progress rows by trackable type, in first-seen order.
+
+    Lets `model_validate(day)` build the whole detail from the ORM row in one
+    pass; already-grouped input (dicts or models) passes through.
+    """
+    if not value or not hasattr(value[0], "trackable_item"):
+        return value
+    groups: dict[UUID, dict[str, Any]] = {}
+    for progress in value:
+        item_type = progress.trackable_item.type
+        group = groups.setdefault(item_type.id, {"type": item_type, "progresses": []})
+        group["progresses"].append(progress)
+    return list(groups.values())
 
 
 class DayBase(CamelModel):
@@ -42,6 +63,68 @@ class DayDetail(DayBase):
         default_factory=list, description="List of suggestions for this day"
     )
 
+    _group_by_type = field_validator("trackable_progresses", mode="before")(_group_by_type)
+
+
+class NormalizedDay(DayBase):
+    """`DayListItem` with its city and trackable items as ids into `DayEntities`."""
+
+    description: str | None = None
+    steps: int = 0
+    starred: bool = False
+    main_image: str | None = None
+    city_id: UUID
+    trackable_progresses: list["DayTrackableProgressRef"] = Field(default_factory=list)
+
+
+class NormalizedDayDetail(NormalizedDay):
+    """`DayDetail` in the same shape: progress is flat (group by the item's type),
+    tags are ids."""
+
+    content: str
+    created_at: dt.datetime
+    updated_at: dt.datetime
+    completed_at: dt.datetime | None = None
+    ai_generated_at: dt.datetime | None = None
+    images: list[str] | None = Field(default_factory=list)
+    tag_ids: list[UUID] = Field(default_factory=list)
+    insights: list["InsightInDB"] | None = Field(default_factory=list)
+    suggestions: list["SuggestionInDB"] | None = Field(default_factory=list)
+
+
+class DayEntities(CamelModel):
+    """Everything a page of normalized days refers to, once each, by id."""
+
+    cities: dict[UUID, "CityDetail"] = Field(default_factory=dict)
+    trackable_items: dict[UUID, "TrackableDetail"] = Field(default_factory=dict)
+    trackable_types: dict[UUID, "TrackableTypeInDB"] = Field(default_factory=dict)
+    tags: dict[UUID, "TagInDB"] = Field(default_factory=dict)
+
+
+class NormalizedDays[T](CamelModel):
+    days: list[T]
+    entities: DayEntities
+
+
+@lru_cache(maxsize=128)
+def day_fields_model(fields: frozenset[str]) -> type[DayBase]:
+    """`DayDetail` cut down to `fields` (attribute names), for sparse fieldsets.
+
+    Validating a row only touches the requested attributes, so nothing else has
+    to be loaded. `timestamp` is always present.
+    """
+    validators: dict[str, Callable[..., Any]] = {
+        "_group_by_type": field_validator(
+            "trackable_progresses", mode="before", check_fields=False
+        )(_group_by_type)
+    }
+    definitions: dict[str, Any] = {
+        name: (field.annotation, field)
+        for name, field in DayDetail.model_fields.items()
+        if name in fields and name not in DayBase.model_fields
+    }
+    return create_model("DayFields", __base__=DayBase, __validators__=validators, **definitions)
+
 
 class DayCreate(CamelModel):
     city_id: UUID
@@ -54,6 +137,24 @@ class DayCreate(CamelModel):
     tags: list[UUID] = Field(default_factory=list)
 
 
+class DayBulkItem(DayCreate):
+    timestamp: int
+
+    @field_validator("timestamp")
+    @classmethod
+    def _allowed_timestamp(cls, value: int) -> int:
+        # Checked here so refused items never reach the partition DDL.
+        check_day_timestamp(value)
+        return value
+
+
+class DayBulkResult(CamelModel):
+    index: int = Field(..., description="Position of the item in the request body")
+    timestamp: int | None = None
+    created: bool
+    error: str | None = None
+
+
 class DayUpdate(CamelModel):
     city_id: UUID | None = None
     description: str | None = None
@@ -83,7 +184,7 @@ class DayFilters(CamelModel):
     )
     starred: bool | None = Field(None, description="Filter by starred status")
     city_id: UUID | None = Field(None, description="Filter by city ID", alias="cityId")
-    country_id: str | None = Field(None, description="Filter by country ID", alias="countryId")
+    country_id: UUID | None = Field(None, description="Filter by country ID", alias="countryId")
     created_after: int | None = Field(
         None, description="Filter by creation timestamp (after)", alias="createdAfter"
     )
@@ -95,9 +196,12 @@ class DayFilters(CamelModel):
 from .city import CityDetail, CityInDB
 from .day_trackable_progress import (
     DayTrackableProgress,
+    DayTrackableProgressRef,
     DayTrackableProgressUpdate,
     TrackableTypeWithProgress,
 )
 from .insight import InsightInDB
 from .suggestion import SuggestionInDB
 from .tag import TagInDB
+from .trackable import TrackableDetail
+from .trackable_type import TrackableTypeInDB
@@ -18,6 +18,15 @@ class DayTrackableProgressUpdate(CamelModel):
     trackable_item_id: UUID = Field(..., description="ID of the trackable item")
 
 
+class DayTrackableProgressRef(CamelModel):
+    """A progress whose item is an id into `DayEntities.trackable_items`."""
+
+    model_config = ConfigDict(from_attributes=True)
+    value: float
+    description: str | None
+    trackable_item_id: UUID
+
+
 class TrackableTypeWithProgress(CamelModel):
     type: "TrackableTypeInDB" = Field(..., description="The trackable type information")
     progresses: list["DayTrackableProgress"] = Field(
@@ -3,7 +3,7 @@ from uuid import UUID
 
 from dateutil.parser import parse
 from fastapi_camelcase import CamelModel
-from pydantic import ConfigDict, Field, field_validator
+from pydantic import ConfigDict, Field, computed_field, field_validator
 
 from app.schemas.media import ResolvedBackground
 
@@ -33,7 +33,30 @@ class MonthBase(CamelModel):
         return float(value)
 
 
+class MonthStatsInDB(CamelModel):
+    model_config = ConfigDict(from_attributes=True)
+    day_count: int = 0
+    steps_total: int = 0
+    steps_day_count: int = 0
+    starred_count: int = 0
+    progress_totals: dict[UUID, float] = Field(
+        default_factory=dict, description="Summed progress values by trackable item ID"
+    )
+    tag_counts: dict[UUID, int] = Field(
+        default_factory=dict, description="Number of days carrying each tag, by tag ID"
+    )
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def avg_steps(self) -> float | None:
+        """Average over the days that recorded steps."""
+        if not self.steps_day_count:
+            return None
+        return self.steps_total / self.steps_day_count
+
+
 class MonthInDB(MonthBase):
     model_config = ConfigDict(from_attributes=True)
     user_id: UUID
     resolved: ResolvedBackground | None = None
+    stats: MonthStatsInDB | None = None  #: None until the month has a day
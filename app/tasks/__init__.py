@@ -5,9 +5,17 @@ from .ai_tasks import (
 from .email_tasks import (
     send_email_task,
 )
+from .system_tasks import (
+    archive_deleted_chats_task,
+    ensure_next_year_partitions_task,
+    rebuild_month_stats_task,
+)
 
 __all__ = [
+    "archive_deleted_chats_task",
+    "ensure_next_year_partitions_task",
     "generate_day_ai",
     "generate_yesterday_ai_fallback",
+    "rebuild_month_stats_task",
     "send_email_task",
 ]
@@ -1,27 +1,15 @@
-import asyncio
 import datetime as dt
-from collections.abc import Coroutine
-from typing import Any
 from uuid import UUID
 
 from sqlalchemy import and_, select
 
+from app.ai.memory import summarize_chat
 from app.ai.services.day import generate_daily_insights_and_suggestions_for_day
 from app.core.celery_app import celery
 from app.core.database import AsyncSessionLocal
 from app.models import Day
 
-_celery_async_loop: asyncio.AbstractEventLoop | None = None
-
-
-def _run_async(coro: "Coroutine[Any, Any, None]") -> None:
-    global _celery_async_loop
-
-    if _celery_async_loop is None or _celery_async_loop.is_closed():
-        _celery_async_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(_celery_async_loop)
-
-    return _celery_async_loop.run_until_complete(coro)
+from .utils import run_async
 
 
 def _date_to_day_timestamp(d: dt.date) -> int:
@@ -30,11 +18,16 @@ def _date_to_day_timestamp(d: dt.date) -> int:
 
 @celery.task(queue="ai_queue")
 def generate_day_ai(user_id: str, timestamp: int) -> None:
-    _run_async(
+    run_async(
         generate_daily_insights_and_suggestions_for_day(user_id=UUID(user_id), timestamp=timestamp)
     )
 
 
+@celery.task(queue="ai_queue")
+def summarize_chat_task(chat_id: str) -> None:
+    run_async(summarize_chat(UUID(chat_id)))
+
+
 async def _enqueue_fallback_for_yesterday() -> None:
     target_date = dt.datetime.now(dt.UTC).date() - dt.timedelta(days=1)
     target_ts = _date_to_day_timestamp(target_date)
@@ -58,4 +51,4 @@ async def _enqueue_fallback_for_yesterday() -> None:
 
 @celery.task(queue="ai_queue")
 def generate_yesterday_ai_fallback() -> None:
-    _run_async(_enqueue_fallback_for_yesterday())
+    run_async(_enqueue_fallback_for_yesterday())
@@ -0,0 +1,62 @@
+import asyncio
+import datetime as dt
+import logging
+from uuid import UUID
+
+from app.ai.services.chats import archive_deleted_chats
+from app.core.celery_app import celery
+from app.core.database import AsyncSessionLocal
+from app.core.partitions import ensure_year_partitions
+from app.core.rollups import rebuild_month_stats
+from app.core.settings import get_settings
+
+from .utils import run_async
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Between archive batches, so a large backlog drains without monopolising the
+# database: each batch is one short transaction followed by a pause.
+CHAT_ARCHIVE_PAUSE_SECONDS = 0.5
+
+
+async def _rebuild_month_stats(user_id: UUID | None) -> None:
+    async with AsyncSessionLocal() as db:
+        await rebuild_month_stats(db, user_id)
+        await db.commit()
+
+
+@celery.task(queue="system_queue")
+def rebuild_month_stats_task(user_id: str | None = None) -> None:
+    """Recompute `month_stats` for one user, or for everyone when omitted.
+
+    celery -A app.core.celery_app call app.tasks.system_tasks.rebuild_month_stats_task
+    """
+    run_async(_rebuild_month_stats(UUID(user_id) if user_id else None))
+
+
+@celery.task(queue="system_queue")
+def ensure_next_year_partitions_task() -> None:
+    """Create next year's partitions of the per-day tables ahead of its first day."""
+    run_async(ensure_year_partitions([dt.datetime.now(dt.UTC).year + 1]))
+
+
+async def _archive_deleted_chats() -> None:
+    deleted_before = dt.datetime.now(dt.UTC) - dt.timedelta(days=settings.chat_archive_after_days)
+    archived = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            moved = await archive_deleted_chats(
+                db, deleted_before=deleted_before, batch_size=settings.chat_archive_batch_size
+            )
+        archived += moved
+        if moved < settings.chat_archive_batch_size:
+            break
+        await asyncio.sleep(CHAT_ARCHIVE_PAUSE_SECONDS)
+    logger.info(f"archived {archived} deleted chats")
+
+
+@celery.task(queue="system_queue")
+def archive_deleted_chats_task() -> None:
+    """Move chats soft-deleted past the retention window into `chat_archives`."""
+    run_async(_archive_deleted_chats())
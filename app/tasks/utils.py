@@ -0,0 +1,15 @@
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
+_celery_async_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run_async(coro: "Coroutine[Any, Any, None]") -> None:
+    global _celery_async_loop
+
+    if _celery_async_loop is None or _celery_async_loop.is_closed():
+        _celery_async_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_celery_async_loop)
+
+    return _celery_async_loop.run_until_complete(coro)
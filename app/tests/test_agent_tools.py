@@ -0,0 +1,147 @@
+"""The in-process agent tools, answering as the API does, and a turn's view of its tools."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import AsyncClient
+from langchain_core.messages import ToolCall
+from langchain_core.tools import StructuredTool, ToolException
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.tools import for_turn, load_local_tools
+from app.models import Tag
+
+from .conftest import MakeUser
+
+# As registered in mcp_server/main.py.
+MCP_TOOL_NAMES = [
+    "get_days",
+    "get_day_by_timestamp",
+    "get_random_day",
+    "get_months_by_year",
+    "get_month_by_year_and_month_number",
+    "get_insights",
+    "get_suggestions",
+    "get_tags",
+    "get_tag_by_id",
+    "get_trackables",
+    "get_trackable_by_id",
+    "get_trackable_types",
+    "get_trackable_type_by_id",
+    "get_my_workspace",
+]
+
+
+def _tools(db: AsyncSession, user_id: UUID) -> dict:
+    @asynccontextmanager
+    async def sessions() -> AsyncIterator[AsyncSession]:
+        yield db
+
+    return {tool.name: tool for tool in load_local_tools(user_id, sessions=sessions)}
+
+
+async def test_tools_mirror_the_mcp_server() -> None:
+    tools = load_local_tools(uuid4())
+    assert [tool.name for tool in tools] == MCP_TOOL_NAMES
+    schema = next(t for t in tools if t.name == "get_random_day").tool_call_schema
+    assert isinstance(schema, type) and issubclass(schema, BaseModel)
+    assert set(schema.model_json_schema()["properties"]) == {"timestampStart", "timestampEnd"}
+
+
+async def test_tools_answer_like_the_api_and_only_for_their_user(
+    client: AsyncClient, db: AsyncSession, make_user: MakeUser
+) -> None:
+    owner, headers = await make_user()
+    other, _ = await make_user()
+    tag = Tag(user_id=owner.id, name="owner-tag")
+    db.add(tag)
+    await db.flush()
+
+    api = await client.get("/tags/", headers=headers, follow_redirects=True)
+    mine = await _tools(db, owner.id)["get_tags"].ainvoke({})
+    assert json.loads(mine) == api.json()["data"]
+
+    theirs = _tools(db, other.id)
+    assert json.loads(await theirs["get_tags"].ainvoke({})) == []
+    assert "Tag not found" in await theirs["get_tag_by_id"].ainvoke({"tag_id": str(tag.id)})
+
+
+async def test_arguments_are_checked_as_the_api_checks_them(
+    db: AsyncSession, make_user: MakeUser
+) -> None:
+    user, _ = await make_user()
+    tools = _tools(db, user.id)
+
+    assert "non-negative" in await tools["get_insights"].ainvoke({"limit": -1})
+    assert "100" in await tools["get_insights"].ainvoke({"limit": 500})
+
+
+def _counting_tool(calls: list[dict], running: list[int], peak: list[int]) -> StructuredTool:
+    async def lookup(day: int) -> str:
+        calls.append({"day": day})
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        if day < 0:
+            raise ValueError("no such day")
+        return f"day {day}"
+
+    return StructuredTool.from_function(coroutine=lookup, name="lookup", description="A day")
+
+
+async def test_a_turn_runs_each_distinct_call_once_within_its_cap() -> None:
+    calls: list[dict] = []
+    running, peak = [0], [0]
+    (tool,) = for_turn([_counting_tool(calls, running, peak)], concurrency=2)
+
+    results = await asyncio.gather(*(tool.ainvoke({"day": day}) for day in [1, 2, 3, 1, 2]))
+    assert results == ["day 1", "day 2", "day 3", "day 1", "day 2"]
+    assert sorted(c["day"] for c in calls) == [1, 2, 3]
+    assert peak[0] == 2
+
+    assert await tool.ainvoke({"day": 3}) == "day 3"
+    assert len(calls) == 3
+
+
+async def test_a_failed_call_is_not_remembered() -> None:
+    calls: list[dict] = []
+    (tool,) = for_turn([_counting_tool(calls, [0], [0])], concurrency=2)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await tool.ainvoke({"day": -1})
+    assert len(calls) == 2
+
+
+async def test_a_wrapped_tool_keeps_its_artifacts_and_error_handling() -> None:
+    async def lookup(day: int) -> tuple[str, dict]:
+        if day < 0:
+            raise ToolException("no such day")
+        return f"day {day}", {"day": day}
+
+    (tool,) = for_turn(
+        [
+            StructuredTool.from_function(
+                coroutine=lookup,
+                name="lookup",
+                description="A day",
+                response_format="content_and_artifact",
+                handle_tool_error=True,
+            )
+        ],
+        concurrency=2,
+    )
+
+    def call(day: int) -> ToolCall:
+        return ToolCall(name="lookup", args={"day": day}, id=f"call-{day}", type="tool_call")
+
+    found = await tool.ainvoke(call(1))
+    assert (found.content, found.artifact, found.status) == ("day 1", {"day": 1}, "success")
+    missing = await tool.ainvoke(call(-1))
+    assert (missing.content, missing.status) == ("no such day", "error")
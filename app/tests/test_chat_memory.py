@@ -0,0 +1,208 @@
+"""The chat context budget, counted with a fake tokenizer: one token per word, and
+the summary run that folds what falls outside it, against a stub model."""
+
+import datetime as dt
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from langchain_core.messages import AIMessage, BaseMessage
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.memory import fit_history, summarize_chat, summary
+from app.ai.memory.budget import MESSAGE_OVERHEAD_TOKENS
+from app.ai.services import completions
+from app.ai.services.chats import ChatStore
+from app.core.config import redis
+from app.enums import RedisPrefix
+from app.models import Chat, ChatMessage, ChatModel
+from app.schemas import MessageSchema
+
+from .conftest import MakeUser
+
+
+class WordTokenizer:
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+
+def _turns(*pairs: tuple[str, str]) -> list[MessageSchema]:
+    return [
+        message
+        for question, answer in pairs
+        for message in (
+            MessageSchema(role="user", content=question),
+            MessageSchema(role="assistant", content=answer),
+        )
+    ]
+
+
+def _cost(*contents: str) -> int:
+    return sum(len(c.split()) + MESSAGE_OVERHEAD_TOKENS for c in contents)
+
+
+def test_a_history_within_budget_is_sent_whole() -> None:
+    messages = _turns(("hi there", "hello"), ("how are you", "fine thanks"))
+    older, recent = fit_history(messages, WordTokenizer(), budget=1_000)
+    assert older == []
+    assert recent == messages
+
+
+def test_the_latest_turns_that_fit_are_kept() -> None:
+    messages = _turns(("one two three", "four five six"), ("seven", "eight"))
+    question = MessageSchema(role="user", content="nine ten")
+    budget = _cost("seven", "eight", "nine ten")
+
+    older, recent = fit_history([*messages, question], WordTokenizer(), budget)
+
+    assert [m.content for m in recent] == ["seven", "eight", "nine ten"]
+    assert older == messages[:2]
+
+
+def test_the_kept_history_never_starts_with_a_reply() -> None:
+    messages = [
+        *_turns(("a long question indeed", "short")),
+        MessageSchema(role="user", content="next"),
+    ]
+    # Room for the reply and the new question, but not the question before them.
+    budget = _cost("short", "next")
+
+    older, recent = fit_history(messages, WordTokenizer(), budget)
+
+    assert [m.content for m in recent] == ["next"]
+    assert len(older) == 2
+
+
+def test_the_message_being_answered_is_kept_even_over_budget() -> None:
+    messages = [
+        *_turns(("earlier", "reply")),
+        MessageSchema(role="user", content="a question far longer than the budget allows"),
+    ]
+    older, recent = fit_history(messages, WordTokenizer(), budget=3)
+    assert [m.role for m in recent] == ["user"]
+    assert len(older) == 2
+
+
+class StubLLM:
+    """Answers every call with `reply` and keeps what it was sent."""
+
+    def __init__(self, reply: str) -> None:
+        self.reply = reply
+        self.calls: list[Sequence[BaseMessage]] = []
+
+    async def ainvoke(self, messages: Sequence[BaseMessage]) -> AIMessage:
+        self.calls.append(messages)
+        return AIMessage(content=self.reply)
+
+
+# Four turns of five-word messages; the budget after a run keeps only the last turn.
+TURNS = 4
+WORDS = "one two three four five"
+
+
+@pytest.fixture
+def llm(monkeypatch: pytest.MonkeyPatch, db: AsyncSession) -> StubLLM:
+    """`summarize_chat` on the test session, with the stub model and word tokenizer."""
+    stub = StubLLM("The user said one to five, four times.")
+
+    @asynccontextmanager
+    async def session() -> AsyncIterator[AsyncSession]:
+        yield db
+
+    async def default_chat_model(_: AsyncSession) -> ChatModel:
+        return ChatModel(label="Stub", name="stub")
+
+    monkeypatch.setattr(summary, "AsyncSessionLocal", session)
+    monkeypatch.setattr(summary, "build_chat_model", lambda _: stub)
+    monkeypatch.setattr(summary, "get_default_chat_model", default_chat_model)
+    monkeypatch.setattr(summary, "tokenizer_for", lambda _: WordTokenizer())
+    monkeypatch.setattr(completions, "tokenizer_for", lambda _: WordTokenizer())
+    monkeypatch.setattr(summary.settings, "chat_context_tokens", 4 * _cost(WORDS))
+    return stub
+
+
+@pytest_asyncio.fixture
+async def chat(db: AsyncSession, make_user: MakeUser) -> Chat:
+    user, _ = await make_user()
+    model = ChatModel(label="Test", name="test-model")
+    db.add(model)
+    await db.flush()
+    chat = Chat(user_id=user.id, model_id=model.id, title="long")
+    db.add(chat)
+    await db.flush()
+    start = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+    db.add_all(
+        ChatMessage(
+            chat_id=chat.id,
+            role=("user", "assistant")[n % 2],
+            content=WORDS,
+            created_at=start + dt.timedelta(seconds=n),
+        )
+        for n in range(2 * TURNS)
+    )
+    await db.flush()
+    return chat
+
+
+async def test_a_summary_run_folds_the_older_messages(
+    db: AsyncSession, chat: Chat, llm: StubLLM
+) -> None:
+    messages = await ChatStore(db).messages(chat.id)
+    lock = f"{RedisPrefix.chat_summary}{chat.id}"
+    await redis.set(lock, 1, ex=60)
+
+    await summarize_chat(chat.id)
+
+    await db.refresh(chat)
+    assert chat.summary == llm.reply
+    # Everything but the last turn, which still fits the budget.
+    assert chat.summary_until == messages[-3].created_at
+    [call] = llm.calls
+    assert "Current summary:\n(none)" in call[-1].content
+    assert call[-1].content.count(WORDS) == 2 * TURNS - 2
+    assert not await redis.exists(lock)
+
+
+async def test_a_run_that_was_overtaken_keeps_the_newer_summary(
+    db: AsyncSession, chat: Chat, llm: StubLLM, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    overtaken = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+
+    async def meanwhile(messages: Sequence[BaseMessage]) -> AIMessage:
+        # Another run stores its summary while this one waits on the model. Not
+        # synchronized, so the chat this run loaded keeps its old `summary_until`,
+        # as it would in the other run's session.
+        await db.execute(
+            update(Chat)
+            .where(Chat.id == chat.id)
+            .values(summary="newer", summary_until=overtaken)
+            .execution_options(synchronize_session=False)
+        )
+        return AIMessage(content="stale")
+
+    monkeypatch.setattr(llm, "ainvoke", meanwhile)
+    await summarize_chat(chat.id)
+
+    await db.refresh(chat)
+    assert chat.summary == "newer"
+    assert chat.summary_until == overtaken
+
+
+async def test_a_held_lock_queues_no_second_run(
+    db: AsyncSession, chat: Chat, llm: StubLLM, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    queued: list[str] = []
+    monkeypatch.setattr(completions.summarize_chat_task, "delay", queued.append)
+    messages = await ChatStore(db).messages(chat.id)
+    agent = completions.ChatAgent(db)
+    # A turn's budget is the whole context: the last two turns, so two are left over.
+    lock = f"{RedisPrefix.chat_summary}{chat.id}"
+    try:
+        await agent._within_budget(chat, messages)
+        await agent._within_budget(chat, messages)
+        assert queued == [str(chat.id)]
+        assert await redis.exists(lock)
+    finally:
+        await redis.delete(lock)
@@ -0,0 +1,195 @@
+"""Chat persistence below the API: messages, soft deletion and the archive that follows it."""
+
+import datetime as dt
+import json
+import zlib
+
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.services.chats import ChatStore, archive_deleted_chats
+from app.constants import CHAT_MESSAGE_WINDOW
+from app.core.config import redis
+from app.enums import RedisPrefix
+from app.models import Chat, ChatArchive, ChatMessage, ChatModel
+from app.schemas import MessageSchema
+
+from .conftest import MakeUser
+
+MESSAGES = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+
+
+def _messages(chat: Chat) -> list[ChatMessage]:
+    start = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+    return [
+        ChatMessage(chat_id=chat.id, created_at=start + dt.timedelta(seconds=n), **message)
+        for n, message in enumerate(MESSAGES)
+    ]
+
+
+async def test_archive_moves_only_chats_deleted_before_the_cutoff(
+    db: AsyncSession, make_user: MakeUser
+) -> None:
+    user, _ = await make_user()
+    model = ChatModel(label="Test", name="test-model")
+    db.add(model)
+    await db.flush()
+
+    now = dt.datetime.now(dt.UTC)
+    old = Chat(
+        user_id=user.id,
+        model_id=model.id,
+        title="old",
+        is_deleted=True,
+        deleted_at=now - dt.timedelta(days=60),
+    )
+    recent = Chat(
+        user_id=user.id,
+        model_id=model.id,
+        title="recent",
+        is_deleted=True,
+        deleted_at=now - dt.timedelta(days=1),
+    )
+    live = Chat(user_id=user.id, model_id=model.id, title="live")
+    db.add_all([old, recent, live])
+    await db.flush()
+    db.add_all([m for chat in (old, recent, live) for m in _messages(chat)])
+    await db.flush()
+
+    moved = await archive_deleted_chats(
+        db, deleted_before=now - dt.timedelta(days=30), batch_size=10
+    )
+    assert moved == 1
+
+    remaining = set(await db.scalars(select(Chat.id).where(Chat.user_id == user.id)))
+    assert remaining == {recent.id, live.id}
+
+    archived = await db.get(ChatArchive, old.id)
+    assert archived is not None
+    assert archived.title == "old"
+    assert archived.message_count == len(MESSAGES)
+    assert [
+        {"role": m["role"], "content": m["content"]}
+        for m in json.loads(zlib.decompress(archived.messages))
+    ] == MESSAGES
+    assert await db.scalar(select(ChatMessage.id).where(ChatMessage.chat_id == old.id)) is None
+
+
+async def test_deleting_twice_keeps_the_first_deletion_time(
+    db: AsyncSession, make_user: MakeUser
+) -> None:
+    user, _ = await make_user()
+    model = ChatModel(label="Test", name="test-model")
+    db.add(model)
+    await db.flush()
+    first_deleted_at = dt.datetime.now(dt.UTC) - dt.timedelta(days=5)
+    chat = Chat(
+        user_id=user.id,
+        model_id=model.id,
+        title="gone",
+        is_deleted=True,
+        deleted_at=first_deleted_at,
+    )
+    db.add(chat)
+    await db.flush()
+
+    await ChatStore(db).delete(chat.id, user.id)
+
+    deleted_at = await db.scalar(select(Chat.deleted_at).where(Chat.id == chat.id))
+    assert deleted_at == first_deleted_at
+
+
+async def test_a_turn_appends_and_the_detail_serves_the_latest_window(
+    db: AsyncSession, make_user: MakeUser
+) -> None:
+    user, _ = await make_user()
+    model = ChatModel(label="Test", name="test-model")
+    db.add(model)
+    await db.flush()
+    store = ChatStore(db)
+    chat = await store.create(user.id, model.id, title="long")
+
+    start = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+    for turn in range(CHAT_MESSAGE_WINDOW // 2 + 1):
+        sent = start + dt.timedelta(minutes=turn)
+        await store.append(
+            chat,
+            user.id,
+            [
+                MessageSchema(role="user", content=f"q{turn}", created_at=sent),
+                MessageSchema(
+                    role="assistant", content=f"a{turn}", created_at=sent + dt.timedelta(seconds=1)
+                ),
+            ],
+        )
+
+    history = await store.messages(chat.id)
+    assert len(history) == CHAT_MESSAGE_WINDOW + 2
+    assert [m.content for m in history[:2]] == ["q0", "a0"]
+
+    detail = await store.get(chat.id, user.id)
+    assert len(detail.messages) == CHAT_MESSAGE_WINDOW
+    assert detail.messages == history[2:]
+
+
+async def test_a_cached_chat_missing_its_messages_is_read_from_the_db(
+    db: AsyncSession, make_user: MakeUser
+) -> None:
+    user, _ = await make_user()
+    model = ChatModel(label="Test", name="test-model")
+    db.add(model)
+    await db.flush()
+    store = ChatStore(db)
+    chat = await store.create(user.id, model.id, title="evicted")
+    sent = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+    await store.append(chat, user.id, [MessageSchema(role="user", content="q", created_at=sent)])
+
+    cached = await store.get(chat.id, user.id)
+    assert [m.content for m in cached.messages] == ["q"]
+
+    # The header survives, the message list does not.
+    await redis.delete(f"{RedisPrefix.chat_messages}{chat.id}")
+    reread = await store.get(chat.id, user.id)
+    assert [m.content for m in reread.messages] == ["q"]
+
+
+async def test_message_pages_walk_back_to_the_start_of_the_chat(
+    client: AsyncClient, db: AsyncSession, make_user: MakeUser
+) -> None:
+    user, headers = await make_user()
+    _, other_headers = await make_user()
+    model = ChatModel(label="Test", name="test-model")
+    db.add(model)
+    await db.flush()
+    store = ChatStore(db)
+    chat = await store.create(user.id, model.id, title="paged")
+    # Two messages share a timestamp: the id keeps them apart.
+    sent = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+    times = [sent, sent, *(sent + dt.timedelta(seconds=n) for n in range(1, 4))]
+    await store.append(
+        chat,
+        user.id,
+        [MessageSchema(role="user", content=f"m{n}", created_at=t) for n, t in enumerate(times)],
+    )
+
+    detail = await client.get(f"/ai/chats/{chat.id}", headers=headers)
+    assert detail.json()["data"]["olderCursor"] is None
+
+    url = f"/ai/chats/{chat.id}/messages"
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        response = await client.get(url, headers=headers, params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()["data"]
+        seen = [m["content"] for m in page["messages"]] + seen
+        if page["olderCursor"] is None:
+            break
+        params["before"] = page["olderCursor"]
+    assert sorted(seen) == [f"m{n}" for n in range(5)]
+    assert seen[2:] == ["m2", "m3", "m4"]
+
+    assert (await client.get(url, headers=other_headers)).status_code == 404
+    bad = await client.get(url, headers=headers, params={"before": "not-a-cursor"})
+    assert bad.status_code == 400
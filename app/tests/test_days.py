@@ -1,14 +1,29 @@
 """Day CRUD through the API, including the paths that touch tags and starring."""
 
+import datetime as dt
+import json
 from typing import Any
 from uuid import UUID, uuid4
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import Text, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Day, Tag
+from app.core.settings import get_settings
+from app.models import (
+    ChatModel,
+    City,
+    Day,
+    Insight,
+    InsightType,
+    Suggestion,
+    Tag,
+    TrackableItem,
+    TrackableProgress,
+    TrackableType,
+)
+from app.schemas import DayDetail
 
 from .conftest import MakeUser
 
@@ -59,6 +74,28 @@ async def test_create_rejects_an_unknown_city(
     assert response.json()["detail"] == "City not found"
 
 
+async def test_create_names_the_missing_reference(
+    client: AsyncClient, auth_headers: dict[str, str], city_id: UUID
+) -> None:
+    # Validation and insert are one statement; the refusal must still say why.
+    unknown_item = {"trackableItemId": str(uuid4()), "value": 1}
+    response = await client.post(
+        f"/days/{TIMESTAMP}",
+        headers=auth_headers,
+        json=_payload(city_id, trackableProgresses=[unknown_item]),
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "One or more trackable items not found"
+
+    response = await client.post(
+        f"/days/{TIMESTAMP}", headers=auth_headers, json=_payload(city_id, tags=[str(uuid4())])
+    )
+    assert response.json()["detail"] == "One or more tags not found"
+
+    fetched = await client.get(f"/days/{TIMESTAMP}", headers=auth_headers)
+    assert fetched.status_code == 404, "a refused create left a day behind"
+
+
 async def test_unknown_day_is_a_404(client: AsyncClient, auth_headers: dict[str, str]) -> None:
     assert (await client.get("/days/1234567", headers=auth_headers)).status_code == 404
 
@@ -189,3 +226,485 @@ async def test_null_steps_does_not_break_the_listing(
 
     listing = await client.get("/days/", headers=auth_headers)
     assert listing.status_code == 200
+
+
+async def test_random_day_stays_inside_the_range(
+    client: AsyncClient,
+    db: AsyncSession,
+    user_id: UUID,
+    auth_headers: dict[str, str],
+    city_id: UUID,
+) -> None:
+    stamps = [TIMESTAMP + i * 86_400 for i in range(5)]
+    db.add_all(Day(timestamp=ts, user_id=user_id, city_id=city_id, content="") for ts in stamps)
+    await db.flush()
+
+    window = {"timestampStart": stamps[1], "timestampEnd": stamps[3]}
+    seen = set()
+    for _ in range(20):
+        response = await client.get("/days/random", headers=auth_headers, params=window)
+        assert response.status_code == 200, response.text
+        seen.add(response.json()["data"]["timestamp"])
+    assert seen <= set(stamps[1:4])
+
+
+async def test_random_day_with_an_empty_range_is_a_404(
+    client: AsyncClient, db: AsyncSession, make_user: MakeUser, city_id: UUID
+) -> None:
+    _, mine = await make_user()
+    other, _ = await make_user()
+    # Another user's day in the range must not be sampled for us.
+    db.add(Day(timestamp=TIMESTAMP, user_id=other.id, city_id=city_id, content=""))
+    await db.flush()
+
+    response = await client.get("/days/random", headers=mine)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "No days found in the given time range"
+
+
+async def _tagged_days(
+    client: AsyncClient, db: AsyncSession, user_id: UUID, headers: dict[str, str], city_id: UUID
+) -> tuple[Tag, Tag]:
+    work, travel = Tag(user_id=user_id, name="work"), Tag(user_id=user_id, name="travel")
+    db.add_all([work, travel])
+    await db.flush()
+    for offset, tags in enumerate([[work], [travel], [work, travel], []]):
+        await client.post(
+            f"/days/{TIMESTAMP + offset}",
+            headers=headers,
+            json=_payload(city_id, tags=[str(t.id) for t in tags]),
+        )
+    return work, travel
+
+
+async def _listed(client: AsyncClient, headers: dict[str, str], **params: str) -> set[int]:
+    listing = await client.get("/days/", headers=headers, params=params)
+    assert listing.status_code == 200, listing.text
+    return {d["timestamp"] for d in listing.json()["data"]}
+
+
+async def test_tag_filter_matches_all_or_any(
+    client: AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    user_id: UUID,
+    city_id: UUID,
+) -> None:
+    await _tagged_days(client, db, user_id, auth_headers, city_id)
+
+    assert await _listed(client, auth_headers, tagNames="work,travel") == {TIMESTAMP + 2}
+    assert await _listed(client, auth_headers, tagNames="work,travel", tagMatch="any") == {
+        TIMESTAMP,
+        TIMESTAMP + 1,
+        TIMESTAMP + 2,
+    }
+    assert await _listed(client, auth_headers, tagNames="work,unknown") == set()
+
+
+async def test_tag_filter_follows_renames_and_deletes(
+    client: AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    user_id: UUID,
+    city_id: UUID,
+) -> None:
+    work, travel = await _tagged_days(client, db, user_id, auth_headers, city_id)
+
+    await client.put(f"/tags/{work.id}", headers=auth_headers, json={"name": "job"})
+    assert await _listed(client, auth_headers, tagNames="job") == {TIMESTAMP, TIMESTAMP + 2}
+
+    await client.delete(f"/tags/{travel.id}", headers=auth_headers)
+    day = await db.scalar(select(Day).where(Day.timestamp == TIMESTAMP + 2, Day.user_id == user_id))
+    assert day is not None
+    await db.refresh(day)
+    assert day.tag_ids == [work.id]
+
+
+async def test_bulk_creates_the_valid_days_and_reports_the_rest(
+    client: AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    user_id: UUID,
+    city_id: UUID,
+) -> None:
+    tag = Tag(user_id=user_id, name="imported")
+    db.add(tag)
+    await db.flush()
+    await client.post(f"/days/{TIMESTAMP}", headers=auth_headers, json=_payload(city_id))
+
+    body = [
+        {"timestamp": TIMESTAMP + 1, **_payload(city_id, tags=[str(tag.id)])},
+        {"timestamp": TIMESTAMP, **_payload(city_id)},
+        {"timestamp": TIMESTAMP + 2, **_payload(uuid4())},
+        {"timestamp": TIMESTAMP + 3},
+        {"timestamp": TIMESTAMP + 1, **_payload(city_id)},
+    ]
+    response = await client.post("/days/bulk", headers=auth_headers, json=body)
+    assert response.status_code == 200, response.text
+
+    results = response.json()["data"]
+    assert [r["created"] for r in results] == [True, False, False, False, False]
+    assert results[1]["error"] == "Day already exists"
+    assert results[2]["error"] == "City not found"
+    assert results[3]["error"].startswith("Invalid day")
+    assert results[4]["error"] == "Day already exists"
+
+    fetched = await client.get(f"/days/{TIMESTAMP + 1}", headers=auth_headers)
+    assert [t["name"] for t in fetched.json()["data"]["tags"]] == ["imported"]
+
+
+async def test_bulk_refuses_days_outside_the_allowed_years(
+    client: AsyncClient, auth_headers: dict[str, str], city_id: UUID
+) -> None:
+    body = [
+        {"timestamp": TIMESTAMP, **_payload(city_id)},
+        {"timestamp": -(2**40), **_payload(city_id)},
+        {"timestamp": -2_000_000_000, **_payload(city_id)},
+    ]
+    response = await client.post("/days/bulk", headers=auth_headers, json=body)
+    assert response.status_code == 200, response.text
+
+    results = response.json()["data"]
+    assert [r["created"] for r in results] == [True, False, False]
+    assert "out of range" in results[1]["error"]
+    assert "between 1970" in results[2]["error"]
+
+
+async def test_bulk_accepts_ndjson(
+    client: AsyncClient, auth_headers: dict[str, str], city_id: UUID
+) -> None:
+    lines = [
+        json.dumps({"timestamp": TIMESTAMP + offset, **_payload(city_id)}) for offset in range(3)
+    ]
+    response = await client.post(
+        "/days/bulk",
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        content="\n".join(lines),
+    )
+    assert response.status_code == 200, response.text
+    assert all(r["created"] for r in response.json()["data"])
+
+    listing = await client.get("/days/", headers=auth_headers)
+    assert len(listing.json()["data"]) == 3
+
+
+async def test_update_rewrites_only_the_progress_that_changed(
+    client: AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    user_id: UUID,
+    city_id: UUID,
+) -> None:
+    kind = TrackableType(user_id=user_id, name="kind", value_type="number")
+    db.add(kind)
+    await db.flush()
+    kept, changed, dropped = (
+        TrackableItem(user_id=user_id, type_id=kind.id, title=title)
+        for title in ("kept", "changed", "dropped")
+    )
+    db.add_all([kept, changed, dropped])
+    await db.flush()
+
+    def progress(item: TrackableItem, value: float) -> dict[str, Any]:
+        return {"trackableItemId": str(item.id), "value": value}
+
+    await client.post(
+        f"/days/{TIMESTAMP}",
+        headers=auth_headers,
+        json=_payload(
+            city_id,
+            trackableProgresses=[progress(kept, 1), progress(changed, 2), progress(dropped, 3)],
+        ),
+    )
+
+    async def rows() -> dict[UUID, tuple[UUID, float]]:
+        result = await db.execute(
+            select(
+                TrackableProgress.trackable_item_id, TrackableProgress.id, TrackableProgress.value
+            ).where(TrackableProgress.user_id == user_id, TrackableProgress.timestamp == TIMESTAMP)
+        )
+        return {item_id: (row_id, value) for item_id, row_id, value in result}
+
+    before = await rows()
+    updated = await client.put(
+        f"/days/{TIMESTAMP}",
+        headers=auth_headers,
+        json={"trackableProgresses": [progress(kept, 1), progress(changed, 5)]},
+    )
+    assert updated.status_code == 200, updated.text
+
+    after = await rows()
+    assert after.keys() == {kept.id, changed.id}
+    assert after[kept.id] == before[kept.id], "an unchanged progress row was rewritten"
+    assert after[changed.id] == (before[changed.id][0], 5)
+
+
+async def test_update_refuses_unknown_trackable_items(
+    client: AsyncClient, auth_headers: dict[str, str], city_id: UUID
+) -> None:
+    await client.post(f"/days/{TIMESTAMP}", headers=auth_headers, json=_payload(city_id))
+
+    updated = await client.put(
+        f"/days/{TIMESTAMP}",
+        headers=auth_headers,
+        json={"trackableProgresses": [{"trackableItemId": str(uuid4()), "value": 1}]},
+    )
+    assert updated.status_code == 404
+    assert updated.json()["detail"] == "One or more trackable items not found"
+
+
+async def test_a_day_is_stored_in_its_years_partition(
+    client: AsyncClient, auth_headers: dict[str, str], city_id: UUID, db: AsyncSession
+) -> None:
+    created = await client.post(f"/days/{TIMESTAMP}", headers=auth_headers, json=_payload(city_id))
+    assert created.status_code == 200, created.text
+
+    partition = await db.scalar(
+        select(literal_column("tableoid::regclass::text", Text)).where(Day.timestamp == TIMESTAMP)
+    )
+    assert partition == "days_2023"
+
+
+async def test_a_day_is_partitioned_by_the_year_of_its_noon(
+    client: AsyncClient, auth_headers: dict[str, str], city_id: UUID, db: AsyncSession
+) -> None:
+    # Midnight of 1 January 2024 at UTC+4: still 2023 in UTC, but a 2024 day.
+    new_year = 1_704_052_800
+    created = await client.post(f"/days/{new_year}", headers=auth_headers, json=_payload(city_id))
+    assert created.status_code == 200, created.text
+
+    partition = await db.scalar(
+        select(literal_column("tableoid::regclass::text", Text)).where(Day.timestamp == new_year)
+    )
+    assert partition == "days_2024"
+
+
+@pytest.mark.parametrize("timestamp", [-(2**40), 2**31, -2_000_000_000, 2_100_000_000])
+async def test_a_day_outside_the_allowed_years_is_refused(
+    client: AsyncClient, auth_headers: dict[str, str], city_id: UUID, timestamp: int
+) -> None:
+    created = await client.post(f"/days/{timestamp}", headers=auth_headers, json=_payload(city_id))
+    assert created.status_code == 400
+
+
+async def test_country_filter_uses_the_days_city(
+    client: AsyncClient, db: AsyncSession, auth_headers: dict[str, str], city_id: UUID
+) -> None:
+    await client.post(f"/days/{TIMESTAMP}", headers=auth_headers, json=_payload(city_id))
+    country_id = await db.scalar(select(City.country_id).where(City.id == city_id))
+
+    filters = json.dumps({"countryId": str(country_id)})
+    assert await _listed(client, auth_headers, filters=filters) == {TIMESTAMP}
+    filters = json.dumps({"countryId": str(uuid4())})
+    assert await _listed(client, auth_headers, filters=filters) == set()
+
+
+async def test_detail_views_group_progress_by_type(
+    client: AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    user_id: UUID,
+    city_id: UUID,
+) -> None:
+    sport = TrackableType(user_id=user_id, name="sport", value_type="number")
+    reading = TrackableType(user_id=user_id, name="reading", value_type="number")
+    db.add_all([sport, reading])
+    await db.flush()
+    run, swim, book = (
+        TrackableItem(user_id=user_id, type_id=kind.id, title=title)
+        for kind, title in ((sport, "run"), (sport, "swim"), (reading, "book"))
+    )
+    db.add_all([run, swim, book])
+    await db.flush()
+    await client.post(
+        f"/days/{TIMESTAMP}",
+        headers=auth_headers,
+        json=_payload(
+            city_id,
+            trackableProgresses=[
+                {"trackableItemId": str(item.id), "value": 1} for item in (run, book, swim)
+            ],
+        ),
+    )
+
+    single = await client.get(f"/days/{TIMESTAMP}", headers=auth_headers)
+    listing = await client.get("/days/", headers=auth_headers, params={"view": "detail"})
+    assert single.status_code == 200, single.text
+    assert listing.status_code == 200, listing.text
+
+    for day in (single.json()["data"], listing.json()["data"][0]):
+        grouped = {
+            group["type"]["name"]: {p["trackableItem"]["title"] for p in group["progresses"]}
+            for group in day["trackableProgresses"]
+        }
+        assert grouped == {"sport": {"run", "swim"}, "reading": {"book"}}
+        assert day["insights"] == []
+
+
+def _canonical(detail: DayDetail) -> DayDetail:
+    """Collections in a fixed order; neither rendering path promises one."""
+    groups = sorted(detail.trackable_progresses, key=lambda g: g.type.id)
+    return detail.model_copy(
+        update={
+            "tags": sorted(detail.tags or [], key=lambda t: t.id),
+            "trackable_progresses": [
+                g.model_copy(
+                    update={"progresses": sorted(g.progresses, key=lambda p: p.trackable_item.id)}
+                )
+                for g in groups
+            ],
+            "insights": sorted(detail.insights or [], key=lambda i: i.id),
+            "suggestions": sorted(detail.suggestions or [], key=lambda s: s.id),
+        }
+    )
+
+
+async def test_sql_rendering_matches_the_orm_path(
+    client: AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    user_id: UUID,
+    city_id: UUID,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sport = TrackableType(user_id=user_id, name="sport", value_type="number")
+    reading = TrackableType(user_id=user_id, name="reading", value_type="number", meta_schema={})
+    model = ChatModel(label="Test", name="test-model")
+    insight_type = InsightType(name="weekly", duration=dt.timedelta(days=7))
+    db.add_all([sport, reading, model, insight_type])
+    await db.flush()
+    items = [
+        TrackableItem(user_id=user_id, type_id=kind.id, title=title, meta={"unit": "min"})
+        for kind, title in ((sport, "run"), (sport, "swim"), (reading, "book"))
+    ]
+    tags = [Tag(user_id=user_id, name=name, color="#fff") for name in ("work", "travel")]
+    db.add_all([*items, *tags])
+    await db.flush()
+
+    await client.post(
+        f"/days/{TIMESTAMP}",
+        headers=auth_headers,
+        json=_payload(
+            city_id,
+            images=["days/a.jpg"],
+            tags=[str(tag.id) for tag in tags],
+            trackableProgresses=[
+                {"trackableItemId": str(item.id), "value": 1.5, "description": "x"}
+                for item in items
+            ],
+        ),
+    )
+    await client.post(f"/days/{TIMESTAMP + 86_400}", headers=auth_headers, json=_payload(city_id))
+    db.add_all(
+        [
+            Insight(
+                user_id=user_id,
+                model_id=model.id,
+                insight_type_id=insight_type.id,
+                timestamp=TIMESTAMP,
+                date_begin=dt.date(2023, 11, 8),
+                description="up",
+                content="more steps",
+            ),
+            Suggestion(
+                user_id=user_id,
+                model_id=model.id,
+                timestamp=TIMESTAMP,
+                date=dt.date(2023, 11, 15),
+                description="walk",
+                content="go outside",
+            ),
+        ]
+    )
+    await db.flush()
+
+    async def fetch(sql: bool) -> tuple[dict[str, Any], dict[str, Any]]:
+        monkeypatch.setattr(get_settings(), "days_sql_rendering", sql)
+        one = await client.get(f"/days/{TIMESTAMP}", headers=auth_headers)
+        page = await client.get("/days/", headers=auth_headers, params={"view": "detail"})
+        assert one.status_code == 200, one.text
+        assert page.status_code == 200, page.text
+        return one.json(), page.json()
+
+    (orm_one, orm_page), (sql_one, sql_page) = await fetch(sql=False), await fetch(sql=True)
+
+    assert {k: v for k, v in sql_one.items() if k != "data"} == {
+        k: v for k, v in orm_one.items() if k != "data"
+    }
+    assert _canonical(DayDetail.model_validate(sql_one["data"])) == _canonical(
+        DayDetail.model_validate(orm_one["data"])
+    )
+    assert [d["timestamp"] for d in sql_page["data"]] == [d["timestamp"] for d in orm_page["data"]]
+    assert [_canonical(DayDetail.model_validate(d)) for d in sql_page["data"]] == [
+        _canonical(DayDetail.model_validate(d)) for d in orm_page["data"]
+    ]
+
+
+async def test_fields_return_only_what_was_asked_for(
+    client: AsyncClient, auth_headers: dict[str, str], city_id: UUID
+) -> None:
+    await client.post(
+        f"/days/{TIMESTAMP}", headers=auth_headers, json=_payload(city_id, steps=4321)
+    )
+
+    calendar = await client.get("/days/", headers=auth_headers, params={"fields": "starred,steps"})
+    assert calendar.status_code == 200, calendar.text
+    assert calendar.json()["data"] == [{"timestamp": TIMESTAMP, "starred": False, "steps": 4321}]
+
+    with_city = await client.get("/days/", headers=auth_headers, params={"fields": "city"})
+    assert with_city.status_code == 200, with_city.text
+    [day] = with_city.json()["data"]
+    assert set(day) == {"timestamp", "city"}
+    assert day["city"]["id"] == str(city_id)
+    assert "country" in day["city"]
+
+    unknown = await client.get("/days/", headers=auth_headers, params={"fields": "steps,secret"})
+    assert unknown.status_code == 400
+
+
+async def test_normalized_pages_list_each_entity_once(
+    client: AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    user_id: UUID,
+    city_id: UUID,
+) -> None:
+    sport = TrackableType(user_id=user_id, name="sport", value_type="number")
+    db.add(sport)
+    await db.flush()
+    run = TrackableItem(user_id=user_id, type_id=sport.id, title="run")
+    tag = Tag(user_id=user_id, name="work")
+    db.add_all([run, tag])
+    await db.flush()
+    for timestamp in (TIMESTAMP, TIMESTAMP + 86_400):
+        await client.post(
+            f"/days/{timestamp}",
+            headers=auth_headers,
+            json=_payload(
+                city_id,
+                tags=[str(tag.id)],
+                trackableProgresses=[{"trackableItemId": str(run.id), "value": 2}],
+            ),
+        )
+
+    listing = await client.get("/days/", headers=auth_headers, params={"normalized": "true"})
+    assert listing.status_code == 200, listing.text
+    data = listing.json()["data"]
+    assert [day["cityId"] for day in data["days"]] == [str(city_id)] * 2
+    assert [day["trackableProgresses"] for day in data["days"]] == [
+        [{"value": 2.0, "description": None, "trackableItemId": str(run.id)}]
+    ] * 2
+    entities = data["entities"]
+    assert set(entities["cities"]) == {str(city_id)}
+    assert "country" in entities["cities"][str(city_id)]
+    assert set(entities["trackableItems"]) == {str(run.id)}
+    assert set(entities["trackableTypes"]) == {str(sport.id)}
+    assert entities["tags"] == {}
+
+    detail = await client.get(
+        "/days/", headers=auth_headers, params={"normalized": "true", "view": "detail"}
+    )
+    assert detail.status_code == 200, detail.text
+    data = detail.json()["data"]
+    assert [day["tagIds"] for day in data["days"]] == [[str(tag.id)]] * 2
+    assert set(data["entities"]["tags"]) == {str(tag.id)}
@@ -0,0 +1,51 @@
+"""The NDJSON account export.
+
+Read line by line the way a client would: the body is a stream, and every line
+has to parse on its own.
+"""
+
+import json
+from uuid import UUID
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Day, Tag
+
+from .conftest import MakeUser
+
+TIMESTAMP = 1_700_000_000
+
+
+async def test_export_streams_only_the_callers_rows(
+    client: AsyncClient, db: AsyncSession, make_user: MakeUser, city_id: UUID
+) -> None:
+    me, mine = await make_user()
+    other, _ = await make_user()
+    tag = Tag(user_id=me.id, name="exported")
+    db.add(tag)
+    await db.flush()
+    await client.post(
+        f"/days/{TIMESTAMP}",
+        headers=mine,
+        json={"cityId": str(city_id), "content": "mine", "tags": [str(tag.id)]},
+    )
+    db.add(Day(timestamp=TIMESTAMP, user_id=other.id, city_id=city_id, content="theirs"))
+    await db.flush()
+
+    async with client.stream("GET", "/export/", headers=mine) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) async for line in response.aiter_lines() if line]
+
+    assert records[0]["type"] == "export"
+    assert records[0]["user_id"] == str(me.id)
+    by_type: dict[str, list[dict]] = {}
+    for record in records[1:]:
+        by_type.setdefault(record["type"], []).append(record["data"])
+
+    assert [d["content"] for d in by_type["day"]] == ["mine"]
+    assert [t["name"] for t in by_type["tag"]] == ["exported"]
+    assert by_type["day_tag"] == [
+        {"day_timestamp": TIMESTAMP, "user_id": str(me.id), "tag_id": str(tag.id)}
+    ]
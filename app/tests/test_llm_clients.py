@@ -0,0 +1,76 @@
+"""Built chat model clients, reused per catalog row and dropped when the row changes."""
+
+from collections.abc import Iterator
+from uuid import uuid4
+
+import pytest
+
+from app.ai import utils
+from app.enums.provider import Provider
+from app.models import ChatModel
+
+
+def _row(name: str = "gpt-4o-mini", provider: Provider = Provider.openai) -> ChatModel:
+    return ChatModel(id=uuid4(), label=name, name=name, provider=provider.value, region=None)
+
+
+@pytest.fixture(autouse=True)
+def vertex(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(utils.settings, "llm_mode", "vertex")
+    monkeypatch.setattr(utils.settings, "gcp_project_id", "memoryful-test")
+    utils.invalidate_chat_models()
+    yield
+    utils.invalidate_chat_models()
+
+
+def test_a_row_gets_the_same_client_until_it_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    row = _row()
+    llm = utils.build_chat_model(row)
+    assert utils.build_chat_model(row) is llm
+
+    monkeypatch.setattr(utils.settings, "default_temperature", 0.9)
+    warmer = utils.build_chat_model(row)
+    assert warmer is not llm
+
+    row.region = "us-east5"
+    moved = utils.build_chat_model(row)
+    assert moved is not llm
+    assert moved is not warmer
+
+
+def test_invalidation_drops_only_the_given_rows() -> None:
+    first, second = _row(), _row("gpt-5.4-nano")
+    kept = utils.build_chat_model(second)
+    dropped = utils.build_chat_model(first)
+
+    utils.invalidate_chat_models([first.id])
+    assert utils.build_chat_model(first) is not dropped
+    assert utils.build_chat_model(second) is kept
+
+
+def test_the_least_recently_used_client_goes_first(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(utils.settings, "llm_client_cache_size", 2)
+    first, second, third = _row("a"), _row("b"), _row("c")
+    kept = utils.build_chat_model(first)
+    evicted = utils.build_chat_model(second)
+    utils.build_chat_model(first)
+    utils.build_chat_model(third)
+
+    assert utils.build_chat_model(first) is kept
+    assert utils.build_chat_model(second) is not evicted
+
+
+async def test_vertex_maas_clients_ask_for_the_token_per_request(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    tokens = iter(["first", "second"])
+
+    async def token() -> str:
+        return next(tokens)
+
+    monkeypatch.setattr(utils.vertex_tokens, "token", token)
+    llm = utils.build_chat_model(_row("xai/grok-4.1-fast-non-reasoning", Provider.xai))
+
+    api_key = llm.openai_api_key  # type: ignore[attr-defined]
+    assert await api_key() == "first"
+    assert await api_key() == "second"
@@ -0,0 +1,199 @@
+"""MCP tool loading and the session pool, against fake MCP sessions."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from typing import Any, ClassVar, cast
+
+import httpx
+import pytest
+from mcp import ClientSession
+from mcp.types import CallToolResult, ListToolsResult, TextContent, Tool
+
+from app.ai import mcp, mcp_pool
+
+
+class FakeSession:
+    def __init__(self, server: "FakeServer", access_token: str) -> None:
+        self.server = server
+        self.access_token = access_token
+
+    async def list_tools(self, cursor: str | None = None) -> ListToolsResult:
+        self.server.listings += 1
+        return ListToolsResult(
+            tools=[Tool(name="get_tags", inputSchema={"type": "object", "properties": {}})]
+        )
+
+    async def call_tool(self, name: str, arguments: dict[str, Any], **_: object) -> CallToolResult:
+        self.server.calls.append((name, self.access_token))
+        return CallToolResult(content=[TextContent(type="text", text="[]")])
+
+
+class FakeServer:
+    """Stands in for the session pool: one fake session per bearer."""
+
+    def __init__(self) -> None:
+        self.listings = 0
+        self.calls: list[tuple[str, str]] = []
+
+    @asynccontextmanager
+    async def session(self, access_token: str) -> AsyncIterator[FakeSession]:
+        yield FakeSession(self, access_token)
+
+    async def call_tool(
+        self, access_token: str, name: str, arguments: dict, **kwargs: object
+    ) -> CallToolResult:
+        return await FakeSession(self, access_token).call_tool(name, arguments, **kwargs)
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeServer]:
+    server = FakeServer()
+    monkeypatch.setattr(mcp, "get_mcp_pool", lambda: server)
+    mcp.invalidate_mcp_tools()
+    yield server
+    mcp.invalidate_mcp_tools()
+
+
+async def test_tools_are_listed_once_and_called_with_each_users_bearer(
+    server: FakeServer,
+) -> None:
+    alice = await mcp.load_mcp_tools("alice")
+    bob = await mcp.load_mcp_tools("bob")
+
+    assert server.listings == 1
+    assert [t.name for t in alice] == [t.name for t in bob] == ["get_tags"]
+
+    await bob[0].ainvoke({})
+    await alice[0].ainvoke({})
+    assert server.calls == [("get_tags", "bob"), ("get_tags", "alice")]
+
+
+async def test_an_expired_or_invalidated_listing_is_fetched_again(
+    server: FakeServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await mcp.load_mcp_tools("alice")
+    mcp.invalidate_mcp_tools()
+    await mcp.load_mcp_tools("alice")
+    assert server.listings == 2
+
+    monkeypatch.setattr(mcp.settings, "mcp_tools_ttl_seconds", 0)
+    await mcp.load_mcp_tools("alice")
+    assert server.listings == 3
+
+
+class HeldSession:
+    """A pooled `_Session` without a connection; `drop()` plays a lost connection."""
+
+    opened: ClassVar[list[str]] = []
+
+    def __init__(self, url: str, client: httpx.AsyncClient) -> None:
+        self.access_token = client.headers["Authorization"].removeprefix("Bearer ")
+        self.last_used = time.monotonic()
+        self.busy = 0
+        self.retired = False
+        self.alive = True
+        self.closed = False
+        HeldSession.opened.append(self.access_token)
+
+    async def session(self) -> ClientSession:
+        return cast("ClientSession", FakeSession(FakeServer(), self.access_token))
+
+    def drop(self) -> None:
+        self.alive = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch: pytest.MonkeyPatch) -> mcp_pool.MCPSessionPool:
+    HeldSession.opened = []
+    monkeypatch.setattr(mcp_pool, "_Session", HeldSession)
+    return mcp_pool.MCPSessionPool("http://mcp.test/mcp", size=2)
+
+
+async def _use(pool: mcp_pool.MCPSessionPool, access_token: str) -> HeldSession:
+    held = await pool._checkout(access_token)
+    await pool._release(held)
+    assert isinstance(held, HeldSession)
+    return held
+
+
+async def test_the_pool_reuses_a_users_session_and_closes_the_least_recently_used(
+    pool: mcp_pool.MCPSessionPool,
+) -> None:
+    alice = await _use(pool, "alice")
+    assert await _use(pool, "alice") is alice
+    bob = await _use(pool, "bob")
+    await _use(pool, "alice")
+    await _use(pool, "carol")
+
+    assert HeldSession.opened == ["alice", "bob", "carol"]
+    assert bob.closed and not alice.closed
+
+
+async def test_a_session_in_use_is_closed_only_once_its_calls_return(
+    pool: mcp_pool.MCPSessionPool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    alice = await pool._checkout("alice")
+    assert isinstance(alice, HeldSession)
+    await _use(pool, "bob")
+    await _use(pool, "carol")
+    # A tuple, so mypy does not narrow `closed` to False for the asserts below.
+    assert (alice.retired, alice.closed) == (True, False)
+
+    await pool._release(alice)
+    assert alice.closed
+
+    monkeypatch.setattr(mcp_pool.settings, "mcp_pool_idle_seconds", 60)
+    dave = await pool._checkout("dave")
+    assert isinstance(dave, HeldSession)
+    dave.last_used -= 120
+    await _use(pool, "erin")
+    assert not dave.closed
+    assert "dave" in pool._sessions
+
+
+async def test_a_dropped_session_is_reopened(pool: mcp_pool.MCPSessionPool) -> None:
+    first = await _use(pool, "alice")
+    first.drop()
+    second = await _use(pool, "alice")
+
+    assert second is not first
+    assert first.closed
+    assert HeldSession.opened == ["alice", "alice"]
+
+
+async def test_concurrent_calls_share_one_session(pool: mcp_pool.MCPSessionPool) -> None:
+    await asyncio.gather(*(pool.call_tool("alice", "get_tags", {}) for _ in range(5)))
+    assert HeldSession.opened == ["alice"]
+
+
+async def test_a_call_that_loses_its_session_is_retried_once_on_a_new_one(
+    pool: mcp_pool.MCPSessionPool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    errors: list[Exception] = []
+    call_tool = FakeSession.call_tool
+
+    async def flaky(
+        self: FakeSession, name: str, arguments: dict, **kwargs: object
+    ) -> CallToolResult:
+        if errors:
+            raise errors.pop()
+        return await call_tool(self, name, arguments, **kwargs)
+
+    monkeypatch.setattr(FakeSession, "call_tool", flaky)
+    first = await _use(pool, "alice")
+
+    errors.append(httpx.ConnectError("connection reset"))
+    result = await pool.call_tool("alice", "get_tags", {})
+    assert result.content == [TextContent(type="text", text="[]")]
+    assert first.closed
+    assert HeldSession.opened == ["alice", "alice"]
+
+    errors.extend([httpx.ConnectError("connection reset")] * 2)
+    with pytest.raises(httpx.ConnectError):
+        await pool.call_tool("alice", "get_tags", {})
+    assert HeldSession.opened == ["alice", "alice", "alice"]
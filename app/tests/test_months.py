@@ -1,7 +1,8 @@
-"""Month CRUD.
+"""Month CRUD, and the `month_stats` rollup that rides along with it.
 
 A month is keyed by (user_id, year, month) rather than an id, so create and update
-address the row through the body instead of the path.
+address the row through the body instead of the path. Its stats are written by the
+day routes, so those tests drive days and read the month back.
 """
 
 from typing import Any
@@ -14,8 +15,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants import CACHE_PREFIX
 from app.core.config import redis
+from app.core.rollups import month_of, rebuild_month_stats
 from app.enums import CacheNamespace
-from app.models import Month
+from app.models import Month, MonthStats, Tag, TrackableItem, TrackableType
 
 from .conftest import MakeUser
 
@@ -23,6 +25,7 @@ YEAR = 2019
 MONTH = 4
 # top_day_timestamp is floored to the start of its day by a validator on MonthBase.
 MIDNIGHT = 1_699_920_000
+APRIL_10 = 1_554_854_400  # 2019-04-10 00:00 UTC
 
 
 def _payload(**overrides: Any) -> dict[str, Any]:
@@ -163,3 +166,148 @@ async def test_an_unresolvable_background_does_not_break_the_year(
     assert created.status_code in (200, 400, 403)
 
     assert (await client.get(f"/months/{YEAR}", headers=auth_headers)).status_code == 200
+
+
+def test_a_day_belongs_to_the_month_of_its_local_date() -> None:
+    # Local midnight of April 1st at UTC+2 is still March 31st in UTC.
+    assert month_of(1_554_069_600) == (2019, 4)
+    # ...and at UTC-10 it is already 10:00 on the same date.
+    assert month_of(APRIL_10 + 10 * 60 * 60) == (2019, 4)
+
+
+async def test_month_stats_follow_day_writes(
+    client: AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    user_id: UUID,
+    city_id: UUID,
+) -> None:
+    tag = Tag(user_id=user_id, name="walk")
+    db.add(tag)
+    await db.flush()
+    await client.post("/months/", headers=auth_headers, json=_payload())
+
+    day = {"cityId": str(city_id), "content": "", "steps": 4000, "tags": [str(tag.id)]}
+    await client.post(f"/days/{APRIL_10}", headers=auth_headers, json=day)
+    await client.post(f"/days/{APRIL_10 + 86_400}", headers=auth_headers, json=day)
+    await client.patch(f"/days/{APRIL_10}/toggle-starred", headers=auth_headers)
+    await client.put(f"/days/{APRIL_10}", headers=auth_headers, json={"steps": 1000, "tags": []})
+
+    listing = await client.get(f"/months/{YEAR}", headers=auth_headers)
+    assert listing.status_code == 200, listing.text
+    stats = listing.json()["data"][0]["stats"]
+    assert stats["dayCount"] == 2
+    assert stats["stepsTotal"] == 5000
+    assert stats["avgSteps"] == 2500
+    assert stats["starredCount"] == 1
+    assert stats["tagCounts"] == {str(tag.id): 1}
+
+    await client.delete(f"/tags/{tag.id}", headers=auth_headers)
+    listing = await client.get(f"/months/{YEAR}", headers=auth_headers)
+    assert listing.json()["data"][0]["stats"]["tagCounts"] == {}
+
+
+async def _trackable_item(db: AsyncSession, user_id: UUID) -> TrackableItem:
+    kind = TrackableType(user_id=user_id, name="kind", value_type="number")
+    db.add(kind)
+    await db.flush()
+    item = TrackableItem(user_id=user_id, type_id=kind.id, title="reading")
+    db.add(item)
+    await db.flush()
+    return item
+
+
+async def test_progress_that_cancels_out_leaves_no_residue(
+    client: AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    user_id: UUID,
+    city_id: UUID,
+) -> None:
+    item = await _trackable_item(db, user_id)
+    await client.post("/months/", headers=auth_headers, json=_payload())
+    # 0.1 + 0.2 - 0.1 - 0.2 is 4e-17 rather than 0 in floats.
+    for offset, value in enumerate([0.1, 0.2]):
+        await client.post(
+            f"/days/{APRIL_10 + offset * 86_400}",
+            headers=auth_headers,
+            json={
+                "cityId": str(city_id),
+                "content": "",
+                "trackableProgresses": [{"trackableItemId": str(item.id), "value": value}],
+            },
+        )
+    for offset in range(2):
+        await client.put(
+            f"/days/{APRIL_10 + offset * 86_400}",
+            headers=auth_headers,
+            json={"trackableProgresses": []},
+        )
+
+    listing = await client.get(f"/months/{YEAR}", headers=auth_headers)
+    assert listing.json()["data"][0]["stats"]["progressTotals"] == {}
+
+
+async def test_deleting_a_trackable_item_drops_its_progress_totals(
+    client: AsyncClient, db: AsyncSession, auth_headers: dict[str, str], user_id: UUID
+) -> None:
+    item = await _trackable_item(db, user_id)
+    db.add(
+        MonthStats(
+            user_id=user_id,
+            year=YEAR,
+            month=MONTH,
+            day_count=0,
+            steps_total=0,
+            steps_day_count=0,
+            starred_count=0,
+            progress_totals={str(item.id): 1e-12},
+            tag_counts={},
+        )
+    )
+    await db.flush()
+
+    deleted = await client.delete(f"/trackables/{item.id}", headers=auth_headers)
+    assert deleted.status_code == 200, deleted.text
+
+    db.expire_all()
+    stats = await db.scalar(select(MonthStats).where(MonthStats.user_id == user_id))
+    assert stats is not None
+    assert stats.progress_totals == {}
+
+
+async def test_rebuild_agrees_with_the_incremental_rollup(
+    client: AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    user_id: UUID,
+    city_id: UUID,
+) -> None:
+    tag = Tag(user_id=user_id, name="walk")
+    db.add(tag)
+    await db.flush()
+    for offset, steps in enumerate([100, 200, 300]):
+        await client.post(
+            f"/days/{APRIL_10 + offset * 86_400}",
+            headers=auth_headers,
+            json={"cityId": str(city_id), "content": "", "steps": steps, "tags": [str(tag.id)]},
+        )
+    await client.patch(f"/days/{APRIL_10}/toggle-starred", headers=auth_headers)
+
+    def snapshot(row: MonthStats | None) -> tuple[object, ...]:
+        assert row is not None
+        return (
+            row.day_count,
+            row.steps_total,
+            row.steps_day_count,
+            row.starred_count,
+            row.progress_totals,
+            row.tag_counts,
+        )
+
+    where = (MonthStats.user_id == user_id, MonthStats.year == YEAR, MonthStats.month == MONTH)
+    incremental = snapshot(await db.scalar(select(MonthStats).where(*where)))
+
+    await rebuild_month_stats(db, user_id)
+    db.expire_all()
+    assert snapshot(await db.scalar(select(MonthStats).where(*where))) == incremental
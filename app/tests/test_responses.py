@@ -0,0 +1,41 @@
+"""`ModelResponse` must render exactly what `response_model` would have, and its
+cache entries must come back as the same bytes."""
+
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import ModelResponse, ModelResponseCoder, msg_data, rendered_msg
+from app.schemas import CountryInDB, Msg
+
+COUNTRY = CountryInDB.model_validate(
+    {"id": "0b7f8a52-4d3e-4a56-9d1c-3f5e2a7b9c10", "name": "Ukraine", "code": "UA"}
+)
+
+
+def test_renders_like_the_response_model_path() -> None:
+    msg = Msg(code=200, msg="ok", data=[COUNTRY])
+
+    rendered = json.loads(bytes(ModelResponse(msg).body))
+
+    assert rendered == jsonable_encoder(msg)
+    assert rendered["data"][0]["id"] == str(COUNTRY.id)
+
+
+def test_cache_entry_is_the_rendered_body() -> None:
+    response = ModelResponse(Msg(code=200, msg="ok", data=COUNTRY))
+
+    stored = ModelResponseCoder.encode(response)
+    restored = ModelResponseCoder.decode_as_type(stored, type_=ModelResponse)
+
+    assert stored == response.body
+    assert isinstance(restored, ModelResponse)
+    assert restored.body == response.body
+
+
+def test_msg_data_is_the_rendered_data() -> None:
+    response = ModelResponse(Msg(code=200, msg='the "data": field', data=[COUNTRY]))
+    body = bytes(response.body)
+    assert json.loads(msg_data(body)) == json.loads(body)["data"]
+
+    assert msg_data(rendered_msg("[1,2]", msg="ok")) == b"[1,2]"
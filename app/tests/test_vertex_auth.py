@@ -0,0 +1,117 @@
+"""The Vertex access token manager, against fake credentials."""
+
+import asyncio
+import threading
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.ai.vertex_auth import REFRESH_BACKOFF_SECONDS, VertexTokenManager
+
+
+class FakeCredentials:
+    """Hands out token-1, token-2, ... living `lifetime` each; refresh blocks until `ready`."""
+
+    def __init__(self, lifetime: timedelta = timedelta(hours=1)) -> None:
+        self.lifetime = lifetime
+        self.ready = threading.Event()
+        self.ready.set()
+        self.fail = False
+        self.refreshes = 0
+        self.token: str | None = None
+        self.expiry: datetime | None = None
+
+    def refresh(self, request: object) -> None:
+        self.ready.wait(timeout=5)
+        self.refreshes += 1
+        if self.fail:
+            raise RuntimeError("metadata server unreachable")
+        self.token = f"token-{self.refreshes}"
+        self.expiry = datetime.now(UTC).replace(tzinfo=None) + self.lifetime
+
+
+def _manager(credentials: FakeCredentials) -> tuple[VertexTokenManager, list[int]]:
+    loads: list[int] = []
+
+    def load() -> FakeCredentials:
+        loads.append(1)
+        return credentials
+
+    return VertexTokenManager(load), loads
+
+
+async def test_concurrent_callers_share_one_refresh() -> None:
+    credentials = FakeCredentials()
+    manager, loads = _manager(credentials)
+
+    tokens = await asyncio.gather(*(manager.token() for _ in range(10)))
+    assert tokens == ["token-1"] * 10
+    assert await manager.token() == "token-1"
+    assert credentials.refreshes == 1
+    assert len(loads) == 1
+
+
+async def test_a_refresh_leaves_the_loop_free() -> None:
+    credentials = FakeCredentials()
+    credentials.ready.clear()
+    manager, _ = _manager(credentials)
+
+    waiting = asyncio.create_task(manager.token())
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+
+    credentials.ready.set()
+    assert await waiting == "token-1"
+
+
+async def test_a_token_near_expiry_is_refreshed_in_the_background() -> None:
+    credentials = FakeCredentials(lifetime=timedelta(minutes=2))
+    manager, _ = _manager(credentials)
+    assert await manager.token() == "token-1"
+
+    credentials.ready.clear()
+    credentials.lifetime = timedelta(hours=1)
+    # Still valid, so it is returned at once while the refresh runs.
+    assert await manager.token() == "token-1"
+    assert manager._refreshing is not None
+    assert not manager._refreshing.done()
+
+    credentials.ready.set()
+    await manager._refreshing
+    assert await manager.token() == "token-2"
+
+
+async def test_a_failed_refresh_is_retried_by_the_next_caller() -> None:
+    credentials = FakeCredentials()
+    credentials.fail = True
+    manager, _ = _manager(credentials)
+
+    with pytest.raises(RuntimeError, match="unreachable"):
+        await manager.token()
+
+    credentials.fail = False
+    assert await manager.token() == "token-2"
+
+
+async def test_a_failed_background_refresh_backs_off() -> None:
+    credentials = FakeCredentials(lifetime=timedelta(minutes=2))
+    manager, _ = _manager(credentials)
+    assert await manager.token() == "token-1"
+
+    credentials.fail = True
+    assert await manager.token() == "token-1"
+    assert manager._refreshing is not None
+    with pytest.raises(RuntimeError, match="unreachable"):
+        await manager._refreshing
+    assert credentials.refreshes == 2
+
+    # Within the backoff the held token is returned without another attempt.
+    for _ in range(5):
+        assert await manager.token() == "token-1"
+    assert credentials.refreshes == 2
+
+    credentials.fail = False
+    manager._failed_at -= REFRESH_BACKOFF_SECONDS
+    assert await manager.token() == "token-1"
+    await manager._refreshing
+    assert await manager.token() == "token-3"
@@ -82,6 +82,19 @@ async def test_get_days_with_sort_and_tags(ctx: Context) -> None:
     assert "sortField=timestamp" in url_str
     assert "sortOrder=desc" in url_str
     assert "tagNames=travel" in url_str
+    assert "tagMatch=all" in url_str
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_days_with_any_tag(ctx: Context) -> None:
+    respx.get(api_url("/days")).mock(
+        return_value=Response(200, json={"code": 200, "msg": "ok", "data": []})
+    )
+
+    await get_days(ctx, tag_names="travel,food", tag_match="any")
+
+    assert "tagMatch=any" in str(respx.calls.last.request.url)
 
 
 @pytest.mark.asyncio
@@ -15,8 +15,12 @@ async def get_days(
     sort_order: str | None = None,
     view: Literal["list", "detail"] = "list",
     tag_names: str | None = None,
+    tag_match: Literal["all", "any"] = "all",
 ) -> list[dict[str, object]]:
-    """Get days from Memoryful API with pagination"""
+    """Get days from Memoryful API with pagination.
+
+    `tag_names` is comma-separated; `tag_match` picks days with all of them or any.
+    """
     validate_non_negative_int(limit, "limit")
     validate_non_negative_int(offset, "offset")
     validate_non_empty_string(sort_field, "sort_field")
@@ -31,6 +35,7 @@ async def get_days(
         params["sortOrder"] = sort_order
     if tag_names is not None:
         params["tagNames"] = tag_names
+        params["tagMatch"] = tag_match
     return cast(list[dict[str, object]], await client.get(f"/days?{urlencode(params)}"))
 
 
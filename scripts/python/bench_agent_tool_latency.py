@@ -0,0 +1,90 @@
+"""Break down the latency of an agent tool call: in-process, the API over HTTP, and MCP.
+
+An MCP tool call goes agent -> MCP server over HTTP -> this API over HTTP ->
+route -> database. The in-process tools (`app.ai.tools`) call the route directly.
+Each tool here is timed three ways: the in-process tool, the GET the MCP server's
+`APIClient` makes for it, and the MCP tool through the session pool. The
+differences are the cost of each hop: HTTP minus in-process is the API's HTTP
+and auth layer, MCP minus HTTP is the MCP server's. All three share the API's
+route cache, which is warmed before timing, as it would be in use.
+
+Needs the API at --api-url, the MCP server at MCP_SERVER_URL and the database
+and Redis the API uses.
+
+Usage (run from memoryful-backend/):
+    python scripts/python/bench_agent_tool_latency.py --token <access token>
+    python scripts/python/bench_agent_tool_latency.py --token <access token> --runs 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+from uuid import UUID
+
+import httpx
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from jose import jwt
+
+from app.ai.mcp import load_mcp_tools
+from app.ai.mcp_pool import close_mcp_pool
+from app.ai.tools import load_local_tools
+from app.constants import CACHE_PREFIX
+from app.core.config import cache_redis
+
+# Tool, its arguments, and the API path the MCP server requests for it.
+SCENARIOS = [
+    ("get_tags", {}, "/tags/"),
+    ("get_trackable_types", {}, "/trackable-types"),
+    ("get_days", {"limit": 10}, "/days/?limit=10&offset=0&view=list"),
+]
+
+
+async def _time(call: Callable[[], Awaitable[object]], runs: int) -> tuple[float, float]:
+    await call()
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - began) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+async def main(access_token: str, api_url: str, runs: int) -> None:
+    FastAPICache.init(RedisBackend(cache_redis), prefix=CACHE_PREFIX)
+    user_id = UUID(jwt.get_unverified_claims(access_token)["sub"])
+    local = {tool.name: tool for tool in load_local_tools(user_id)}
+    remote = {tool.name: tool for tool in await load_mcp_tools(access_token)}
+
+    print(f"{runs} runs per path (median / p95 ms)")
+    print(f"  {'tool':<20} {'in-process':>17} {'API over HTTP':>17} {'MCP':>17}")
+    async with httpx.AsyncClient(
+        base_url=api_url, headers={"Authorization": f"Bearer {access_token}"}
+    ) as api:
+
+        async def over_http(path: str) -> None:
+            response = await api.get(path)
+            response.raise_for_status()
+
+        for name, arguments, path in SCENARIOS:
+            timings = [
+                await _time(partial(local[name].ainvoke, arguments), runs),
+                await _time(partial(over_http, path), runs),
+                await _time(partial(remote[name].ainvoke, arguments), runs),
+            ]
+            cells = " ".join(f"{median:7.2f} / {p95:7.2f}" for median, p95 in timings)
+            print(f"  {name:<20} {cells}")
+    await close_mcp_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--token", required=True, help="access token of the user to act as")
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.token, args.api_url, args.runs))
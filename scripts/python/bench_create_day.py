@@ -0,0 +1,175 @@
+"""Time day creation: the old one-query-per-check sequence against the single statement.
+
+Round trips dominate on a remote database, so run it against one with real latency
+(e.g. a Neon branch via MAIN_DATABASE_URL) as well as locally. It reports the
+round trips each path makes, the measured `SELECT 1` RTT, and the time per day.
+Everything is written inside one transaction that is rolled back.
+
+Usage (run from memoryful-backend/):
+    python scripts/python/bench_create_day.py
+    python scripts/python/bench_create_day.py --days 200 --tags 3 --progress 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event, exists, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import engine
+from app.core.rollups import DayFootprint, apply_day_change
+from app.models import City, Day, Tag, TrackableItem, TrackableProgress, TrackableType, User
+from app.models.day import days_tags
+from app.routers.days import _create_day_statement
+from app.schemas import DayCreate
+
+START = 1_400_000_000
+DAY = 86_400
+
+
+async def _create_sequentially(
+    db: AsyncSession, user_id: UUID, timestamp: int, data: DayCreate
+) -> None:
+    """What create_day did before: each check and each write on its own."""
+    await db.scalar(select(exists().where(Day.timestamp == timestamp, Day.user_id == user_id)))
+    await db.scalar(select(exists().where(City.id == data.city_id)))
+    item_ids = {p.trackable_item_id for p in data.trackable_progresses}
+    await db.scalar(
+        select(func.count()).where(TrackableItem.id.in_(item_ids), TrackableItem.user_id == user_id)
+    )
+    await db.scalars(select(Tag).where(Tag.id.in_(data.tags), Tag.user_id == user_id))
+    await db.execute(
+        insert(Day).values(
+            timestamp=timestamp,
+            user_id=user_id,
+            city_id=data.city_id,
+            content=data.content,
+            steps=data.steps,
+            tag_ids=data.tags,
+        )
+    )
+    if data.tags:
+        await db.execute(
+            insert(days_tags),
+            [{"day_timestamp": timestamp, "user_id": user_id, "tag_id": t} for t in data.tags],
+        )
+    if data.trackable_progresses:
+        await db.execute(
+            insert(TrackableProgress),
+            [
+                {
+                    "user_id": user_id,
+                    "timestamp": timestamp,
+                    "trackable_item_id": p.trackable_item_id,
+                    "value": p.value,
+                }
+                for p in data.trackable_progresses
+            ],
+        )
+    await apply_day_change(
+        db,
+        user_id,
+        None,
+        DayFootprint(
+            timestamp=timestamp,
+            steps=data.steps,
+            tag_ids=data.tags,
+            progress=[(p.trackable_item_id, p.value) for p in data.trackable_progresses],
+        ),
+    )
+
+
+async def _create_in_one_statement(
+    db: AsyncSession, user_id: UUID, timestamp: int, data: DayCreate
+) -> None:
+    progresses = {p.trackable_item_id: p for p in data.trackable_progresses}
+    result = await db.execute(
+        _create_day_statement(user_id, timestamp, data, progresses, list(data.tags))
+    )
+    if not result.one().created:
+        sys.exit(f"day {timestamp} was refused; the fixture data is inconsistent")
+
+
+async def main(days: int, tag_count: int, progress_count: int) -> None:
+    round_trips = 0
+
+    def count(*_: Any) -> None:
+        nonlocal round_trips
+        round_trips += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+
+    async with engine.connect() as conn:
+        await conn.begin()
+        db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            city_id = await db.scalar(select(City.id).limit(1))
+            if city_id is None:
+                sys.exit("no cities in the database; seed it first")
+            user = User(email="bench-create-day@example.com")
+            db.add(user)
+            await db.flush()
+            tags = [Tag(user_id=user.id, name=f"tag-{i}") for i in range(tag_count)]
+            kind = TrackableType(user_id=user.id, name="kind", value_type="number")
+            db.add_all([*tags, kind])
+            await db.flush()
+            items = [
+                TrackableItem(user_id=user.id, type_id=kind.id, title=f"item-{i}")
+                for i in range(progress_count)
+            ]
+            db.add_all(items)
+            await db.flush()
+
+            def payload() -> DayCreate:
+                return DayCreate.model_validate(
+                    {
+                        "city_id": city_id,
+                        "content": "benchmark",
+                        "steps": 5000,
+                        "tags": [t.id for t in tags],
+                        "trackable_progresses": [
+                            {"trackable_item_id": i.id, "value": 1.5} for i in items
+                        ],
+                    }
+                )
+
+            rtts = []
+            for _ in range(20):
+                began = time.perf_counter()
+                await db.execute(select(1))
+                rtts.append((time.perf_counter() - began) * 1000)
+            print(f"SELECT 1 round trip: {statistics.median(rtts):.2f} ms (median of 20)")
+
+            paths = [
+                ("one query per step", _create_sequentially, START),
+                ("single statement", _create_in_one_statement, START + days * DAY),
+            ]
+            for label, create, first in paths:
+                samples = []
+                round_trips = 0
+                for n in range(days):
+                    began = time.perf_counter()
+                    await create(db, user.id, first + n * DAY, payload())
+                    samples.append((time.perf_counter() - began) * 1000)
+                print(
+                    f"  {label:<20} {round_trips / days:4.1f} round trips, "
+                    f"{statistics.median(samples):7.2f} ms median per day"
+                )
+        finally:
+            await db.close()
+            await conn.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--tags", type=int, default=2)
+    parser.add_argument("--progress", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.days, args.tags, args.progress))
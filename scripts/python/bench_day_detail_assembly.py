@@ -0,0 +1,172 @@
+"""Time building `DayDetail` from ORM rows: the old piecewise assembly against one validation.
+
+The old path grouped progresses with a `defaultdict`, validated every piece on
+its own, copied `day.__dict__` and validated the result again. The new path is
+`DayDetail.model_validate(day)`, which groups inside the schema. Both run over
+the same transient `Day` objects, built in memory with no database, and must
+produce equal models.
+
+Usage (run from memoryful-backend/):
+    python scripts/python/bench_day_detail_assembly.py
+    python scripts/python/bench_day_detail_assembly.py --days 100 --runs 200
+"""
+
+import argparse
+import datetime as dt
+import statistics
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from uuid import uuid4
+
+from app.models import (
+    City,
+    Country,
+    Day,
+    Insight,
+    Suggestion,
+    Tag,
+    TrackableItem,
+    TrackableProgress,
+    TrackableType,
+)
+from app.schemas import (
+    DayDetail,
+    DayTrackableProgress,
+    InsightInDB,
+    SuggestionInDB,
+    TrackableTypeInDB,
+    TrackableTypeWithProgress,
+)
+
+START = 1_700_000_000
+DAY = 86_400
+
+
+def _days(count: int) -> list[Day]:
+    now = dt.datetime.now(dt.UTC)
+    user_id, model_id = uuid4(), uuid4()
+    country = Country(id=uuid4(), name="Ukraine", code="UA")
+    city = City(id=uuid4(), name="Kyiv", country_id=country.id, country=country)
+    tags = [Tag(id=uuid4(), user_id=user_id, name=f"tag-{n}") for n in range(3)]
+    kinds = [
+        TrackableType(id=uuid4(), user_id=user_id, name=f"kind-{n}", value_type="number")
+        for n in range(2)
+    ]
+    items = [
+        TrackableItem(
+            id=uuid4(), user_id=user_id, type_id=kind.id, type=kind, title=f"item-{n}", meta={}
+        )
+        for n, kind in enumerate(kinds * 2)
+    ]
+
+    days = []
+    for n in range(count):
+        timestamp = START + n * DAY
+        day = Day(
+            timestamp=timestamp,
+            user_id=user_id,
+            city_id=city.id,
+            content="Walked along the river, then coffee and a long read. " * 20,
+            description="A quiet, sunny day",
+            steps=12_345,
+            starred=False,
+            images=[],
+            created_at=now,
+            updated_at=now,
+        )
+        day.city = city
+        day.tags = list(tags)
+        day.trackable_progresses = [
+            TrackableProgress(
+                id=uuid4(),
+                user_id=user_id,
+                timestamp=timestamp,
+                trackable_item_id=item.id,
+                trackable_item=item,
+                value=30.0,
+            )
+            for item in items
+        ]
+        day.insights = [
+            Insight(
+                id=uuid4(),
+                user_id=user_id,
+                model_id=model_id,
+                insight_type_id=uuid4(),
+                timestamp=timestamp,
+                date_begin=now.date(),
+                description="Steps are up",
+                content="You walked more than your weekly average.",
+                created_at=now,
+            )
+            for _ in range(2)
+        ]
+        day.suggestions = [
+            Suggestion(
+                id=uuid4(),
+                user_id=user_id,
+                model_id=model_id,
+                timestamp=timestamp,
+                description="Try the park",
+                date=now.date(),
+                content="The forecast is clear tomorrow.",
+            )
+            for _ in range(2)
+        ]
+        days.append(day)
+    return days
+
+
+def _piecewise(day: Day) -> DayDetail:
+    """What get_day and get_random_day each did before."""
+    progresses_by_type = defaultdict(list)
+    type_objects = {}
+    for progress in day.trackable_progresses:
+        trackable_type = progress.trackable_item.type
+        type_objects[trackable_type.id] = TrackableTypeInDB.model_validate(trackable_type)
+        progresses_by_type[trackable_type.id].append(DayTrackableProgress.model_validate(progress))
+    trackable_progresses = [
+        TrackableTypeWithProgress(type=type_objects[type_id], progresses=progresses)
+        for type_id, progresses in progresses_by_type.items()
+    ]
+    day_data = {
+        **{k: v for k, v in day.__dict__.items() if not k.startswith("_")},
+        "trackable_progresses": trackable_progresses,
+        "insights": [InsightInDB.model_validate(i) for i in day.insights],
+        "suggestions": [SuggestionInDB.model_validate(s) for s in day.suggestions],
+    }
+    return DayDetail.model_validate(day_data)
+
+
+def _time(build: Callable[[Day], DayDetail], days: list[Day], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        for day in days:
+            build(day)
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples)
+
+
+def main(day_count: int, runs: int) -> None:
+    days = _days(day_count)
+    if any(_piecewise(day) != DayDetail.model_validate(day) for day in days):
+        sys.exit("the two paths built different DayDetails")
+
+    builds: list[tuple[str, Callable[[Day], DayDetail]]] = [
+        ("piecewise", _piecewise),
+        ("model_validate", DayDetail.model_validate),
+    ]
+    print(f"{day_count} days per run, {runs} runs (median ms per run)")
+    for label, build in builds:
+        print(f"  {label:<15} {_time(build, days, runs):7.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+    main(args.days, args.runs)
@@ -0,0 +1,152 @@
+"""Time rendering a 100-day detail page: `response_model` validation against `ModelResponse`.
+
+Both routes return the same already-validated `DayDetail` models, so only the
+response path differs. One goes through FastAPI's `response_model` handling
+(dump, re-validate, serialize, `json.dumps`) and the other through
+`ModelResponse` (one pydantic-core pass). Requests go in-process over ASGI, with
+no database and no network. The bodies are checked to be identical before
+anything is timed.
+
+Usage (run from memoryful-backend/):
+    python scripts/python/bench_day_detail_render.py
+    python scripts/python/bench_day_detail_render.py --days 100 --runs 300
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.responses import ModelResponse
+from app.schemas import DayDetail, Msg
+
+START = 1_700_000_000
+DAY = 86_400
+
+
+def _day(timestamp: int) -> DayDetail:
+    now = dt.datetime.now(dt.UTC)
+    user_id, model_id = uuid4(), uuid4()
+    icon = {"name": "star", "style": "fas"}
+    kind = {"id": uuid4(), "name": "Sport", "valueType": "number", "icon": icon}
+    return DayDetail.model_validate(
+        {
+            "timestamp": timestamp,
+            "content": "Walked along the river, then coffee and a long read. " * 20,
+            "description": "A quiet, sunny day",
+            "steps": 12_345,
+            "starred": True,
+            "mainImage": "days/main.jpg",
+            "createdAt": now,
+            "updatedAt": now,
+            "images": [f"days/{n}.jpg" for n in range(4)],
+            "city": {
+                "id": uuid4(),
+                "name": "Kyiv",
+                "country": {"id": uuid4(), "name": "Ukraine", "code": "UA"},
+            },
+            "tags": [{"id": uuid4(), "name": f"tag-{n}", "icon": icon} for n in range(3)],
+            "trackableProgresses": [
+                {
+                    "type": kind,
+                    "progresses": [
+                        {
+                            "value": 30.0 + n,
+                            "description": "tempo",
+                            "trackableItem": {
+                                "id": uuid4(),
+                                "typeId": kind["id"],
+                                "title": f"item-{n}",
+                                "meta": {"unit": "min"},
+                            },
+                        }
+                        for n in range(3)
+                    ],
+                }
+            ],
+            "insights": [
+                {
+                    "id": uuid4(),
+                    "userId": user_id,
+                    "modelId": model_id,
+                    "insightTypeId": uuid4(),
+                    "timestamp": timestamp,
+                    "dateBegin": now.date(),
+                    "description": "Steps are up",
+                    "content": "You walked more than your weekly average. " * 5,
+                    "createdAt": now,
+                }
+                for _ in range(2)
+            ],
+            "suggestions": [
+                {
+                    "id": uuid4(),
+                    "userId": user_id,
+                    "modelId": model_id,
+                    "timestamp": timestamp,
+                    "description": "Try the park",
+                    "date": now.date(),
+                    "content": "The forecast is clear tomorrow. " * 5,
+                }
+                for _ in range(2)
+            ],
+        }
+    )
+
+
+def _app(days: list[DayDetail]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/response-model", response_model=Msg[list[DayDetail]])
+    async def through_response_model() -> Msg[list[DayDetail]]:
+        return Msg(code=200, msg="Days retrieved", data=days)
+
+    @app.get("/model-response", response_model=Msg[list[DayDetail]])
+    async def through_model_response() -> ModelResponse:
+        return ModelResponse(Msg(code=200, msg="Days retrieved", data=days))
+
+    return app
+
+
+async def _time(client: AsyncClient, path: str, runs: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        response = await client.get(path)
+        samples.append((time.perf_counter() - began) * 1000)
+        response.raise_for_status()
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+async def main(day_count: int, runs: int) -> None:
+    days = [_day(START + n * DAY) for n in range(day_count)]
+    transport = ASGITransport(app=_app(days))
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        old = await client.get("/response-model")
+        new = await client.get("/model-response")
+        if json.loads(old.content) != json.loads(new.content):
+            sys.exit("the two routes rendered different bodies")
+        print(f"{day_count} detail days, {len(new.content) / 1024:.0f} KiB body, {runs} runs")
+
+        for label, path in [
+            ("response_model", "/response-model"),
+            ("ModelResponse", "/model-response"),
+        ]:
+            median, p95 = await _time(client, path, runs)
+            print(f"  {label:<15} {median:7.2f} ms median / {p95:7.2f} ms p95")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.days, args.runs))
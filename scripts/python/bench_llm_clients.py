@@ -0,0 +1,113 @@
+"""Latency of a model call: a chat model built per call against the reused one.
+
+`build_chat_model` used to build a new LangChain client for every chat turn and
+insight run; it now keeps the ones it built (`app.ai.utils`). Each run here gets
+a chat model and makes one call with it, either building it the old way or
+through `build_chat_model`. The provider is a local stand-in for an
+OpenAI-compatible endpoint that answers at once, so the difference is the cost
+of the client itself: building it and whatever connection setup it can't share.
+
+The stand-in speaks plain HTTP on localhost, so the numbers leave out the TLS
+handshake a new connection to a real provider pays, and they are for the
+OpenAI-compatible clients (local Ollama, OpenAI, Vertex Model Garden). The
+Gemini client also opens its own connection pool and loads its credentials when
+built, which this doesn't show.
+
+Usage (run from memoryful-backend/):
+    python scripts/python/bench_llm_clients.py
+    python scripts/python/bench_llm_clients.py --runs 500
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import time
+from collections.abc import Callable
+
+import uvicorn
+from fastapi import FastAPI
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
+from langchain_openai import ChatOpenAI
+from pydantic import SecretStr
+
+from app.ai.utils import build_chat_model
+from app.core.settings import get_settings
+from app.models import ChatModel
+
+settings = get_settings()
+
+stand_in = FastAPI()
+
+
+@stand_in.post("/v1/chat/completions")
+async def complete(body: dict) -> dict:
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body["model"],
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": "Sounds like a good day."},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 6, "total_tokens": 11},
+    }
+
+
+def _built_per_call(model: ChatModel) -> BaseChatModel:
+    """What `build_chat_model` did before, in LLM_MODE=local."""
+    return ChatOpenAI(
+        model=settings.local_llm_model,
+        temperature=settings.default_temperature,
+        base_url=settings.local_llm_base_url,
+        api_key=SecretStr(settings.local_llm_api_key),
+    )
+
+
+async def _time(
+    get: Callable[[ChatModel], BaseChatModel], model: ChatModel, runs: int
+) -> tuple[float, float]:
+    await get(model).ainvoke([HumanMessage("How was my week?")])
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        await get(model).ainvoke([HumanMessage("How was my week?")])
+        samples.append((time.perf_counter() - began) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+async def main(runs: int) -> None:
+    # Listening before the server starts, so the first call queues rather than fails.
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    # As uvicorn sets on sockets it opens itself; without it Nagle adds ~40 ms a call.
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.listen()
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(stand_in, log_level="warning"))
+    serving = asyncio.create_task(server.serve(sockets=[sock]))
+
+    settings.llm_mode = "local"
+    settings.local_llm_base_url = f"http://127.0.0.1:{port}/v1"
+    model = ChatModel(label="Bench", name=settings.local_llm_model, provider="other")
+
+    print(f"{runs} calls to the stand-in at {settings.local_llm_base_url}")
+    for label, get in [("built per call", _built_per_call), ("reused", build_chat_model)]:
+        median, p95 = await _time(get, model, runs)
+        print(f"  {label:<15} {median:7.2f} ms median / {p95:7.2f} ms p95 per call")
+
+    server.should_exit = True
+    await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
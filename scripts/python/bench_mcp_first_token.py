@@ -0,0 +1,101 @@
+"""Time to first token of an agent turn: listing the MCP tools every turn against the cached listing.
+
+The old path built a `MultiServerMCPClient` and ran `get_tools()` per turn, an
+MCP handshake and a tool listing before the model could start. The new path is
+`app.ai.mcp.load_mcp_tools`, which lists once and then only wraps the cached
+schemas. Each turn loads the tools, builds the agent and streams until the first
+token. The model is a fake that answers at once, so the difference is the tool
+loading; the MCP server is real and must be running (the `mcp` sidecar).
+
+Usage (run from memoryful-backend/):
+    python scripts/python/bench_mcp_first_token.py --token <access token>
+    python scripts/python/bench_mcp_first_token.py --token <access token> --runs 50
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from langchain.agents import create_agent
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+
+from app.ai.mcp import load_mcp_tools
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+
+class ReplyingModel(GenericFakeChatModel):
+    """Streams the same short reply every turn and never calls a tool."""
+
+    def bind_tools(
+        self,
+        tools: Sequence[dict[str, Any] | type | Callable[..., Any] | BaseTool],
+        *,
+        tool_choice: str | None = None,
+        **kwargs: Any,
+    ) -> Runnable[LanguageModelInput, AIMessage]:
+        return self
+
+
+async def _fresh_tools(access_token: str) -> list:
+    """What `load_mcp_tools` did before."""
+    client = MultiServerMCPClient(
+        {
+            "memoryful": {
+                "url": settings.mcp_server_url,
+                "transport": "streamable_http",
+                "headers": {"Authorization": f"Bearer {access_token}"},
+            }
+        }
+    )
+    return await client.get_tools()
+
+
+async def _first_token(load: Callable[[str], Awaitable[list]], access_token: str) -> float:
+    model = ReplyingModel(messages=itertools.repeat(AIMessage(content="Sounds like a good day.")))
+    began = time.perf_counter()
+    agent = create_agent(model, await load(access_token), system_prompt="You are Memoryful.")
+    async for event in agent.astream_events({"messages": [HumanMessage("How was my week?")]}):
+        if event.get("event") == "on_chat_model_stream":
+            break
+    return (time.perf_counter() - began) * 1000
+
+
+async def _time(
+    load: Callable[[str], Awaitable[list]], access_token: str, runs: int
+) -> tuple[float, float]:
+    samples = sorted([await _first_token(load, access_token) for _ in range(runs)])
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+async def main(access_token: str, runs: int) -> None:
+    fresh = await _fresh_tools(access_token)
+    cached = await load_mcp_tools(access_token)  # also warms the cache
+    if [t.name for t in fresh] != [t.name for t in cached]:
+        raise SystemExit("the two paths loaded different tools")
+
+    print(f"{len(cached)} tools from {settings.mcp_server_url}, {runs} runs")
+    for label, load in [
+        ("listed per turn", _fresh_tools),
+        ("cached listing", load_mcp_tools),
+    ]:
+        median, p95 = await _time(load, access_token, runs)
+        print(f"  {label:<16} {median:7.2f} ms median / {p95:7.2f} ms p95 to first token")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--token", required=True, help="access token of any user")
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.token, args.runs))
@@ -0,0 +1,99 @@
+"""Time random-day selection: `ORDER BY random()` against the count+offset sampler.
+
+Seeds a throwaway user with N days inside one transaction, times both queries over
+the full range and over a narrow window, then rolls everything back — nothing it
+writes survives. Point it at the local database, never at prod.
+
+Usage (run from memoryful-backend/):
+    python scripts/python/bench_random_day.py
+    python scripts/python/bench_random_day.py --days 50000 --runs 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from uuid import UUID
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import Select
+
+from app.core.database import engine
+from app.models import City, Day, User
+from app.routers.days import _random_timestamp
+
+START = 1_500_000_000
+DAY = 86_400
+
+
+def _order_by_random(user_id: UUID, start: int | None, end: int | None) -> Select:
+    stmt = select(Day.timestamp).where(Day.user_id == user_id)
+    if start:
+        stmt = stmt.where(Day.timestamp >= start)
+    if end:
+        stmt = stmt.where(Day.timestamp <= end)
+    return stmt.order_by(func.random()).limit(1)
+
+
+def _sampler(user_id: UUID, start: int | None, end: int | None) -> Select:
+    return select(_random_timestamp(user_id, start, end))
+
+
+async def _time(conn: AsyncConnection, stmt: Select, runs: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        await conn.scalar(stmt)
+        samples.append((time.perf_counter() - began) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+async def main(days: int, runs: int) -> None:
+    async with engine.connect() as conn:
+        await conn.begin()
+        try:
+            city_id = await conn.scalar(select(City.id).limit(1))
+            if city_id is None:
+                sys.exit("no cities in the database; seed it first")
+            created = await conn.execute(
+                insert(User).values(email="bench-random-day@example.com").returning(User.id)
+            )
+            user_id = created.scalar_one()
+            await conn.execute(
+                insert(Day),
+                [
+                    {
+                        "timestamp": START + i * DAY,
+                        "user_id": user_id,
+                        "city_id": city_id,
+                        "content": "",
+                    }
+                    for i in range(days)
+                ],
+            )
+            await conn.exec_driver_sql("ANALYZE days")
+
+            ranges = {
+                "full range": (None, None),
+                "30-day window": (START + days // 2 * DAY, START + (days // 2 + 30) * DAY),
+            }
+            print(f"{days} days, {runs} runs each (ms, median / p95)")
+            for label, (start, end) in ranges.items():
+                old = await _time(conn, _order_by_random(user_id, start, end), runs)
+                new = await _time(conn, _sampler(user_id, start, end), runs)
+                print(f"  {label:<14} order by random(): {old[0]:7.2f} / {old[1]:7.2f}")
+                print(f"  {label:<14} count + offset:    {new[0]:7.2f} / {new[1]:7.2f}")
+        finally:
+            await conn.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.days, args.runs))